@@ -0,0 +1 @@
+"""Benchmarks of mini_pandas, run with python -m benchmarks. See suite."""
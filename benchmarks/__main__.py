@@ -0,0 +1,90 @@
+"""Command line for the benchmarks:
+
+    python -m benchmarks run --scales 10k 1m --output results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.1
+
+compare exits with status 1 if any benchmark got slower or used more memory than
+the baseline by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+from . import data, suite
+
+
+def _print_result(result):
+    print(
+        f"{result['name']:<16} {result['rows']:>10} {result['cardinality']:<5} "
+        f"nulls={result['null_ratio']:<5} {result['seconds']:10.4f}s "
+        f"{result['peak_bytes'] / 2**20:10.2f} MiB"
+    )
+
+
+def _print_change(change):
+    flag = "REGRESSION" if change["regression"] else ""
+    print(
+        f"{change['name']:<16} {change['rows']:>10} {change['cardinality']:<5} "
+        f"nulls={change['null_ratio']:<5} time x{change['time_ratio']:.2f} "
+        f"memory x{change['memory_ratio']:.2f} {flag}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument(
+        "--scales",
+        nargs="+",
+        default=["10k"],
+        help=f"row counts, or any of {list(data.SCALES)}",
+    )
+    run.add_argument("--cardinalities", nargs="+", default=list(data.CARDINALITIES))
+    run.add_argument("--null-ratios", nargs="+", type=float, default=[0.0, 0.1])
+    run.add_argument("--only", nargs="+", help=f"any of {list(suite.BENCHMARKS)}")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--output", help="JSON file to write the results to")
+
+    compare = commands.add_parser("compare", help="compare results with a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("results")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="fraction by which time or memory may grow (default 0.1)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        scales = [int(s) if s.isdigit() else s for s in args.scales]
+        results = suite.run(
+            scales,
+            args.cardinalities,
+            args.null_ratios,
+            args.only,
+            args.repeat,
+            log=_print_result,
+        )
+        if args.output:
+            with open(args.output, "w") as ofile:
+                json.dump(results, ofile, indent=2)
+        return 0
+
+    with open(args.baseline) as ifile:
+        baseline = json.load(ifile)
+    with open(args.results) as ifile:
+        results = json.load(ifile)
+
+    changes = suite.compare(baseline, results, args.threshold)
+    for change in changes:
+        _print_change(change)
+
+    return 1 if any(change["regression"] for change in changes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Synthetic DFs for the benchmarks.
+
+Every DF has the same columns, generated from a fixed seed so that runs compare
+like with like:
+
+    key     str key to group by, "low" (10 distinct) or "high" (rows / 2 distinct)
+            cardinality
+    id      int row id
+    value   float in [0, 1), with a fraction null_ratio of nulls
+    flag    bool
+"""
+import random
+
+from mini_pandas.df import DF
+
+# row counts of the named scales
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+CARDINALITIES = ("low", "high")
+
+LOW_CARDINALITY = 10
+
+
+def make_df(rows, cardinality="low", null_ratio=0.0, seed=0):
+    """DF with the columns described above."""
+    if cardinality not in CARDINALITIES:
+        raise ValueError(
+            f"Unknown cardinality {cardinality}. Expected one of {CARDINALITIES}."
+        )
+
+    rng = random.Random(seed)
+    n_keys = LOW_CARDINALITY if cardinality == "low" else max(rows // 2, 1)
+    keys = [f"key{i}" for i in range(n_keys)]
+
+    values = [rng.random() for _ in range(rows)]
+    if null_ratio:
+        for i in rng.sample(range(rows), int(rows * null_ratio)):
+            values[i] = None
+
+    return DF(
+        {
+            "key": [rng.choice(keys) for _ in range(rows)],
+            "id": list(range(rows)),
+            "value": values,
+            "flag": [rng.random() < 0.5 for _ in range(rows)],
+        }
+    )
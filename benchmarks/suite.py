@@ -0,0 +1,186 @@
+"""Benchmarks of the DF and Vec hot paths, and comparison of their results.
+
+Each benchmark is set up on a synthetic DF (see data.make_df), then timed over a
+few runs, keeping the best, and run once more under tracemalloc for its peak
+memory. Derived-result caching is cleared before every run, so that repeats don't
+just hit the cache.
+"""
+import itertools
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+from mini_pandas import backend, cache
+from mini_pandas.df import read_csv
+
+from . import data
+
+
+def _read_csv(df, directory):
+    path = os.path.join(directory, "read.csv")
+    df.to_csv(path)
+    return lambda: read_csv(path)
+
+
+def _to_csv(df, directory):
+    path = os.path.join(directory, "write.csv")
+    return lambda: df.to_csv(path)
+
+
+def _arithmetic(df, directory):
+    return lambda: df["value"] * 2.0 + 1.0
+
+
+def _compare(df, directory):
+    return lambda: df["id"] % 7 == 0
+
+
+def _filter(df, directory):
+    return lambda: df[(df["value"] > 0.5) & df["flag"]]
+
+
+def _groupby(df, directory):
+    return lambda: df.groupby("key").count().sum("value").mean("value").agg()
+
+
+def _distinct(df, directory):
+    return lambda: df["key"].distinct()
+
+
+def _describe(df, directory):
+    return lambda: df.describe()
+
+
+def _dropna(df, directory):
+    return lambda: df.dropna()
+
+
+def _str(df, directory):
+    return lambda: str(df)
+
+
+# name -> function of (DF, scratch directory) giving the function to time
+BENCHMARKS = {
+    "read_csv": _read_csv,
+    "to_csv": _to_csv,
+    "vec_arithmetic": _arithmetic,
+    "vec_compare": _compare,
+    "filter": _filter,
+    "groupby_agg": _groupby,
+    "distinct": _distinct,
+    "describe": _describe,
+    "dropna": _dropna,
+    "str": _str,
+}
+
+# fields identifying a result, to match it against the baseline
+KEY_FIELDS = ("name", "rows", "cardinality", "null_ratio")
+
+
+def measure(fxn, repeat=3):
+    """Best time in seconds of repeat runs of fxn, and peak bytes of another run."""
+    times = []
+    for _ in range(repeat):
+        cache.clear()
+        start = time.perf_counter()
+        fxn()
+        times.append(time.perf_counter() - start)
+
+    cache.clear()
+    tracemalloc.start()
+    try:
+        fxn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peak
+
+
+def run(
+    scales=("10k",),
+    cardinalities=data.CARDINALITIES,
+    null_ratios=(0.0, 0.1),
+    names=None,
+    repeat=3,
+    log=None,
+):
+    """Run the benchmarks on every combination of data parameters.
+
+    scales are names from data.SCALES or row counts. names picks benchmarks from
+    BENCHMARKS (all by default). log, if given, is called with each result.
+    """
+    names = list(BENCHMARKS) if names is None else names
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmarks {sorted(unknown)}. "
+            f"Expected some of {list(BENCHMARKS)}."
+        )
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale, cardinality, null_ratio in itertools.product(
+            scales, cardinalities, null_ratios
+        ):
+            rows = int(data.SCALES.get(scale, scale))
+            df = data.make_df(rows, cardinality, null_ratio)
+
+            for name in names:
+                seconds, peak = measure(BENCHMARKS[name](df, directory), repeat)
+                result = {
+                    "name": name,
+                    "rows": rows,
+                    "cardinality": cardinality,
+                    "null_ratio": null_ratio,
+                    "seconds": seconds,
+                    "peak_bytes": peak,
+                }
+                results.append(result)
+                if log is not None:
+                    log(result)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "backend": backend.get_backend(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _key(result):
+    return tuple(result[field] for field in KEY_FIELDS)
+
+
+def compare(baseline, current, threshold=0.1):
+    """Changes from baseline to current results.
+
+    Gives a dict for each benchmark run in both, with its time and memory ratios,
+    and whether either grew by more than threshold (a fraction, 0.1 being 10%).
+    """
+    before = {_key(result): result for result in baseline["results"]}
+
+    changes = []
+    for result in current["results"]:
+        old = before.get(_key(result))
+        if old is None:
+            continue
+
+        time_ratio = result["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        memory_ratio = (
+            result["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        )
+        changes.append(
+            {
+                **{field: result[field] for field in KEY_FIELDS},
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regression": max(time_ratio, memory_ratio) > 1 + threshold,
+            }
+        )
+
+    return changes
@@ -0,0 +1,49 @@
+"""Groupby aggregations recorded to compute later.
+
+DF.groupby aggregates as each aggregation is added. A LazyDF's groupby instead
+records them to run when the plan executes, and a parallel Engine's records them to
+run on each partition and merge. Both build on DeferredGroupBy, which records each
+aggregation as (GroupBy method name, column or None):
+
+    df.lazy().groupby("Team").sum("Score").count().aggs
+    # [("sum", "Score"), ("count", None)]
+"""
+
+
+class DeferredGroupBy:
+    """Groupby aggregations recorded in aggs, for a subclass to compute in agg()."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.aggs = []
+
+    def _add(self, fxn, column):
+        self.aggs.append((fxn, column))
+        return self
+
+    def count(self, col=None):
+        return self._add("count", col)
+
+    def sum(self, column):
+        return self._add("sum", column)
+
+    def min(self, column):
+        return self._add("min", column)
+
+    def max(self, column):
+        return self._add("max", column)
+
+    def mean(self, column):
+        return self._add("mean", column)
+
+    def var(self, column):
+        return self._add("var", column)
+
+    def first(self, column):
+        return self._add("first", column)
+
+    def last(self, column):
+        return self._add("last", column)
+
+    def agg(self):
+        raise NotImplementedError
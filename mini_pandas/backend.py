@@ -0,0 +1,292 @@
+"""Pluggable compute backends for Vec.
+
+The pure-Python backend is always available and is the default. The NumPy backend is
+opted into with set_backend("numpy") (or MINI_PANDAS_BACKEND=numpy), and only runs on
+columns with typed storage. Each kernel returns None whenever NumPy could give a
+different answer than plain Python (overflow, division by zero, float rounding), and
+the caller then falls back to the pure-Python implementation.
+"""
+import array
+import operator
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BACKENDS = ("python", "numpy")
+
+# typecodes of the typed Vec dtypes, and their NumPy equivalents
+TYPECODES = {"bool": "b", "int64": "q", "float64": "d"}
+NUMPY_DTYPES = {"bool": "int8", "int64": "int64", "float64": "float64"}
+
+INT64_MAX = 2**63 - 1
+
+# largest int that converts to float exactly
+FLOAT_EXACT_INT = 2**53
+
+_backend = "python"
+
+
+def set_backend(name):
+    """Select the compute backend used by Vec: "python" or "numpy"."""
+    global _backend
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name}. Expected one of {BACKENDS}.")
+
+    if name == "numpy" and numpy is None:
+        raise ImportError("The numpy backend requires numpy to be installed.")
+
+    _backend = name
+
+
+def get_backend():
+    return _backend
+
+
+def enabled(*vecs):
+    """Whether the NumPy kernels should be tried for these Vecs."""
+    return _backend == "numpy" and all(
+        v.dtype in TYPECODES
+        and v._valid is None
+        and isinstance(v._data, (array.array, memoryview))
+        for v in vecs
+    )
+
+
+def _to_numpy(v):
+    """Zero-copy NumPy view of a typed Vec's storage."""
+    values = numpy.asarray(v._data)
+    if v.dtype == "bool":
+        values = values.view(numpy.bool_)
+
+    return values
+
+
+def _from_numpy(values):
+    """Convert a NumPy result to (storage, dtype) for a new Vec."""
+    if values.dtype == numpy.bool_:
+        dtype = "bool"
+        values = values.view(numpy.int8)
+    elif values.dtype.kind in "iu":
+        dtype = "int64"
+        values = values.astype(numpy.int64, copy=False)
+    else:
+        dtype = "float64"
+        values = values.astype(numpy.float64, copy=False)
+
+    return array.array(TYPECODES[dtype], values.tobytes()), dtype
+
+
+def _scalar(value):
+    """NumPy-compatible (values, kind) for a scalar operand, or None."""
+    if type(value) == bool:
+        return numpy.bool_(value), "bool"
+    elif type(value) == int and -INT64_MAX <= value <= INT64_MAX:
+        return numpy.int64(value), "int64"
+    elif type(value) == float:
+        return numpy.float64(value), "float64"
+
+    return None
+
+
+def _max_abs(values, kind):
+    if kind == "float64" or values.size == 0:
+        return 0
+    if kind == "bool":
+        return 1
+
+    return max(-int(values.min()), int(values.max()))
+
+
+if numpy is not None:
+    ARITHMETIC = {
+        operator.add: numpy.add,
+        operator.sub: numpy.subtract,
+        operator.mul: numpy.multiply,
+        operator.truediv: numpy.true_divide,
+        operator.mod: numpy.remainder,
+    }
+
+    COMPARISONS = {
+        operator.eq: numpy.equal,
+        operator.ne: numpy.not_equal,
+        operator.lt: numpy.less,
+        operator.le: numpy.less_equal,
+        operator.gt: numpy.greater,
+        operator.ge: numpy.greater_equal,
+    }
+
+    BITWISE = {
+        operator.and_: numpy.bitwise_and,
+        operator.or_: numpy.bitwise_or,
+        operator.xor: numpy.bitwise_xor,
+    }
+
+
+def binary_op(v, other, op):
+    """Elementwise v <op> other, where other is a typed Vec or a scalar."""
+    if hasattr(other, "dtype"):
+        if len(other) != len(v):
+            return None
+        b, b_kind = _to_numpy(other), other.dtype
+    else:
+        scalar = _scalar(other)
+        if scalar is None:
+            return None
+        b, b_kind = scalar
+
+    a, a_kind = _to_numpy(v), v.dtype
+    kinds = {a_kind, b_kind}
+
+    if op in COMPARISONS:
+        if kinds == {"int64", "float64"} or kinds == {"bool", "float64"}:
+            # ints are compared exactly in Python, but converted to float by NumPy
+            int_side = a if a_kind != "float64" else b
+            if _max_abs(numpy.asarray(int_side), "int64") > FLOAT_EXACT_INT:
+                return None
+        return _from_numpy(COMPARISONS[op](a, b))
+
+    if op in BITWISE:
+        if "float64" in kinds:
+            return None
+        if kinds == {"bool"}:
+            return _from_numpy(BITWISE[op](a, b))
+        a, b = a.astype(numpy.int64), b.astype(numpy.int64)
+        return _from_numpy(BITWISE[op](a, b))
+
+    if op not in ARITHMETIC:
+        return None
+
+    # Python arithmetic on bools gives ints
+    if a_kind == "bool":
+        a, a_kind = a.astype(numpy.int64), "int64"
+    if b_kind == "bool":
+        b, b_kind = numpy.asarray(b).astype(numpy.int64), "int64"
+    kinds = {a_kind, b_kind}
+
+    a_max = _max_abs(numpy.asarray(a), a_kind)
+    b_max = _max_abs(numpy.asarray(b), b_kind)
+
+    if op in (operator.truediv, operator.mod):
+        if (numpy.asarray(b) == 0).any():
+            # Python raises ZeroDivisionError
+            return None
+        if op == operator.mod and kinds != {"int64"}:
+            return None
+        if op == operator.truediv and max(a_max, b_max) > FLOAT_EXACT_INT:
+            # Python divides big ints exactly before rounding
+            return None
+    elif kinds == {"int64"}:
+        # Python ints never overflow
+        if op == operator.mul and a_max * b_max > INT64_MAX:
+            return None
+        if op != operator.mul and a_max + b_max > INT64_MAX:
+            return None
+    elif max(a_max, b_max) > FLOAT_EXACT_INT:
+        # mixed int and float: Python converts ints to float the same way, but
+        # avoid relying on it for values that can't be represented exactly
+        return None
+
+    # overflow to inf and friends match Python floats; just don't warn about it
+    with numpy.errstate(all="ignore"):
+        return _from_numpy(ARITHMETIC[op](a, b))
+
+
+def unary_op(v, op):
+    a = _to_numpy(v)
+
+    if op == operator.not_:
+        return _from_numpy(numpy.logical_not(a))
+
+    if v.dtype == "bool":
+        a = a.astype(numpy.int64)
+    elif v.dtype == "int64" and a.size and int(a.min()) == -INT64_MAX - 1:
+        # negating the smallest int64 overflows
+        return None
+
+    if op == operator.neg:
+        return _from_numpy(numpy.negative(a))
+    elif op == operator.pos:
+        return _from_numpy(numpy.positive(a))
+    elif op == abs:
+        return _from_numpy(numpy.absolute(a))
+
+    return None
+
+
+def total(v):
+    """Sum of a typed Vec, or None."""
+    a = _to_numpy(v)
+
+    if v.dtype == "bool":
+        return int(numpy.count_nonzero(a))
+    elif v.dtype == "int64":
+        if a.size * _max_abs(a, "int64") > INT64_MAX:
+            return None
+        return int(a.sum())
+
+    # NumPy sums floats pairwise, which rounds differently from sum()
+    return None
+
+
+def compress(v, mask):
+    """Elements of v where the bool Vec mask is set."""
+    return _from_numpy(_to_numpy(v)[_to_numpy(mask)])
+
+
+def isnull(v):
+    a = _to_numpy(v)
+
+    if v.dtype == "float64":
+        return _from_numpy(numpy.isnan(a))
+
+    return _from_numpy(numpy.zeros(a.size, dtype=numpy.bool_))
+
+
+def fillna(v, default):
+    a = _to_numpy(v)
+
+    if v.dtype != "float64":
+        return _from_numpy(a.copy())
+
+    nulls = numpy.isnan(a)
+    if not nulls.any():
+        return _from_numpy(a.copy())
+    if type(default) != float:
+        # the Python path ends up with a mixed (object) column
+        return None
+
+    return _from_numpy(numpy.where(nulls, default, a))
+
+
+def distinct(v):
+    a = _to_numpy(v)
+
+    if v.dtype == "float64" and (numpy.isnan(a).any() or (a == 0).any()):
+        # set() treats NaN and signed zeros differently from numpy.unique
+        return None
+
+    return _from_numpy(numpy.unique(a))
+
+
+def select(v, ranks):
+    """The k-th smallest value of a typed Vec for each k in ranks, as a dict."""
+    ranks = sorted(set(ranks))
+    a = numpy.partition(_to_numpy(v), ranks)
+
+    return {k: a[k].item() for k in ranks}
+
+
+def all_(v):
+    return bool(_to_numpy(v).all())
+
+
+def any_(v):
+    return bool(_to_numpy(v).any())
+
+
+if os.environ.get("MINI_PANDAS_BACKEND"):
+    set_backend(os.environ["MINI_PANDAS_BACKEND"])
@@ -0,0 +1,220 @@
+"""Native binary columnar file format.
+
+Layout:
+
+    magic        8 bytes, b"MINIPD01"
+    header size  8 bytes, little-endian
+    header       JSON: row count, byte order and, per column, its name, dtype,
+                 encoding and the offsets and sizes of its buffers
+    buffers      one or more per column, each aligned to 8 bytes
+
+Columns are encoded as:
+
+    plain       the raw bool/int64/float64 values
+    strings     int64 offsets into a buffer of concatenated UTF-8 strings
+    dictionary  int32 codes (-1 for None) of categories stored as strings, for
+                categorical columns of strings
+
+Columns with nulls (typed columns, or object columns holding only one type of
+value besides None) store their non-null values with that type's encoding, plus a
+buffer of one byte per row flagging the nulls.
+
+Plain columns without nulls and the codes of dictionary columns can be loaded as
+zero-copy views of a memory-mapped file, so opening a file only touches the columns
+that are asked for.
+"""
+import array
+import itertools
+import json
+import mmap as mmap_module
+import sys
+
+from . import df as df_module
+from . import vec
+
+MAGIC = b"MINIPD01"
+ALIGNMENT = 8
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _string_buffers(strings):
+    """Offsets and concatenated UTF-8 bytes of a list of strings."""
+    encoded = [v.encode("utf-8") for v in strings]
+    offsets = array.array("q", itertools.accumulate(map(len, encoded), initial=0))
+
+    return [offsets, b"".join(encoded)]
+
+
+def _column_buffers(name, column):
+    """Header entry and data buffers for one column."""
+    if column.dtype == "category" and all(type(c) == str for c in column.categories):
+        codes = column._data
+        if not (
+            isinstance(codes, array.array)
+            or (isinstance(codes, memoryview) and codes.contiguous)
+        ):
+            codes = array.array(vec.CODE_TYPECODE, codes)
+
+        entry = {"name": name, "dtype": "category", "encoding": "dictionary"}
+        return entry, [codes] + _string_buffers(column.categories)
+
+    if column.dtype in vec.TYPECODES and column._valid is None:
+        data = column._data
+        if not (
+            isinstance(data, (array.array, memoryview)) and memoryview(data).contiguous
+        ):
+            data = vec.make_storage(data, column.dtype)
+
+        return {"name": name, "dtype": column.dtype, "encoding": "plain"}, [data]
+
+    values = list(column)
+    nulls = bytes(v is None for v in values)
+    non_null = [v for v in values if v is not None]
+    types = set(map(type, non_null))
+
+    if types <= {str}:
+        entry = {"name": name, "dtype": "object", "encoding": "strings"}
+        buffers = _string_buffers(non_null)
+    elif len(types) == 1 and vec.infer_dtype(non_null) != "object":
+        dtype = vec.infer_dtype(non_null)
+        entry = {"name": name, "dtype": dtype, "encoding": "plain"}
+        buffers = [array.array(vec.TYPECODES[dtype], non_null)]
+    else:
+        raise TypeError(
+            f"Can't store column {name}: expected a single type besides None, "
+            f"got {sorted(t.__name__ for t in types)}."
+        )
+
+    if non_null and len(non_null) == len(values):
+        return entry, buffers
+
+    entry["nulls"] = True
+    return entry, buffers + [nulls]
+
+
+def write_binary(df, path):
+    """Write a DF to path in the binary columnar format."""
+    entries = []
+    buffers = []
+    for name in df.columns:
+        entry, column_buffers = _column_buffers(name, df[name])
+        entries.append(entry)
+        buffers.append(column_buffers)
+
+    # lay out the buffers, each aligned, relative to the start of the data
+    offset = 0
+    for entry, column_buffers in zip(entries, buffers):
+        entry["buffers"] = []
+        for buffer in column_buffers:
+            nbytes = memoryview(buffer).nbytes
+            entry["buffers"].append([offset, nbytes])
+            offset = _aligned(offset + nbytes)
+
+    header = json.dumps(
+        {"length": len(df), "byteorder": sys.byteorder, "columns": entries}
+    ).encode("utf-8")
+
+    with open(path, "wb") as ofile:
+        ofile.write(MAGIC)
+        ofile.write(len(header).to_bytes(8, "little"))
+        ofile.write(header)
+
+        data_start = _aligned(ofile.tell())
+        for entry, column_buffers in zip(entries, buffers):
+            for (offset, _), buffer in zip(entry["buffers"], column_buffers):
+                ofile.write(bytes(data_start + offset - ofile.tell()))
+                ofile.write(buffer)
+
+
+def read_binary(path, columns=None, mmap=True):
+    """Read a DF written by DF.to_binary.
+
+    Only the given columns (default: all) are read. With mmap, plain columns
+    without nulls are zero-copy views of the memory-mapped file, copied only if
+    they are modified.
+    """
+    with open(path, "rb") as ifile:
+        if ifile.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a mini-pandas binary file.")
+
+        header_size = int.from_bytes(ifile.read(8), "little")
+        header = json.loads(ifile.read(header_size).decode("utf-8"))
+
+        entries = {entry["name"]: entry for entry in header["columns"]}
+        if columns is None:
+            columns = list(entries)
+
+        missing = set(columns) - set(entries)
+        if missing:
+            raise ValueError(f"Columns {sorted(missing)} not found in {path}.")
+
+        data_start = _aligned(len(MAGIC) + 8 + header_size)
+        swap = header["byteorder"] != sys.byteorder
+
+        if mmap and not swap:
+            data = memoryview(
+                mmap_module.mmap(ifile.fileno(), 0, access=mmap_module.ACCESS_READ)
+            )
+
+            def read(offset, nbytes):
+                return data[data_start + offset : data_start + offset + nbytes]
+
+        else:
+
+            def read(offset, nbytes):
+                ifile.seek(data_start + offset)
+                return memoryview(ifile.read(nbytes))
+
+        df = df_module.DF()
+        for name in columns:
+            df[name] = _read_column(entries[name], read, swap)
+
+    return df
+
+
+def _read_column(entry, read, swap):
+    buffers = [read(offset, nbytes) for offset, nbytes in entry["buffers"]]
+
+    def typed(buffer, typecode):
+        if swap:
+            values = array.array(typecode, buffer.tobytes())
+            values.byteswap()
+            return values
+
+        return buffer.cast(typecode)
+
+    def strings(offsets, data):
+        offsets = typed(offsets, "q")
+        data = data.tobytes()
+        return [
+            data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])
+        ]
+
+    if entry["encoding"] == "dictionary":
+        categories = strings(buffers[1], buffers[2])
+        codes_of = {category: code for code, category in enumerate(categories)}
+        return vec.Categorical._from_codes(
+            typed(buffers[0], vec.CODE_TYPECODE), categories, codes_of
+        )
+    elif entry["encoding"] == "plain":
+        values = typed(buffers[0], vec.TYPECODES[entry["dtype"]])
+    else:
+        values = strings(buffers[0], buffers[1])
+
+    if not entry.get("nulls"):
+        if isinstance(values, list):
+            return vec.Vec(values, "object")
+        return vec.Vec._from_storage(values, entry["dtype"])
+
+    # fill the non-null values back in around the nulls
+    values = iter(values)
+    if entry["dtype"] == "bool":
+        values = map(bool, values)
+
+    return vec.Vec(
+        [None if isnull else next(values) for isnull in buffers[-1].tobytes()],
+        entry["dtype"],
+    )
@@ -0,0 +1,166 @@
+"""Bit-packed sequence of booleans.
+
+Bits are packed eight to a byte, least significant bit first. Whole-bitmap
+operations convert to and from Python ints, so that and/or/xor/not and popcount
+run in C rather than looping over elements.
+"""
+import itertools
+
+# translation tables between one byte per flag and "0"/"1" digits
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _pack(flags):
+    """Bitmap bytes for a bytes-like object holding one 0 or 1 byte per flag."""
+    if not flags:
+        return bytearray()
+
+    bits = int(bytes(flags).translate(_TO_DIGITS)[::-1], 2)
+    return bytearray(bits.to_bytes((len(flags) + 7) // 8, "little"))
+
+
+class Bitmap:
+    def __init__(self, values=()):
+        if isinstance(values, Bitmap):
+            self.bits = bytearray(values.bits)
+            self.length = values.length
+        else:
+            flags = bytes(map(bool, values))
+            self.bits = _pack(flags)
+            self.length = len(flags)
+
+    @classmethod
+    def from_int(cls, value, length):
+        bitmap = cls.__new__(cls)
+        bitmap.bits = bytearray(value.to_bytes((length + 7) // 8, "little"))
+        bitmap.length = length
+        return bitmap
+
+    @classmethod
+    def from_flags(cls, flags):
+        """Bitmap from a bytes-like object holding one 0 or 1 byte per flag."""
+        bitmap = cls.__new__(cls)
+        bitmap.bits = _pack(flags)
+        bitmap.length = len(flags)
+        return bitmap
+
+    @classmethod
+    def from_positions(cls, positions, length):
+        """Bitmap of the given length with only the bits at positions set."""
+        bitmap = cls.__new__(cls)
+        bitmap.bits = bytearray((length + 7) // 8)
+        bitmap.length = length
+        for position in positions:
+            bitmap.bits[position >> 3] |= 1 << (position & 7)
+        return bitmap
+
+    def __repr__(self):
+        return f"Bitmap({self.flags().translate(_TO_DIGITS).decode()})"
+
+    def to_int(self):
+        return int.from_bytes(self.bits, "little")
+
+    def flags(self):
+        """bytes holding one 0 or 1 byte per flag."""
+        if not self.length:
+            return b""
+
+        digits = format(self.to_int(), "b").zfill(self.length)
+        return digits[::-1].encode().translate(_FROM_DIGITS)
+
+    def copy(self):
+        return Bitmap(self)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return map(bool, self.flags())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.indices(self.length) == (0, self.length, 1):
+                return self.copy()
+
+            return Bitmap.from_flags(self.flags()[key])
+
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("Bitmap index out of range")
+
+        return bool(self.bits[key >> 3] >> (key & 7) & 1)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            flags = bytearray(self.flags())
+            flags[key] = bytes(map(bool, value))
+            self._replace(flags)
+            return
+
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("Bitmap assignment index out of range")
+
+        if value:
+            self.bits[key >> 3] |= 1 << (key & 7)
+        else:
+            self.bits[key >> 3] &= ~(1 << (key & 7)) & 0xFF
+
+    def _replace(self, flags):
+        self.bits = _pack(flags)
+        self.length = len(flags)
+
+    def __delitem__(self, key):
+        flags = bytearray(self.flags())
+        del flags[key]
+        self._replace(flags)
+
+    def insert(self, index, value):
+        flags = bytearray(self.flags())
+        flags.insert(index, bool(value))
+        self._replace(flags)
+
+    def append(self, value):
+        if self.length % 8 == 0:
+            self.bits.append(0)
+        self.length += 1
+        self[self.length - 1] = value
+
+    def extend(self, values):
+        flags = bytes(map(bool, values))
+
+        # fill up the last, partial byte, then pack the rest onto the end
+        fill = -self.length % 8
+        for flag in flags[:fill]:
+            if flag:
+                self.bits[-1] |= 1 << (self.length & 7)
+            self.length += 1
+
+        self.bits += _pack(flags[fill:])
+        self.length += len(flags[fill:])
+
+    def reverse(self):
+        self._replace(self.flags()[::-1])
+
+    def count(self):
+        """Number of set bits."""
+        return bin(self.to_int()).count("1")
+
+    def indices(self):
+        """Positions of the set bits, in order."""
+        return list(itertools.compress(range(self.length), self.flags()))
+
+    def __and__(self, other):
+        return Bitmap.from_int(self.to_int() & other.to_int(), self.length)
+
+    def __or__(self, other):
+        return Bitmap.from_int(self.to_int() | other.to_int(), self.length)
+
+    def __xor__(self, other):
+        return Bitmap.from_int(self.to_int() ^ other.to_int(), self.length)
+
+    def __invert__(self):
+        return Bitmap.from_int(self.to_int() ^ ((1 << self.length) - 1), self.length)
@@ -0,0 +1,145 @@
+"""Least-recently-used cache of results derived from Vecs.
+
+Results are keyed by Vec and by what was computed, and are only returned while the
+Vec's version is unchanged, i.e. until it's modified. The cache holds at most
+LIMIT bytes of results, evicting the least recently used ones first. A Vec's results
+are dropped as soon as it's garbage-collected.
+"""
+import collections
+import sys
+import threading
+import weakref
+
+LIMIT = 64 * 2**20
+
+# (id of Vec, name) -> (weak reference to Vec, version, result, size in bytes)
+_entries = collections.OrderedDict()
+_size = 0
+_lock = threading.Lock()
+
+# id of each live Vec that has had results cached -> (weak reference to it, whose
+# callback drops its results, and the names of its cached results)
+_vecs = {}
+# ids of Vecs collected while the lock was held, whose results are yet to be dropped
+_dead = collections.deque()
+
+
+def set_limit(nbytes):
+    """Set the most bytes of results to keep. 0 turns caching off."""
+    global LIMIT
+
+    with _lock:
+        LIMIT = nbytes
+        _evict()
+        _drop_dead()
+
+
+def clear():
+    global _size
+
+    with _lock:
+        _entries.clear()
+        _vecs.clear()
+        _dead.clear()
+        _size = 0
+
+
+def _nbytes(result):
+    """Rough size of a result: its buffer for a Vec, otherwise the object."""
+    data = getattr(result, "_data", result)
+    data = getattr(data, "bits", data)
+
+    try:
+        return memoryview(data).nbytes
+    except TypeError:
+        return sys.getsizeof(data)
+
+
+def _remove(key):
+    global _size
+
+    entry = _entries.pop(key, None)
+    if entry is not None:
+        _size -= entry[3]
+
+    vec = _vecs.get(key[0])
+    if vec is not None:
+        vec[1].discard(key[1])
+
+
+def _collected(ref, vec_id):
+    """Weak reference callback: drop the results of a Vec that's been collected."""
+    _dead.append((ref, vec_id))
+
+    # the collection may have interrupted code holding the lock, in which case
+    # that code drops the results before releasing it
+    if _lock.acquire(blocking=False):
+        try:
+            _drop_dead()
+        finally:
+            _lock.release()
+
+
+def _drop_dead():
+    """Drop the results of the Vecs in _dead. Call with the lock held."""
+    while _dead:
+        ref, vec_id = _dead.popleft()
+        vec = _vecs.get(vec_id)
+        # the id may have been reused by a newer Vec since
+        if vec is not None and vec[0] is ref:
+            del _vecs[vec_id]
+            for name in vec[1]:
+                _remove((vec_id, name))
+
+
+def _track(v, name):
+    """Weak reference to a Vec, recording that a result named name is cached."""
+    vec = _vecs.get(id(v))
+    if vec is not None and vec[0]() is not v:
+        # a collected Vec had this id, and its results haven't been dropped yet
+        for stale in list(vec[1]):
+            _remove((id(v), stale))
+        vec = None
+
+    if vec is None:
+        ref = weakref.ref(v, lambda ref, vec_id=id(v): _collected(ref, vec_id))
+        vec = _vecs[id(v)] = (ref, set())
+
+    vec[1].add(name)
+    return vec[0]
+
+
+def _evict():
+    while _size > LIMIT:
+        _remove(next(iter(_entries)))
+
+
+def lookup(v, name, compute):
+    """Cached result of compute() for a Vec, computing and caching it if needed."""
+    global _size
+
+    key = (id(v), name)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            ref, version, result, _ = entry
+            if ref() is v and version == v._version:
+                _entries.move_to_end(key)
+                _drop_dead()
+                return result
+            _remove(key)
+        _drop_dead()
+
+    result = compute()
+    nbytes = _nbytes(result)
+
+    with _lock:
+        if nbytes <= LIMIT:
+            if key in _entries:
+                _remove(key)
+            _entries[key] = (_track(v, name), v._version, result, nbytes)
+            _size += nbytes
+            _evict()
+        _drop_dead()
+
+    return result
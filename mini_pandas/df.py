@@ -1,13 +1,31 @@
+import concurrent.futures
+import contextlib
 import csv
-import itertools
 import functools
+import glob
+import heapq
+import io
+import itertools
+import locale
+import math
+import operator
+import os
+import pickle
+import tempfile
 
-from . import vec
+from . import binary, expr, fused
+from . import index as index_module
+from . import lazy, selection, vec
+from . import window as window_module
 
 
 class DF(dict):
     """Dataframe, or two-dimensional table."""
 
+    # column looked up by loc, and the kind of index kept on it. See set_index.
+    index_column = None
+    index_kind = "hash"
+
     def __init__(self, data=None):
         super().__init__()
 
@@ -25,7 +43,8 @@ class DF(dict):
 
     def __str__(self):
         column_widths = [
-            max(len(c), max(self[c].apply(lambda v: len(str(v))))) for c in self.columns
+            max(len(c), max(map(len, map(str, self[c])), default=0))
+            for c in self.columns
         ]
 
         def format_row(row):
@@ -44,7 +63,7 @@ class DF(dict):
         header_border = format_row(["-" * maxlen for maxlen in column_widths])
 
         rows = [header_row, header_border] + [
-            format_row(row) for row in self.iterrows()
+            format_row(row) for row in self.itertuples()
         ]
 
         return "\n".join(rows)
@@ -113,14 +132,30 @@ class DF(dict):
                 df[column] = self[column]
 
             return df
-        elif isinstance(key, slice) or (isinstance(key, list) and type(key[0]) == bool):
+        elif (
+            isinstance(key, slice)
+            or (isinstance(key, vec.Vec) and key.dtype == "bool")
+            or (isinstance(key, (list, vec.Vec)) and type(key[0]) == bool)
+        ):
             # multi-row select
-            # create new DF with selected rows
+            # create new DF with views of the selected rows
+            if not isinstance(key, slice):
+                assert len(key) == len(self)
+
+                # share one selection vector between all the columns
+                if isinstance(key, vec.Mask):
+                    return self.take(key.indices())
+
+                return self.take(list(itertools.compress(range(len(self)), key)))
+
             df = DF()
             for column in self.columns:
                 df[column] = self[column][key]
 
             return df
+        elif isinstance(key, expr.Expr):
+            # boolean expression, which can use column indexes
+            return index_module.filter_rows(self, key)
         elif isinstance(key, tuple):
             # recursively peel off indexes from tuple
             if len(key) == 0:
@@ -131,40 +166,235 @@ class DF(dict):
         # default: fall back to dict behaviour - single column select
         return super().__getitem__(key)
 
+    def create_index(self, column, kind="hash"):
+        """Index a column, to find the rows holding given values without a scan.
+
+        A "hash" index answers equality lookups; a "sorted" index also answers range
+        lookups (<, <=, >, >=). Comparing the column with a constant, whether as
+        df[col] == value or as a col() expression in df[...] or a lazy filter, then
+        uses the index. It's kept up to date by append(), and dropped if the column
+        is modified any other way.
+        """
+        self[column]._index = index_module.build(self[column], kind)
+
+    @property
+    def indexes(self):
+        """Current index of each indexed column."""
+        return {name: c._index for name, c in self.items() if c._index is not None}
+
+    def set_index(self, column, kind="hash"):
+        """Index a column and make it the one looked up by loc."""
+        self.create_index(column, kind)
+        self.index_column = column
+        self.index_kind = kind
+
+    @property
+    def loc(self):
+        """Rows by index column value: df.loc[key], df.loc[[keys]], df.loc[low:high].
+
+        Ranges include both ends, and are only fast with a sorted index.
+        """
+        return index_module.Loc(self)
+
+    def eval(self, expression):
+        """Evaluate an expression string over the columns, e.g. "Price * 1.1 + Tax".
+
+        See expr.parse for the syntax. The expression is compiled into a single loop
+        over the rows, without intermediate Vecs; see the fused module.
+        """
+        return fused.evaluate(self, expression)
+
+    def query(self, expression):
+        """Rows where an expression string holds, e.g. "Price * 1.1 + Tax > 5"."""
+        return self[expr.parse(expression)]
+
+    def rolling(self, window, min_periods=None):
+        """Window statistics of each numeric column, as with Vec.rolling."""
+        return window_module.Rolling(self, window, min_periods)
+
+    def expanding(self, min_periods=1):
+        """Expanding statistics of each numeric column, as with Vec.expanding."""
+        return window_module.Expanding(self, min_periods)
+
+    def lazy(self):
+        """LazyDF over this DF, to build up an optimized query. See lazy.LazyDF."""
+        return lazy.LazyDF(lazy.Scan(self))
+
+    def take(self, indices):
+        """Select rows by position, in the given order."""
+        df = DF()
+        for column in self.columns:
+            df[column] = self[column].take(indices)
+
+        return df
+
     def groupby(self, *columns):
-        uniques = [self[c].distinct() for c in columns]
+        key_columns = [self[c] for c in columns]
+        categorical = [column.dtype == "category" for column in key_columns]
+
+        # single pass over the rows: hash each row's key values to a group id,
+        # using the codes of categorical columns, which are cheaper to hash
+        group_index = {}
+        group_ids = []
+        for key_values in zip(
+            *[
+                column._data if is_category else column
+                for column, is_category in zip(key_columns, categorical)
+            ]
+        ):
+            group_id = group_index.get(key_values)
+            if group_id is None:
+                key_values = _group_key(key_values)
+                group_id = group_index.get(key_values)
+                if group_id is None:
+                    group_id = group_index[key_values] = len(group_index)
+            group_ids.append(group_id)
+
+        groups = list(group_index)
+        if any(categorical):
+            groups = [
+                tuple(
+                    column.decode(v) if is_category else v
+                    for column, is_category, v in zip(key_columns, categorical, key)
+                )
+                for key in groups
+            ]
+
+        return GroupBy(self, columns, groups, group_ids)
+
+    def merge(self, other, on, how="inner", suffixes=("_x", "_y"), partitions=None):
+        """Join with another DF on one or more key columns.
+
+        how is "inner", "left", "right" or "outer". Rows missing from one side get
+        None in that side's columns. Other columns present in both DFs get the given
+        suffixes.
 
-        subsets = []
+        This is a hash join, which builds a table on the smaller of the two DFs. Rows
+        come out in the order of this DF (of other, for a right join), followed by
+        unmatched rows of the other DF for an outer join.
 
-        for column_values in itertools.product(*uniques):
-            conditions = [self[c] == v for c, v in zip(columns, column_values)]
-            condition = functools.reduce(lambda a, b: a & b, conditions)
+        With partitions, both DFs are first split by key hash into that many
+        partitions, which are spilled to temporary files and joined one pair at a
+        time, so that only one partition's hash table is in memory at once. Rows then
+        come out grouped by partition.
+        """
+        on = [on] if isinstance(on, str) else list(on)
+        if how not in ("inner", "left", "right", "outer"):
+            raise ValueError(f"Unknown join type {how}.")
 
-            subset_df = self[condition]
-            if len(subset_df) == 0:
+        for key in on:
+            if key not in self or key not in other:
+                raise KeyError(f"Join key {key} must be a column of both DFs.")
+
+        if partitions is not None:
+            return _merge_partitioned(self, other, on, how, suffixes, partitions)
+
+        if how == "right":
+            right_rows, left_rows = _join_rows(other, self, on, "left")
+        else:
+            left_rows, right_rows = _join_rows(self, other, on, how)
+
+        df = DF()
+        for key in on:
+            df[key] = [
+                self[key][li] if li is not None else other[key][ri]
+                for li, ri in zip(left_rows, right_rows)
+            ]
+
+        left_columns = [c for c in self.columns if c not in on]
+        right_columns = [c for c in other.columns if c not in on]
+        overlap = set(left_columns) & set(right_columns)
+
+        for source, columns, rows, suffix in [
+            (self, left_columns, left_rows, suffixes[0]),
+            (other, right_columns, right_rows, suffixes[1]),
+        ]:
+            for c in columns:
+                name = c + suffix if c in overlap else c
+                df[name] = _take_or_none(source[c], rows)
+
+        return df
+
+    def sort_values(self, by, ascending=True, run_rows=None):
+        """Sort rows by one or more columns.
+
+        ascending is a bool, or one per column in by. The sort is stable, and puts
+        nulls last. Every column is permuted by a single list of row positions.
+
+        With run_rows, sort runs of that many rows separately and spill each to a
+        temporary file, then merge the runs, holding only one batch of rows per run
+        in memory at a time (external merge sort).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(by)
+        if len(ascending) != len(by):
+            raise ValueError(
+                f"Got {len(ascending)} ascending flags for {len(by)} columns."
+            )
+
+        if run_rows is not None:
+            return _sort_external(self, by, ascending, run_rows)
+
+        # sort by the last column first, relying on each sort being stable
+        order = range(len(self))
+        for column, column_ascending in reversed(list(zip(by, ascending))):
+            order = self[column]._sorted_positions(order, column_ascending)
+
+        return self.take(order)
+
+    def nlargest(self, n, column):
+        """The n rows with the largest values in column, largest first.
+
+        Uses a heap of n rows, so takes O(len * log n) time. Ties keep row order, and
+        nulls are skipped.
+        """
+        return self.take(self[column]._top(n, heapq.nlargest))
+
+    def nsmallest(self, n, column):
+        """The n rows with the smallest values in column, smallest first."""
+        return self.take(self[column]._top(n, heapq.nsmallest))
+
+    def describe(self):
+        """Count, mean, std, min, quartiles and max of each int and float column.
+
+        Gives a DF with a float64 column of each, and a row per statistic, named in
+        its "statistic" column. The count, mean, std, min and max of a column come
+        from one pass over it, and its quartiles are selected together rather than
+        sorted for.
+        """
+        result = DF({"statistic": DESCRIBE_STATISTICS})
+        for name, column in self.items():
+            if column.dtype not in ("int64", "float64"):
                 continue
 
-            subsets.append((column_values, subset_df))
+            count, mean, _, low, high = column._summary()
+            q1, median, q3 = column.quantile([0.25, 0.5, 0.75])
+            result[name] = vec.Vec(
+                [count, mean, column.std(), low, q1, median, q3, high], "float64"
+            )
 
-        return GroupBy(columns, subsets)
+        return result
 
     def distinct(self):
         seen_rows = set()
         unseen_flags = []
 
-        for i in range(len(self)):
-            row = self[i]
-            row_tup = tuple(row)
-
-            unseen_flags.append(row_tup not in seen_rows)
+        for row in self.itertuples():
+            unseen_flags.append(row not in seen_rows)
 
-            seen_rows.add(row_tup)
+            seen_rows.add(row)
 
-        return self[unseen_flags]
+        return self[vec.Mask(unseen_flags)]
 
     def iterrows(self):
-        for i in range(len(self)):
-            yield self[i]
+        """Iterate over rows as "object" Vecs, built without inferring a dtype."""
+        for row in self.itertuples():
+            yield vec.Vec._from_storage(list(row), "object")
+
+    def itertuples(self):
+        """Iterate over rows as plain tuples, which is cheaper than iterrows."""
+        return zip(*self.values())
 
     def isnull(self):
         df = DF()
@@ -175,17 +405,15 @@ class DF(dict):
         return df
 
     def dropna(self, require_all=False):
-        null_flags = self.isnull()
-
-        def condense_row(row):
-            if require_all:
-                return row.all()
-            else:
-                return row.any()
+        masks = [self[name].isnull() for name in self.columns]
+        if not masks:
+            return DF()
 
-        mask = ~vec.Vec([condense_row(row) for row in null_flags.iterrows()])
+        # condense the rows' null flags by combining the columns' whole bitmaps
+        combine = operator.and_ if require_all else operator.or_
+        nulls = functools.reduce(combine, masks)
 
-        return self[mask]
+        return self[~nulls]
 
     def fillna(self, default):
         df = DF()
@@ -196,23 +424,72 @@ class DF(dict):
         return df
 
     def append(self, row):
-        if not len(row) == len(self.columns):
-            raise ValueError(
-                f"Got wrong number of columns: {len(row)}, expecting {len(self.columns)}."
-            )
+        """Append one row: a list in column order, or a dict of column values."""
+        self.extend([row])
+
+    def extend(self, rows):
+        """Append a batch of rows.
+
+        rows is a list of rows (each a list in column order, or a dict of column
+        values), or a dict of columns. The batch is checked against the columns as a
+        whole, and each column is then extended in one go.
+        """
+        columns = self._batch_columns(rows)
+
+        indexes = self.indexes
+        start = len(self)
+
+        for name, values in columns.items():
+            self[name].extend(values)
+
+        # extending drops indexes, so add the new rows to them and put them back;
+        # an index that can't hold a new value (e.g. one that doesn't compare with
+        # its keys) stays dropped, as after any other modification
+        for name, index in indexes.items():
+            column = self[name]
+            try:
+                for position in range(start, len(self)):
+                    index.append(column[position], position)
+            except TypeError:
+                continue
+            column._index = index
+
+    def _batch_columns(self, rows):
+        """Values for each column from a batch of rows. See extend."""
+        names = self.columns
+
+        if isinstance(rows, dict):
+            if rows.keys() != self.keys():
+                raise ValueError(
+                    f"Got mismatched column names {list(rows)}, expecting {names}."
+                )
+
+            columns = {name: list(rows[name]) for name in names}
+            if len(set(map(len, columns.values()))) > 1:
+                raise ValueError("Got columns of different lengths.")
+
+            return columns
 
-        if isinstance(row, list):
-            # assume matching column order
-            for col, value in zip(self.columns, row):
-                self[col].append(value)
-        elif isinstance(row, dict):
-            if not all([col in self.columns for col in row.keys()]):
+        rows = list(rows)
+        for row in rows:
+            if not len(row) == len(names):
                 raise ValueError(
-                    f"Got mismatched column names {row.keys()}, expecting {self.columns}."
+                    f"Got wrong number of columns: {len(row)}, expecting {len(names)}."
                 )
 
-            for col, value in row.items():
-                self[col].append(value)
+        if rows and isinstance(rows[0], dict):
+            for row in rows:
+                if row.keys() != self.keys():
+                    raise ValueError(
+                        f"Got mismatched column names {list(row)}, expecting {names}."
+                    )
+
+            return {name: [row[name] for row in rows] for name in names}
+
+        if not rows:
+            return {name: [] for name in names}
+
+        return dict(zip(names, map(list, zip(*rows))))
 
     def to_csv(self, filename, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL):
         with open(filename, "w", newline="") as ofile:
@@ -220,120 +497,803 @@ class DF(dict):
                 ofile, delimiter=delimiter, quotechar=quotechar, quoting=quoting
             )
             writer.writerow(self.columns)
-            for row in self.iterrows():
-                writer.writerow(row)
+            writer.writerows(self.itertuples())
 
+    def to_binary(self, path):
+        """Write to path in mini-pandas' binary columnar format. See read_binary."""
+        binary.write_binary(self, path)
 
-def read_csv(filename, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL):
-    with open(filename, "r") as ifile:
-        reader = csv.reader(
-            ifile, delimiter=delimiter, quotechar=quotechar, quoting=quoting
-        )
 
-        rows = [row for row in reader]
-        column_names = rows[0]
-        rows = rows[1:]
+# rows of DF.describe
+DESCRIBE_STATISTICS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
 
-    column_data = [list(column) for column in zip(*rows)]
+# rows per pickle written when spilling join partitions to disk
+SPILL_BATCH_ROWS = 10000
 
-    # insert nulls
-    for i in range(len(column_names)):
-        for j in range(len(rows)):
-            if column_data[i][j] == "":
-                column_data[i][j] = None
+# read_csv dtypes, and the function that parses a non-null field into each
+PARSERS = {"int64": int, "float64": float, "category": str, "object": str}
+DTYPE_ALIASES = {int: "int64", float: "float64", str: "object"}
+PARSE_DTYPES = {int: "int64", float: "float64"}
+# order in which inferred dtypes widen
+WIDTHS = {"int64": 0, "float64": 1, "category": 2, "object": 3}
 
-    df = DF()
+# string columns with at most this many distinct values per row are read as
+# categorical
+CATEGORY_MAX_FRACTION = 0.5
+
+# encoding that open() uses for text files, which read_csv relies on
+ENCODING = locale.getpreferredencoding(False)
+
+
+def _parse_column(values, dtype):
+    """Parse a column of CSV fields as the given dtype. Empty fields become None."""
+    parse = PARSERS[dtype]
+
+    return [parse(v) if v != "" else None for v in values]
+
+
+def _infer_column(values):
+    """Parse a column of CSV fields as the narrowest of int, float or string.
+
+    Makes a single pass, widening from int to float to string as fields require it.
+    Returns the chosen dtype (None if every field is empty) and the parsed values.
+    """
+    parse = int
+    parsed = []
+
+    for v in values:
+        if v == "":
+            parsed.append(None)
+            continue
 
-    for name, data in zip(column_names, column_data):
-        # cast numerics if possible
         try:
-            data_float = [float(d) if d is not None else None for d in data]
-            data_int = [int(d) if d is not None else None for d in data]
-            if all(
-                (dfloat is None and dint is None) or (dfloat == dint)
-                for dfloat, dint in zip(data_float, data_int)
-            ):
-                data = data_int
-            else:
-                data = data_float
+            parsed.append(parse(v))
         except ValueError:
-            # could not cast to numeric; leave as string
-            pass
+            if parse is float:
+                # could not cast to numeric; leave as string
+                return _infer_strings(values)
+
+            try:
+                value = float(v)
+            except ValueError:
+                return _infer_strings(values)
+
+            # widen the ints parsed so far
+            parse = float
+            parsed = [float(p) if p is not None else None for p in parsed]
+            parsed.append(value)
+
+    if parsed.count(None) == len(parsed):
+        return None, parsed
+
+    return PARSE_DTYPES[parse], parsed
+
+
+def _infer_strings(values):
+    """Parse a column of CSV fields as strings, categorical if few are distinct."""
+    parsed = _parse_column(values, "object")
+
+    if len(set(parsed)) <= len(parsed) * CATEGORY_MAX_FRACTION:
+        return "category", parsed
+
+    return "object", parsed
+
+
+def read_csv(
+    filename,
+    delimiter=",",
+    quotechar='"',
+    quoting=csv.QUOTE_MINIMAL,
+    dtype=None,
+    usecols=None,
+    chunksize=None,
+    workers=None,
+):
+    """Read a CSV file with a header row into a DF.
+
+    filename may also be a list of files or a glob pattern, whose rows are
+    concatenated in order. Their header rows must match.
+
+    Numeric columns are cast to int or float where possible, and string columns
+    with few distinct values are read as categorical. Override this with the dtype
+    mapping of column names to "int64"/"float64"/"category"/"object" (or
+    int/float/str). With usecols, only the named columns are parsed and returned.
+
+    With chunksize, return an iterator of DFs of up to chunksize rows each instead, so
+    that only one chunk is in memory at a time. Column types are then inferred from
+    the first chunk, and a later chunk that doesn't fit them raises a ValueError.
+
+    With workers, parse in that many processes: each file is split into byte ranges
+    at record boundaries, and the ranges are parsed in parallel. A file whose split
+    points could fall inside a quoted field is parsed in one piece instead.
+    """
+    filenames = _expand_filenames(filename)
+    options = {"delimiter": delimiter, "quotechar": quotechar, "quoting": quoting}
+    dtypes = {name: DTYPE_ALIASES.get(d, d) for name, d in (dtype or {}).items()}
 
-        df[name] = data
+    if chunksize is not None:
+        if workers is not None:
+            raise ValueError("chunksize can't be combined with workers.")
+
+        return itertools.chain.from_iterable(
+            _read_csv_chunks(f, options, dict(dtypes), usecols, chunksize)
+            for f in filenames
+        )
+
+    if workers is None and len(filenames) == 1:
+        chunks = _read_csv_chunks(filenames[0], options, dtypes, usecols, None)
+        df = next(chunks)
+        chunks.close()
+
+        return df
+
+    return _read_csv_ranges(filenames, options, dtypes, usecols, workers)
+
+
+def infer_csv_dtypes(
+    filename,
+    delimiter=",",
+    quotechar='"',
+    quoting=csv.QUOTE_MINIMAL,
+    dtype=None,
+    usecols=None,
+    chunksize=65536,
+):
+    """dtypes read_csv would infer for the columns of a whole CSV file, as a dict.
+
+    Takes read_csv's options. The file is read chunksize rows at a time, and each
+    column is widened to fit every chunk, as with workers. Columns that are null
+    throughout are left out. Pass the result as read_csv's dtype to read the file in
+    chunks without the first chunk fixing the dtypes.
+    """
+    options = {"delimiter": delimiter, "quotechar": quotechar, "quoting": quoting}
+    dtypes = {name: DTYPE_ALIASES.get(d, d) for name, d in (dtype or {}).items()}
+
+    merged = dict(dtypes)
+    for filename in _expand_filenames(filename):
+        with open(filename, "r", newline="") as ifile:
+            reader = csv.reader(ifile, **options)
+            column_names, select = _select_columns(next(reader), usecols)
+
+            while True:
+                rows = list(itertools.islice(reader, chunksize))
+                if not rows:
+                    break
+
+                inferred = dict(dtypes)
+                _parse_rows(rows, column_names, select, inferred)
+                for name, d in inferred.items():
+                    if WIDTHS[d] > WIDTHS.get(merged.get(name), -1):
+                        merged[name] = d
+
+    return merged
+
+
+def _expand_filenames(filename):
+    if isinstance(filename, (list, tuple)):
+        return list(filename)
+
+    if (
+        isinstance(filename, str)
+        and not os.path.exists(filename)
+        and any(c in filename for c in "*?[")
+    ):
+        filenames = sorted(glob.glob(filename))
+        if not filenames:
+            raise FileNotFoundError(f"No files match {filename}.")
+        return filenames
+
+    return [filename]
+
+
+def _select_columns(column_names, usecols):
+    """Names of the columns to keep, and a function to pick them out of a row."""
+    if usecols is None:
+        return column_names, None
+
+    missing = set(usecols) - set(column_names)
+    if missing:
+        raise ValueError(f"Columns {sorted(missing)} not found.")
+
+    # keep file order, and only ever transpose the selected fields
+    positions = [i for i, name in enumerate(column_names) if name in usecols]
+
+    return [column_names[i] for i in positions], operator.itemgetter(*positions)
+
+
+def _parse_rows(rows, column_names, select, dtypes):
+    """Parse rows of CSV fields into a DF.
+
+    Columns in dtypes are parsed as that dtype. Any other column is inferred, and its
+    inferred dtype is added to dtypes.
+    """
+    if not rows:
+        column_data = [[]] * len(column_names)
+    elif select is None:
+        column_data = zip(*rows)
+    elif len(column_names) == 1:
+        column_data = [list(map(select, rows))]
+    else:
+        column_data = zip(*map(select, rows))
+
+    df = DF()
+    for name, data in zip(column_names, column_data):
+        if name in dtypes:
+            try:
+                values = _parse_column(data, dtypes[name])
+            except ValueError as e:
+                raise ValueError(
+                    f"Column {name} doesn't fit dtype {dtypes[name]}: {e}. "
+                    "Pass dtype= to override."
+                )
+        else:
+            inferred, values = _infer_column(data)
+            if inferred is not None:
+                dtypes[name] = inferred
+
+        if dtypes.get(name) == "category":
+            df[name] = vec.Categorical(values)
+        else:
+            df[name] = values
 
     return df
 
 
-def vstack(*dfs):
+def _read_csv_chunks(filename, options, dtypes, usecols, chunksize):
+    with open(filename, "r", newline="") as ifile:
+        reader = csv.reader(ifile, **options)
+
+        column_names, select = _select_columns(next(reader), usecols)
+
+        first = True
+        while True:
+            rows = list(itertools.islice(reader, chunksize))
+            if not rows and not first:
+                return
+
+            yield _parse_rows(rows, column_names, select, dtypes)
+
+            first = False
+
+
+def _read_csv_header(filename, options):
+    """Column names of a CSV file, and the byte offset where its records start."""
+    quote = options["quotechar"].encode()
+
+    with open(filename, "rb") as ifile:
+        header = ifile.readline()
+        # the header itself may contain quoted newlines
+        while header.count(quote) % 2 == 1:
+            line = ifile.readline()
+            if not line:
+                break
+            header += line
+
+    reader = csv.reader(io.StringIO(header.decode(ENCODING), newline=""), **options)
+
+    return next(reader, []), len(header)
+
+
+def _split_csv(filename, start, parts):
+    """Split the bytes of a CSV file after start into ranges ending at newlines."""
+    size = os.path.getsize(filename)
+    bounds = [start]
+
+    with open(filename, "rb") as ifile:
+        for i in range(1, parts):
+            ifile.seek(max(start + (size - start) * i // parts, bounds[-1]))
+            ifile.readline()
+            if ifile.tell() >= size:
+                break
+            bounds.append(ifile.tell())
+
+    bounds.append(size)
+
+    return list(zip(bounds, bounds[1:]))
+
+
+def _read_csv_range(
+    filename, start, end, strict, column_names, options, dtypes, usecols
+):
+    """Parse the records between two byte offsets of a CSV file.
+
+    Returns the number of quote characters in the range, so that the caller can
+    check the range didn't start inside a quoted field, and the parsed DF along with
+    its dtypes. When strict, the DF is None if the range couldn't be parsed into
+    records with the right number of fields.
+    """
+    with open(filename, "rb") as ifile:
+        ifile.seek(start)
+        data = ifile.read(end - start)
+
+    quotes = data.count(options["quotechar"].encode())
+    reader = csv.reader(io.StringIO(data.decode(ENCODING), newline=""), **options)
+
+    try:
+        rows = list(reader)
+    except csv.Error:
+        if strict:
+            return quotes, None, dtypes
+        raise
+
+    if strict and any(len(row) != len(column_names) for row in rows):
+        return quotes, None, dtypes
+
+    names, select = _select_columns(column_names, usecols)
+    dtypes = dict(dtypes)
+
+    return quotes, _parse_rows(rows, names, select, dtypes), dtypes
+
+
+def _read_csv_ranges(filenames, options, dtypes, usecols, workers):
+    """Read CSV files as byte ranges, in worker processes if workers is given."""
+    headers = [_read_csv_header(f, options) for f in filenames]
+
+    column_names = headers[0][0]
+    for filename, (names, _) in zip(filenames, headers):
+        if names != column_names:
+            raise ValueError(f"Header of {filename} doesn't match {filenames[0]}.")
+
+    # byte ranges to parse for each file
+    parts = max(1, (workers or 1) // len(filenames))
+    ranges = {
+        filename: [
+            (filename, start, end, True)
+            for start, end in _split_csv(filename, header_end, parts)
+        ]
+        for filename, (_, header_end) in zip(filenames, headers)
+    }
+
+    if workers is None:
+        pool = contextlib.nullcontext()
+    else:
+        pool = concurrent.futures.ProcessPoolExecutor(workers)
+
+    with pool:
+
+        def parse(pieces, dtypes):
+            args = (column_names, options, dtypes, usecols)
+            if workers is None:
+                return {p: _read_csv_range(*p, *args) for p in pieces}
+
+            futures = [pool.submit(_read_csv_range, *p, *args) for p in pieces]
+            return dict(zip(pieces, [future.result() for future in futures]))
+
+        results = parse([p for f in filenames for p in ranges[f]], dtypes)
+
+        # a split point is only safe if an even number of quotes come before it,
+        # i.e. it can't be inside a quoted field
+        fallback = []
+        for filename in filenames:
+            quotes = 0
+            for piece in ranges[filename]:
+                count, df, _ = results[piece]
+                if quotes % 2 == 1 or df is None:
+                    _, start, _, _ = ranges[filename][0]
+                    _, _, end, _ = ranges[filename][-1]
+                    fallback.append((filename, start, end, False))
+                    break
+                quotes += count
+
+        for piece in fallback:
+            ranges[piece[0]] = [piece]
+        results.update(parse(fallback, dtypes))
+
+        pieces = [p for f in filenames for p in ranges[f]]
+
+        # ranges are inferred independently; widen each column to fit all of them,
+        # and re-parse the ranges that were inferred narrower
+        merged = dict(dtypes)
+        for piece in pieces:
+            for name, inferred in results[piece][2].items():
+                if WIDTHS[inferred] > WIDTHS.get(merged.get(name), -1):
+                    merged[name] = inferred
+
+        reparse = [
+            p
+            for p in pieces
+            if any(results[p][2].get(name, d) != d for name, d in merged.items())
+        ]
+        results.update(parse(reparse, merged))
+
+    return vstack(*[results[p][1] for p in pieces])
+
+
+def _join_rows(left, right, on, how):
+    """Matching row numbers of two DFs, as a list for each side.
+
+    None stands for a missing row, for unmatched rows in left and outer joins.
+    """
+    left_keys = list(zip(*[left[c] for c in on]))
+    right_keys = list(zip(*[right[c] for c in on]))
+
+    def build(keys):
+        table = {}
+        for i, key in enumerate(keys):
+            rows = table.get(key)
+            if rows is None:
+                rows = table[key] = []
+            rows.append(i)
+
+        return table
+
+    # build the hash table on the smaller side and probe it with the other side
+    if len(right_keys) <= len(left_keys):
+        table = build(right_keys)
+        matches = [table.get(key, ()) for key in left_keys]
+    else:
+        table = build(left_keys)
+        matches = [[] for _ in left_keys]
+        for ri, key in enumerate(right_keys):
+            for li in table.get(key, ()):
+                matches[li].append(ri)
+
+    left_rows = []
+    right_rows = []
+    matched = bytearray(len(right_keys))
+
+    for li, right_matches in enumerate(matches):
+        if right_matches:
+            for ri in right_matches:
+                left_rows.append(li)
+                right_rows.append(ri)
+                matched[ri] = 1
+        elif how in ("left", "outer"):
+            left_rows.append(li)
+            right_rows.append(None)
+
+    if how == "outer":
+        for ri, was_matched in enumerate(matched):
+            if not was_matched:
+                left_rows.append(None)
+                right_rows.append(ri)
+
+    return left_rows, right_rows
+
+
+def _take_or_none(column, rows):
+    if None not in rows:
+        return column.take(rows)
+
+    return vec.Vec([column[i] if i is not None else None for i in rows])
+
+
+def _spill_partitions(df, on, partitions, directory, prefix):
+    """Write the rows of df to one pickle file per key hash partition."""
+    filenames = [os.path.join(directory, f"{prefix}{i}") for i in range(partitions)]
+    files = [open(f, "wb") for f in filenames]
+
+    try:
+        key_positions = [df.columns.index(c) for c in on]
+        batches = [[] for _ in range(partitions)]
+
+        for row in zip(*df.values()):
+            partition = hash(tuple(row[i] for i in key_positions)) % partitions
+            batch = batches[partition]
+            batch.append(row)
+
+            if len(batch) >= SPILL_BATCH_ROWS:
+                pickle.dump(batch, files[partition])
+                batch.clear()
+
+        for batch, ofile in zip(batches, files):
+            pickle.dump(batch, ofile)
+    finally:
+        for ofile in files:
+            ofile.close()
+
+    return filenames
+
+
+def _iter_spilled(filename):
+    """Iterate over the rows of a file of pickled batches, a batch at a time."""
+    with open(filename, "rb") as ifile:
+        while True:
+            try:
+                batch = pickle.load(ifile)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _load_partition(filename, columns):
+    rows = list(_iter_spilled(filename))
+    column_data = zip(*rows) if rows else [[]] * len(columns)
+
+    return DF({c: list(data) for c, data in zip(columns, column_data)})
+
+
+def _merge_partitioned(left, right, on, how, suffixes, partitions):
+    with tempfile.TemporaryDirectory() as directory:
+        left_files = _spill_partitions(left, on, partitions, directory, "left")
+        right_files = _spill_partitions(right, on, partitions, directory, "right")
+
+        results = []
+        for left_file, right_file in zip(left_files, right_files):
+            left_part = _load_partition(left_file, left.columns)
+            right_part = _load_partition(right_file, right.columns)
+            results.append(left_part.merge(right_part, on, how, suffixes))
+
+    return vstack(*results)
+
+
+def _compare_keys(a, b, ascending):
+    """Compare tuples of sort key values, in each key's direction, nulls last."""
+    for x, y, key_ascending in zip(a, b, ascending):
+        x_null = x is None or (type(x) == float and math.isnan(x))
+        y_null = y is None or (type(y) == float and math.isnan(y))
+        if x_null or y_null:
+            if x_null != y_null:
+                return 1 if x_null else -1
+        elif x < y:
+            return -1 if key_ascending else 1
+        elif y < x:
+            return 1 if key_ascending else -1
+
+    return 0
+
+
+def _sort_external(df, by, ascending, run_rows):
+    """Sort with runs of run_rows rows spilled to temporary files, then merged."""
+    key_positions = [df.columns.index(c) for c in by]
+
+    def sort_key(row):
+        return tuple(row[i] for i in key_positions)
+
+    with tempfile.TemporaryDirectory() as directory:
+        runs = []
+        for start in range(0, len(df), run_rows):
+            run = df[start : start + run_rows].sort_values(by, ascending)
+            filename = os.path.join(directory, f"run{len(runs)}")
+            with open(filename, "wb") as ofile:
+                rows = list(run.itertuples())
+                for i in range(0, len(rows), SPILL_BATCH_ROWS):
+                    pickle.dump(rows[i : i + SPILL_BATCH_ROWS], ofile)
+            runs.append(filename)
+
+        # heapq.merge takes equal rows from earlier runs first, so stays stable
+        compare = functools.cmp_to_key(
+            lambda a, b: _compare_keys(sort_key(a), sort_key(b), ascending)
+        )
+        merged = list(heapq.merge(*map(_iter_spilled, runs), key=compare))
+
+    column_data = zip(*merged) if merged else [[]] * len(df.columns)
+
+    result = DF()
+    for c, data in zip(df.columns, column_data):
+        result[c] = vec.Vec(data).astype(df[c].dtype)
+
+    return result
+
+
+def read_binary(path, columns=None, mmap=True):
+    """Read a DF written by DF.to_binary.
+
+    Only the given columns (default: all) are read. With mmap, numeric columns are
+    zero-copy views of the memory-mapped file, copied only if they are modified.
+    """
+    return binary.read_binary(path, columns, mmap)
+
+
+def concat(dfs):
+    """Stack DFs with the same columns on top of each other, into a new DF.
+
+    Each output column is built in one pass over its parts, so concatenating many
+    DFs takes time linear in their total size.
+    """
+    dfs = list(dfs)
+    if not dfs:
+        return DF()
+
+    for df in dfs[1:]:
+        if df.keys() != dfs[0].keys():
+            raise ValueError(
+                f"Columns {df.columns} don't match columns {dfs[0].columns}."
+            )
+
     final_df = DF()
     for c in dfs[0].columns:
-        final_df[c] = vec.Vec(sum([df[c] for df in dfs], []))
+        final_df[c] = vec.concat([df[c] for df in dfs])
 
     return final_df
 
 
+def vstack(*dfs):
+    return concat(dfs)
+
+
+def _group_key(key_values):
+    """A groupby key with its NaNs replaced by math.nan.
+
+    NaN never equals itself, so each NaN would be a group of its own, but a dict
+    matches a key to itself by identity; keyed on the one math.nan, NaNs group
+    together, as nulls do.
+    """
+    return tuple(math.nan if v != v else v for v in key_values)
+
+
 class GroupBy:
     """Partially-computed groupby aggregation of a dataframe.
 
     Use various functions to add aggregate columns to the result.
+    Each one folds its source column into per-group accumulators in a single pass,
+    skipping nulls.
 
     Run .agg() to condense into the final aggregated form.
     """
 
-    def __init__(self, keys, subsets):
+    def __init__(self, df, keys, groups, group_ids):
+        self.df = df
         self.keys = keys
-        self.subsets = subsets
-        self.agg_cols = []
+        # key values of each group, indexed by group id
+        self.groups = groups
+        # group id of each row in df
+        self.group_ids = group_ids
+        self.agg_cols = {}
 
-    def count(self, col=None):
-        def count_column(column):
-            """Create count function based on a given column."""
+    def _pairs(self, column):
+        """(group id, value) of each non-null value of a column.
+
+        Nulls are dropped by the column's null mask, rather than by testing values.
+        """
+        values = self.df[column]
+        nulls = values.isnull()
+        pairs = zip(self.group_ids, values)
+        if not nulls.any():
+            return pairs
+
+        return itertools.compress(pairs, bytes(~nulls))
+
+    def _accumulate(self, column, update, initial=None):
+        """Fold a column's non-null values into one accumulator per group."""
+        acc = [initial] * len(self.groups)
+        for group_id, value in self._pairs(column):
+            acc[group_id] = update(acc[group_id], value)
+
+        return acc
+
+    def _counts(self, column):
+        """Number of non-null values of a column in each group."""
+        counts = [0] * len(self.groups)
+        for group_id, _ in self._pairs(column):
+            counts[group_id] += 1
+
+        return counts
+
+    def _moments(self, column):
+        """Count, mean and sum of squared deviations of each group's non-null values.
 
-            def inner(subset):
-                return sum(~subset[column].isnull())
+        Accumulated with Welford's online update.
+        """
+        n = [0] * len(self.groups)
+        mean = [0.0] * len(self.groups)
+        m2 = [0.0] * len(self.groups)
 
-            return inner
+        for group_id, value in self._pairs(column):
+            n[group_id] += 1
+            delta = value - mean[group_id]
+            mean[group_id] += delta / n[group_id]
+            m2[group_id] += delta * (value - mean[group_id])
 
+        return n, mean, m2
+
+    def _values(self, column):
+        """Non-null values of a column in each group, as lists."""
+        values = [[] for _ in self.groups]
+        for group_id, value in self._pairs(column):
+            values[group_id].append(value)
+
+        return values
+
+    def _sizes(self):
+        sizes = [0] * len(self.groups)
+        for group_id in self.group_ids:
+            sizes[group_id] += 1
+
+        return sizes
+
+    def count(self, col=None):
         if col is None:
-            col_name = "count(*)"
-            count_fxn = len
+            self.agg_cols["count(*)"] = self._sizes()
         else:
-            col_name = f"count({col})"
-            count_fxn = count_column(col)
+            self.agg_cols[f"count({col})"] = self._counts(col)
 
-        for key_values, subset in self.subsets:
-            subset[col_name] = count_fxn(subset)
+        return self
 
-        self.agg_cols.append(col_name)
+    def sum(self, column):
+        self.agg_cols[f"sum({column})"] = self._accumulate(column, operator.add, 0)
 
         return self
 
-    def sum(self, column):
-        for key_values, subset in self.subsets:
-            subset[f"sum({column})"] = sum(subset[column])
+    def min(self, column):
+        self.agg_cols[f"min({column})"] = self._accumulate(
+            column, lambda acc, v: v if acc is None or v < acc else acc
+        )
+
+        return self
+
+    def max(self, column):
+        self.agg_cols[f"max({column})"] = self._accumulate(
+            column, lambda acc, v: v if acc is None or v > acc else acc
+        )
+
+        return self
 
-        self.agg_cols.append(f"sum({column})")
+    def mean(self, column):
+        sums = self._accumulate(column, operator.add, 0)
+        self.agg_cols[f"mean({column})"] = [
+            s / n if n else None for s, n in zip(sums, self._counts(column))
+        ]
 
         return self
 
-    def min(self, column):
-        for key_values, subset in self.subsets:
-            subset[f"min({column})"] = min(subset[column])
+    def var(self, column):
+        """Sample variance, accumulated with Welford's online update."""
+        n, _, m2 = self._moments(column)
+        self.agg_cols[f"var({column})"] = [
+            m / (count - 1) if count > 1 else None for m, count in zip(m2, n)
+        ]
 
-        self.agg_cols.append(f"min({column})")
+        return self
+
+    def median(self, column):
+        """Median of each group, found by selection rather than sorting."""
+        self.agg_cols[f"median({column})"] = [
+            selection.quantiles(values, [0.5])[0] for values in self._values(column)
+        ]
 
         return self
 
-    def max(self, column):
-        for key_values, subset in self.subsets:
-            subset[f"max({column})"] = max(subset[column])
+    def quantile(self, column, q):
+        """Quantile q (from 0 to 1) of each group, as with Vec.quantile."""
+        self.agg_cols[f"quantile({column}, {q})"] = [
+            selection.quantiles(values, [q])[0] for values in self._values(column)
+        ]
 
-        self.agg_cols.append(f"max({column})")
+        return self
+
+    def first(self, column):
+        self.agg_cols[f"first({column})"] = self._accumulate(
+            column, lambda acc, v: v if acc is None else acc
+        )
 
         return self
 
-    def agg(self):
-        return vstack(
-            *[s[1][list(self.keys) + self.agg_cols].distinct() for s in self.subsets]
+    def last(self, column):
+        self.agg_cols[f"last({column})"] = self._accumulate(column, lambda acc, v: v)
+
+        return self
+
+    def rolling(self, column, window, min_periods=None):
+        """Window statistics of a column within each group, as with Vec.rolling.
+
+        Each row's window only holds rows of its own group, and the results are in
+        the DF's row order, e.g. to add as a column.
+        """
+        return window_module.Rolling(
+            self.df[column], window, min_periods, self.group_ids
         )
+
+    def expanding(self, column, min_periods=1):
+        """Expanding statistics of a column within each group."""
+        return window_module.Expanding(self.df[column], min_periods, self.group_ids)
+
+    def agg(self):
+        order = list(range(len(self.groups)))
+        try:
+            # NaN keys last, as NaN doesn't order with other floats
+            order.sort(
+                key=lambda group_id: [(v != v, v) for v in self.groups[group_id]]
+            )
+        except TypeError:
+            # unorderable keys (e.g. mixed types); keep first-seen order
+            pass
+
+        df = DF()
+        for i, key in enumerate(self.keys):
+            df[key] = [self.groups[group_id][i] for group_id in order]
+
+        for name, values in self.agg_cols.items():
+            df[name] = [values[group_id] for group_id in order]
+
+        return df
@@ -0,0 +1,310 @@
+"""Column expressions, evaluated against a DF.
+
+Build them with col() and ordinary operators, e.g. (col("Price") * 1.1) > 5, or
+parse them from a string, e.g. parse("Price * 1.1 > 5").
+"""
+import ast
+import functools
+import operator
+
+from . import vec
+
+SYMBOLS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.mod: "%",
+    operator.eq: "==",
+    operator.ne: "!=",
+    operator.lt: "<",
+    operator.le: "<=",
+    operator.gt: ">",
+    operator.ge: ">=",
+    operator.and_: "&",
+    operator.or_: "|",
+    operator.xor: "^",
+    operator.neg: "-",
+    operator.pos: "+",
+    operator.invert: "~",
+    abs: "abs",
+}
+
+# comparison to use when the column is on the right-hand side of a predicate
+FLIPPED = {
+    operator.eq: operator.eq,
+    operator.ne: operator.ne,
+    operator.lt: operator.gt,
+    operator.le: operator.ge,
+    operator.gt: operator.lt,
+    operator.ge: operator.le,
+}
+
+# Python syntax accepted by parse, and the operators it stands for
+PARSED_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+    ast.And: operator.and_,
+    ast.Or: operator.or_,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Invert: operator.invert,
+    ast.Not: operator.invert,
+}
+
+
+def col(name):
+    """Expression for the column with the given name."""
+    return Col(name)
+
+
+def lit(value):
+    """Expression for a constant."""
+    return Lit(value)
+
+
+@functools.lru_cache(maxsize=256)
+def parse(source):
+    """Expression from a string of Python syntax, e.g. "Price * 1.1 + Tax > 5".
+
+    Names are columns (use col("...") for names that aren't identifiers), "and",
+    "or" and "not" mean &, | and ~, and chained comparisons are and-ed together.
+    Parsed expressions are cached by source.
+    """
+    return _from_ast(ast.parse(source.strip(), mode="eval").body, source)
+
+
+def _from_ast(node, source):
+    def convert(child):
+        return _from_ast(child, source)
+
+    if isinstance(node, ast.Name):
+        return Col(node.id)
+    elif isinstance(node, ast.Constant):
+        return Lit(node.value)
+    elif isinstance(node, ast.BinOp) and type(node.op) in PARSED_OPS:
+        return BinOp(PARSED_OPS[type(node.op)], convert(node.left), convert(node.right))
+    elif isinstance(node, ast.BoolOp):
+        return functools.reduce(
+            lambda left, right: BinOp(PARSED_OPS[type(node.op)], left, right),
+            map(convert, node.values),
+        )
+    elif isinstance(node, ast.Compare):
+        operands = [node.left] + node.comparators
+        terms = [
+            BinOp(PARSED_OPS[type(op)], convert(left), convert(right))
+            for op, left, right in zip(node.ops, operands, operands[1:])
+            if type(op) in PARSED_OPS
+        ]
+        if len(terms) == len(node.ops):
+            return functools.reduce(operator.and_, terms)
+    elif isinstance(node, ast.UnaryOp):
+        return UnaryOp(PARSED_OPS[type(node.op)], convert(node.operand))
+    elif (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and len(node.args) == 1
+        and not node.keywords
+    ):
+        if node.func.id == "abs":
+            return UnaryOp(abs, convert(node.args[0]))
+        if node.func.id == "col" and isinstance(node.args[0], ast.Constant):
+            return Col(node.args[0].value)
+
+    raise ValueError(f"Unsupported syntax in {source!r}: {ast.unparse(node)}")
+
+
+def _expr(value):
+    return value if isinstance(value, Expr) else Lit(value)
+
+
+class Expr:
+    """Expression over the columns of a DF."""
+
+    def columns(self):
+        """Names of the columns the expression reads."""
+        raise NotImplementedError
+
+    def evaluate(self, df):
+        """Result of the expression for df, a Vec (or a scalar, for constants)."""
+        raise NotImplementedError
+
+    def _binary(self, other, op):
+        return BinOp(op, self, _expr(other))
+
+    def _rbinary(self, other, op):
+        return BinOp(op, _expr(other), self)
+
+    def __add__(self, other):
+        return self._binary(other, operator.add)
+
+    def __radd__(self, other):
+        return self._rbinary(other, operator.add)
+
+    def __sub__(self, other):
+        return self._binary(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._rbinary(other, operator.sub)
+
+    def __mul__(self, other):
+        return self._binary(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._rbinary(other, operator.mul)
+
+    def __truediv__(self, other):
+        return self._binary(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self._rbinary(other, operator.truediv)
+
+    def __mod__(self, other):
+        return self._binary(other, operator.mod)
+
+    def __rmod__(self, other):
+        return self._rbinary(other, operator.mod)
+
+    def __eq__(self, other):
+        return self._binary(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._binary(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._binary(other, operator.lt)
+
+    def __le__(self, other):
+        return self._binary(other, operator.le)
+
+    def __gt__(self, other):
+        return self._binary(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._binary(other, operator.ge)
+
+    def __and__(self, other):
+        return self._binary(other, operator.and_)
+
+    def __rand__(self, other):
+        return self._rbinary(other, operator.and_)
+
+    def __or__(self, other):
+        return self._binary(other, operator.or_)
+
+    def __ror__(self, other):
+        return self._rbinary(other, operator.or_)
+
+    def __xor__(self, other):
+        return self._binary(other, operator.xor)
+
+    def __rxor__(self, other):
+        return self._rbinary(other, operator.xor)
+
+    def __neg__(self):
+        return UnaryOp(operator.neg, self)
+
+    def __pos__(self):
+        return UnaryOp(operator.pos, self)
+
+    def __abs__(self):
+        return UnaryOp(abs, self)
+
+    def __invert__(self):
+        return UnaryOp(operator.invert, self)
+
+    def __bool__(self):
+        raise TypeError("Expressions have no truth value. Use & and | to combine.")
+
+
+class Col(Expr):
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+    def columns(self):
+        return {self.name}
+
+    def evaluate(self, df):
+        return df[self.name]
+
+
+class Lit(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return repr(self.value)
+
+    def columns(self):
+        return set()
+
+    def evaluate(self, df):
+        return self.value
+
+
+class BinOp(Expr):
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return f"({self.left!r} {SYMBOLS[self.op]} {self.right!r})"
+
+    def columns(self):
+        return self.left.columns() | self.right.columns()
+
+    def evaluate(self, df):
+        left = self.left.evaluate(df)
+        right = self.right.evaluate(df)
+
+        if isinstance(self.left, Lit) and not isinstance(self.right, Lit):
+            # let the Vec on the right handle the reflected operation
+            return _reflected(self.op, left, right)
+
+        return self.op(left, right)
+
+
+class UnaryOp(Expr):
+    def __init__(self, op, operand):
+        self.op = op
+        self.operand = operand
+
+    def __repr__(self):
+        if self.op == abs:
+            return f"abs({self.operand!r})"
+
+        return f"{SYMBOLS[self.op]}{self.operand!r}"
+
+    def columns(self):
+        return self.operand.columns()
+
+    def evaluate(self, df):
+        return self.op(self.operand.evaluate(df))
+
+
+def _reflected(op, scalar, v):
+    """scalar <op> v, for a Vec v that only implements its own side of op.
+
+    A comparison is flipped around to v's side, which handles nulls. Anything else
+    is computed for each non-null value, giving null for nulls.
+    """
+    if op in FLIPPED:
+        return FLIPPED[op](v, scalar)
+
+    return vec.Vec([None if x is None else op(scalar, x) for x in v])
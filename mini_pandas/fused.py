@@ -0,0 +1,106 @@
+"""Fused evaluation of column expressions.
+
+Evaluated operator by operator, (col("Price") * 1.1 + col("Tax")) > 5 builds a
+full-length temporary Vec at every step. Here the whole expression is compiled into
+one generated function with a single loop over the rows instead:
+
+    def kernel(c0, c1, flags, k0, k1):
+        rows = zip(c0, c1, flags)
+        return [(((x0 * k0) + x1) > k1) if ok else None for x0, x1, ok in rows]
+
+Constants are parameters, so kernels are cached by the shape of the expression and
+reused whatever its constants, e.g. as a filter's threshold changes.
+
+Rows with a null in a column that the expression reads are evaluated operator by
+operator, so that the fused result always matches the unfused one. So is the whole
+expression when the NumPy backend runs on all its columns, as each operator is
+already a single vectorized call there.
+"""
+import functools
+import itertools
+import operator
+
+from . import backend, expr, vec
+
+# most kernels to keep compiled
+CACHE_SIZE = 256
+
+
+def _generate(node, columns, constants):
+    """Python source computing an expression for one row.
+
+    x0, x1, ... stand for the row's values of columns, and k0, k1, ... for
+    constants; both lists are filled in as they're found.
+    """
+    if isinstance(node, expr.Col):
+        if node.name not in columns:
+            columns.append(node.name)
+        return f"x{columns.index(node.name)}"
+
+    if isinstance(node, expr.Lit):
+        constants.append(node.value)
+        return f"k{len(constants) - 1}"
+
+    if isinstance(node, expr.BinOp):
+        left = _generate(node.left, columns, constants)
+        right = _generate(node.right, columns, constants)
+        return f"({left} {expr.SYMBOLS[node.op]} {right})"
+
+    operand = _generate(node.operand, columns, constants)
+    if node.op is operator.invert:
+        # Vec's ~ is a logical not, for any dtype
+        return f"(not {operand})"
+    if node.op is abs:
+        return f"abs({operand})"
+
+    return f"({expr.SYMBOLS[node.op]}{operand})"
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _kernel(code, n_columns, n_constants):
+    """Compiled function evaluating code for every row of n_columns columns."""
+    columns = [f"c{i}" for i in range(n_columns)]
+    values = [f"x{i}" for i in range(n_columns)]
+    params = columns + ["flags"] + [f"k{i}" for i in range(n_constants)]
+
+    source = (
+        f"def kernel({', '.join(params)}):\n"
+        f"    rows = zip({', '.join(columns)}, flags)\n"
+        f"    return [{code} if ok else None for {', '.join(values)}, ok in rows]\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+
+    return namespace["kernel"]
+
+
+def evaluate(df, expression):
+    """Result of an expression (an Expr, or a string for expr.parse) for df."""
+    if isinstance(expression, str):
+        expression = expr.parse(expression)
+
+    names = []
+    constants = []
+    code = _generate(expression, names, constants)
+    columns = [df[name] for name in names]
+
+    if not columns or backend.enabled(*columns):
+        return expression.evaluate(df)
+
+    valid = [c._valid for c in columns if c._valid is not None]
+    valid = functools.reduce(operator.and_, valid) if valid else None
+    flags = valid.flags() if valid is not None else itertools.repeat(True)
+
+    kernel = _kernel(code, len(columns), len(constants))
+    values = kernel(*columns, flags, *constants)
+
+    if valid is not None:
+        nulls = (~valid).indices()
+        for i, value in zip(nulls, expression.evaluate(df.take(nulls))):
+            values[i] = value
+
+    result = vec.Vec(values)
+    if result.dtype == "bool" and result._valid is None:
+        return vec.Mask(result)
+
+    return result
@@ -0,0 +1,212 @@
+"""Indexes over the values of a column, for lookups without scanning it.
+
+An index is attached to the Vec it was built from, and dropped as soon as that Vec
+is modified, except by DF.append, which updates it. Nulls are left out of indexes,
+so lookups for them fall back to a scan.
+"""
+import bisect
+import functools
+import math
+import operator
+
+from . import expr, fused
+
+
+def _isnull(value):
+    return value is None or (type(value) == float and math.isnan(value))
+
+
+class HashIndex:
+    """Positions of each value in a column, for equality lookups in O(1)."""
+
+    kind = "hash"
+
+    def __init__(self, column):
+        self.positions = {}
+        for position, value in enumerate(column):
+            self.append(value, position)
+
+    def append(self, value, position):
+        if not _isnull(value):
+            self.positions.setdefault(value, []).append(position)
+
+    def lookup(self, value):
+        """Positions holding value, in order."""
+        return list(self.positions.get(value, ()))
+
+    def select(self, op, value):
+        """Positions where op(element, value) holds, or None if unsupported."""
+        if op is not operator.eq or _isnull(value):
+            return None
+
+        try:
+            return self.lookup(value)
+        except TypeError:
+            # unhashable, so equal to nothing we hold
+            return None
+
+
+class SortedIndex:
+    """Column values in sorted order, for equality and range lookups in O(log n)."""
+
+    kind = "sorted"
+
+    def __init__(self, column):
+        order = column._sorted_positions(range(len(column)))
+        present = len(column) - column.isnull().sum()
+
+        self.positions = order[:present]
+        self.keys = [column[i] for i in self.positions]
+
+    def append(self, value, position):
+        if not _isnull(value):
+            i = bisect.bisect_right(self.keys, value)
+            self.keys.insert(i, value)
+            self.positions.insert(i, position)
+
+    def lookup(self, value):
+        """Positions holding value, in order."""
+        return self.range(value, value)
+
+    def range(self, low=None, high=None, include_low=True, include_high=True):
+        """Positions with values between low and high (None meaning unbounded)."""
+        start = 0
+        end = len(self.keys)
+
+        if low is not None:
+            find = bisect.bisect_left if include_low else bisect.bisect_right
+            start = find(self.keys, low)
+        if high is not None:
+            find = bisect.bisect_right if include_high else bisect.bisect_left
+            end = find(self.keys, high)
+
+        return sorted(self.positions[start:end])
+
+    def select(self, op, value):
+        """Positions where op(element, value) holds, or None if unsupported."""
+        if _isnull(value):
+            return None
+
+        bounds = {
+            operator.eq: (value, value, True, True),
+            operator.lt: (None, value, True, False),
+            operator.le: (None, value, True, True),
+            operator.gt: (value, None, False, True),
+            operator.ge: (value, None, True, True),
+        }
+        if op not in bounds:
+            return None
+
+        try:
+            return self.range(*bounds[op])
+        except TypeError:
+            # not comparable with the column's values
+            return None
+
+
+KINDS = {"hash": HashIndex, "sorted": SortedIndex}
+
+
+def build(column, kind):
+    if kind not in KINDS:
+        raise ValueError(f"Unknown index kind {kind}. Expected one of {list(KINDS)}.")
+
+    return KINDS[kind](column)
+
+
+def _conjuncts(predicate):
+    if isinstance(predicate, expr.BinOp) and predicate.op is operator.and_:
+        return _conjuncts(predicate.left) + _conjuncts(predicate.right)
+
+    return [predicate]
+
+
+def _indexed_positions(df, term):
+    """Positions matching a comparison of an indexed column with a constant."""
+    if not isinstance(term, expr.BinOp) or term.op not in expr.FLIPPED:
+        return None
+
+    op, left, right = term.op, term.left, term.right
+    if isinstance(left, expr.Lit) and isinstance(right, expr.Col):
+        op, left, right = expr.FLIPPED[op], right, left
+
+    if not (isinstance(left, expr.Col) and isinstance(right, expr.Lit)):
+        return None
+
+    column = df.get(left.name)
+    if column is None or column._index is None:
+        return None
+
+    return column._index.select(op, right.value)
+
+
+def filter_rows(df, predicate):
+    """Rows of df where a boolean expression holds.
+
+    If one of the terms and-ed together in the predicate compares an indexed column
+    with a constant, the index finds the candidate rows, and only those are tested
+    against the other terms. Otherwise the predicate is evaluated as one fused loop.
+    """
+    terms = _conjuncts(predicate)
+
+    for i, term in enumerate(terms):
+        positions = _indexed_positions(df, term)
+        if positions is None:
+            continue
+
+        rows = df.take(positions)
+        rest = terms[:i] + terms[i + 1 :]
+        if not rest:
+            return rows
+
+        return rows[functools.reduce(operator.and_, rest)]
+
+    return df[fused.evaluate(df, predicate)]
+
+
+class Loc:
+    """Row lookups by the values of a DF's index column. See DF.set_index."""
+
+    def __init__(self, df):
+        self.df = df
+
+    def __getitem__(self, key):
+        df = self.df
+        if df.index_column is None:
+            raise KeyError("The DF has no index column. Use set_index first.")
+
+        column = df[df.index_column]
+        if column._index is None:
+            df.create_index(df.index_column, df.index_kind)
+        index = column._index
+
+        if isinstance(key, slice):
+            if key.step is not None:
+                raise ValueError("loc slices can't have a step.")
+
+            if isinstance(index, SortedIndex):
+                positions = index.range(key.start, key.stop)
+            else:
+                positions = self._scan_range(column, key.start, key.stop)
+
+            return df.take(positions)
+
+        keys = key if isinstance(key, list) else [key]
+        positions = []
+        for k in keys:
+            found = index.lookup(k)
+            if not found:
+                raise KeyError(k)
+            positions.extend(found)
+
+        return df.take(positions)
+
+    @staticmethod
+    def _scan_range(column, low, high):
+        return [
+            i
+            for i, value in enumerate(column)
+            if not _isnull(value)
+            and (low is None or low <= value)
+            and (high is None or value <= high)
+        ]
@@ -0,0 +1,348 @@
+"""Lazy query plans over DFs.
+
+A LazyDF records operations into a logical plan instead of running them. On
+collect(), the plan is optimized and then executed:
+
+- consecutive filters are merged into one
+- filters are pushed below column selections, and below groupbys when they only
+  test the group keys
+- filters directly on a CSV scan are applied chunk by chunk as the file is read
+- only the columns that are needed are read by scans
+"""
+import functools
+import operator
+
+from . import aggregation
+from . import df as df_module
+from .expr import col  # noqa: F401
+
+# rows per chunk when filtering a CSV file while it is read
+SCAN_CHUNKSIZE = 65536
+
+
+class Plan:
+    """Node of a logical plan."""
+
+    children = ()
+
+    def output_columns(self):
+        """Names of the columns this node produces, in order."""
+        raise NotImplementedError
+
+    def with_children(self, *children):
+        raise NotImplementedError
+
+    def execute(self):
+        raise NotImplementedError
+
+    def describe(self):
+        raise NotImplementedError
+
+    def explain(self, depth=0):
+        lines = ["  " * depth + self.describe()]
+        for child in self.children:
+            lines.append(child.explain(depth + 1))
+
+        return "\n".join(lines)
+
+
+class Scan(Plan):
+    """Read an in-memory DF."""
+
+    def __init__(self, df, columns=None):
+        self.df = df
+        self.columns = columns
+
+    def output_columns(self):
+        return self.columns if self.columns is not None else self.df.columns
+
+    def with_columns(self, columns):
+        return Scan(self.df, columns)
+
+    def execute(self):
+        if self.columns is None:
+            return self.df
+
+        return self.df[self.columns]
+
+    def describe(self):
+        return f"Scan DF columns={self.output_columns()}"
+
+
+class CsvScan(Plan):
+    """Read a CSV file, keeping only the rows matching a predicate if given."""
+
+    def __init__(self, filename, options, columns=None, predicate=None):
+        self.filename = filename
+        self.options = options
+        self.columns = columns
+        self.predicate = predicate
+
+    def output_columns(self):
+        if self.columns is not None:
+            return self.columns
+
+        header = df_module.read_csv(self.filename, chunksize=1, **self.options)
+        return next(header).columns
+
+    def with_columns(self, columns):
+        return CsvScan(self.filename, self.options, columns, self.predicate)
+
+    def with_predicate(self, predicate):
+        if self.predicate is not None:
+            predicate = self.predicate & predicate
+
+        return CsvScan(self.filename, self.options, self.columns, predicate)
+
+    def execute(self):
+        if self.predicate is None:
+            return df_module.read_csv(
+                self.filename, usecols=self.columns, **self.options
+            )
+
+        # infer the dtypes over the whole file first, rather than from the first
+        # chunk, so that the chunks match what an eager read_csv gives; chunks are
+        # read in one process
+        options = dict(self.options)
+        options.pop("workers", None)
+        options["dtype"] = df_module.infer_csv_dtypes(
+            self.filename, usecols=self.columns, chunksize=SCAN_CHUNKSIZE, **options
+        )
+        chunks = df_module.read_csv(
+            self.filename,
+            usecols=self.columns,
+            chunksize=SCAN_CHUNKSIZE,
+            **options,
+        )
+
+        return df_module.vstack(
+            *[chunk[self.predicate.evaluate(chunk)] for chunk in chunks]
+        )
+
+    def describe(self):
+        text = f"Scan CSV {self.filename} columns={self.columns or 'all'}"
+        if self.predicate is not None:
+            text += f" predicate={self.predicate!r}"
+
+        return text
+
+
+class BinaryScan(Plan):
+    """Read a file in the binary columnar format."""
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = columns
+
+    def output_columns(self):
+        if self.columns is not None:
+            return self.columns
+
+        return df_module.read_binary(self.path).columns
+
+    def with_columns(self, columns):
+        return BinaryScan(self.path, columns)
+
+    def execute(self):
+        return df_module.read_binary(self.path, columns=self.columns)
+
+    def describe(self):
+        return f"Scan binary {self.path} columns={self.columns or 'all'}"
+
+
+class Filter(Plan):
+    def __init__(self, child, predicate):
+        self.children = (child,)
+        self.predicate = predicate
+
+    def output_columns(self):
+        return self.children[0].output_columns()
+
+    def with_children(self, child):
+        return Filter(child, self.predicate)
+
+    def execute(self):
+        # DF filters by expression use any column indexes
+        return self.children[0].execute()[self.predicate]
+
+    def describe(self):
+        return f"Filter {self.predicate!r}"
+
+
+class Select(Plan):
+    def __init__(self, child, columns):
+        self.children = (child,)
+        self.columns = list(columns)
+
+    def output_columns(self):
+        return self.columns
+
+    def with_children(self, child):
+        return Select(child, self.columns)
+
+    def execute(self):
+        return self.children[0].execute()[self.columns]
+
+    def describe(self):
+        return f"Select {self.columns}"
+
+
+class Aggregate(Plan):
+    """Group by key columns, then aggregate, as with DF.groupby."""
+
+    def __init__(self, child, keys, aggs):
+        self.children = (child,)
+        self.keys = list(keys)
+        # (GroupBy method name, column or None)
+        self.aggs = list(aggs)
+
+    def output_columns(self):
+        return self.keys + [f"{fxn}({c or '*'})" for fxn, c in self.aggs]
+
+    def input_columns(self):
+        return set(self.keys) | {c for _, c in self.aggs if c is not None}
+
+    def with_children(self, child):
+        return Aggregate(child, self.keys, self.aggs)
+
+    def execute(self):
+        groupby = self.children[0].execute().groupby(*self.keys)
+        for fxn, column in self.aggs:
+            if column is None:
+                getattr(groupby, fxn)()
+            else:
+                getattr(groupby, fxn)(column)
+
+        return groupby.agg()
+
+    def describe(self):
+        aggs = [f"{fxn}({c or '*'})" for fxn, c in self.aggs]
+        return f"Aggregate keys={self.keys} aggs={aggs}"
+
+
+SCANS = (Scan, CsvScan, BinaryScan)
+
+
+def _push_filters(plan):
+    """Merge consecutive filters and move them as close to the scans as possible."""
+    if isinstance(plan, SCANS):
+        return plan
+
+    plan = plan.with_children(*[_push_filters(c) for c in plan.children])
+
+    if not isinstance(plan, Filter):
+        return plan
+
+    child = plan.children[0]
+    predicate = plan.predicate
+
+    if isinstance(child, Filter):
+        return Filter(child.children[0], child.predicate & predicate)
+    elif isinstance(child, Select) or (
+        isinstance(child, Aggregate) and predicate.columns() <= set(child.keys)
+    ):
+        return child.with_children(_push_filters(Filter(child.children[0], predicate)))
+    elif isinstance(child, CsvScan):
+        return child.with_predicate(predicate)
+
+    return plan
+
+
+def _prune_columns(plan, required=None):
+    """Have every node read only the columns needed above it (None meaning all)."""
+    if isinstance(plan, SCANS):
+        if required is None:
+            return plan
+
+        if isinstance(plan, CsvScan) and plan.predicate is not None:
+            required = required | plan.predicate.columns()
+
+        columns = [c for c in plan.output_columns() if c in required]
+        return plan.with_columns(columns)
+
+    if isinstance(plan, Select):
+        child_required = set(plan.columns)
+    elif isinstance(plan, Aggregate):
+        child_required = plan.input_columns()
+    elif isinstance(plan, Filter) and required is not None:
+        child_required = required | plan.predicate.columns()
+    else:
+        child_required = required
+
+    return plan.with_children(
+        *[_prune_columns(c, child_required) for c in plan.children]
+    )
+
+
+def optimize(plan):
+    return _prune_columns(_push_filters(plan))
+
+
+class LazyDF:
+    """Deferred sequence of operations on a DF. Run it with collect()."""
+
+    def __init__(self, plan):
+        self.plan = plan
+
+    def __repr__(self):
+        return f"LazyDF(\n{self.plan.explain(1)}\n)"
+
+    @property
+    def columns(self):
+        return self.plan.output_columns()
+
+    def filter(self, *predicates):
+        """Keep the rows where every predicate (a boolean expression) holds."""
+        predicate = functools.reduce(operator.and_, predicates)
+        return LazyDF(Filter(self.plan, predicate))
+
+    def select(self, *columns):
+        return LazyDF(Select(self.plan, columns))
+
+    def __getitem__(self, key):
+        if isinstance(key, list):
+            return self.select(*key)
+
+        return self.filter(key)
+
+    def groupby(self, *keys):
+        return LazyGroupBy(self.plan, keys)
+
+    def optimized_plan(self):
+        return optimize(self.plan)
+
+    def explain(self):
+        """Print the optimized plan."""
+        print(self.optimized_plan().explain())
+
+    def collect(self):
+        """Optimize and execute the plan, returning a DF."""
+        return self.optimized_plan().execute()
+
+
+class LazyGroupBy(aggregation.DeferredGroupBy):
+    """Deferred groupby aggregation. Add aggregations, then call agg()."""
+
+    def __init__(self, plan, keys):
+        super().__init__(keys)
+        self.plan = plan
+
+    def agg(self):
+        return LazyDF(Aggregate(self.plan, self.keys, self.aggs))
+
+
+def scan_csv(filename, usecols=None, **options):
+    """LazyDF over a CSV file. Options are passed on to read_csv.
+
+    usecols limits the columns scanned, like a select. chunksize isn't taken, as a
+    filtered scan reads the file in chunks of its own.
+    """
+    if "chunksize" in options:
+        raise ValueError("scan_csv doesn't take chunksize.")
+
+    return LazyDF(CsvScan(filename, options, usecols))
+
+
+def scan_binary(path):
+    """LazyDF over a file written by DF.to_binary."""
+    return LazyDF(BinaryScan(path))
@@ -0,0 +1,237 @@
+"""Partition-parallel execution of DF and Vec operations.
+
+An Engine splits its input into partitions of up to partition_rows rows, runs an
+operation on each partition, and merges the partial results:
+
+    engine = Engine(workers=8)
+    big = engine.filter(df, col("Price") > 2)
+    totals = engine.groupby(df, "Category").sum("Price").count().agg()
+
+mode is "process" (a ProcessPoolExecutor: functions and data must be picklable),
+"thread" (a ThreadPoolExecutor, which only helps when the work releases the GIL,
+e.g. with the NumPy backend) or "serial" (everything in this process). The
+partitioning doesn't depend on the mode, so every mode gives identical results.
+Float sums and means are added up partition by partition, so may differ in the
+last digits from the single-pass DF and Vec methods.
+"""
+import concurrent.futures
+import functools
+import operator
+import os
+
+from . import aggregation
+from . import df as df_module
+from . import vec
+
+MODES = ("process", "thread", "serial")
+
+# default rows per partition
+PARTITION_ROWS = 100000
+
+
+class Engine:
+    def __init__(self, workers=None, mode="process", partition_rows=PARTITION_ROWS):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode}. Expected one of {MODES}.")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.partition_rows = partition_rows
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _map(self, fxn, partitions):
+        """Results of fxn for each partition, in order."""
+        if self.mode == "serial" or self.workers == 1 or len(partitions) <= 1:
+            return list(map(fxn, partitions))
+
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+            else:
+                self._pool = concurrent.futures.ThreadPoolExecutor(self.workers)
+
+        return list(self._pool.map(fxn, partitions))
+
+    def partitions(self, data):
+        """Row partitions of a DF or Vec, as views."""
+        step = self.partition_rows
+        return [data[start : start + step] for start in range(0, len(data), step)]
+
+    def filter(self, df, predicate):
+        """Rows of df where a boolean expression (see expr.col) holds."""
+        parts = self._map(
+            functools.partial(_filter, predicate=predicate), self.partitions(df)
+        )
+        return df_module.concat(parts) if parts else df
+
+    def apply(self, v, fxn):
+        """v.apply(fxn), with fxn run on each partition."""
+        parts = self._map(functools.partial(_apply, fxn=fxn), self.partitions(v))
+        return vec.concat(parts) if parts else vec.Vec()
+
+    def isnull(self, v):
+        parts = self._map(_isnull, self.partitions(v))
+        return vec.concat(parts) if parts else vec.Mask()
+
+    def fillna(self, v, default):
+        parts = self._map(
+            functools.partial(_fillna, default=default), self.partitions(v)
+        )
+        return vec.concat(parts) if parts else vec.Vec()
+
+    def sum(self, v):
+        return sum(self._map(_sum, self.partitions(v)))
+
+    def min(self, v):
+        parts = self._map(_min, self.partitions(v))
+        return min((m for m in parts if m is not None), default=None)
+
+    def max(self, v):
+        parts = self._map(_max, self.partitions(v))
+        return max((m for m in parts if m is not None), default=None)
+
+    def mean(self, v):
+        totals = self._map(_sum, self.partitions(v))
+        return sum(totals) / v.count()
+
+    def groupby(self, df, *keys):
+        """Grouped aggregation: add aggregations as with DF.groupby, then agg()."""
+        return ParallelGroupBy(self, df, keys)
+
+
+def _filter(df, predicate):
+    return df[predicate]
+
+
+def _apply(v, fxn):
+    return v.apply(fxn)
+
+
+def _isnull(v):
+    return v.isnull()
+
+
+def _fillna(v, default):
+    return v.fillna(default)
+
+
+def _sum(v):
+    return v.sum()
+
+
+def _min(v):
+    return v.min()
+
+
+def _max(v):
+    return v.max()
+
+
+def _partial_aggregate(df, keys, aggs):
+    """Group keys of a partition, and the partial state of each aggregation."""
+    groupby = df.groupby(*keys)
+    states = []
+
+    for fxn, column in aggs:
+        if fxn == "mean":
+            sums = groupby._accumulate(column, operator.add, 0)
+            states.append(list(zip(sums, groupby._counts(column))))
+        elif fxn == "var":
+            # count, mean and sum of squared deviations, to merge as moments
+            states.append(list(zip(*groupby._moments(column))))
+        else:
+            if column is None:
+                getattr(groupby, fxn)()
+            else:
+                getattr(groupby, fxn)(column)
+            states.append(groupby.agg_cols[f"{fxn}({column or '*'})"])
+
+    return groupby.groups, states
+
+
+def _merge_moments(a, b):
+    """Combine (count, mean, M2) of two sets of values (Chan et al.)."""
+    na, mean_a, m2_a = a
+    nb, mean_b, m2_b = b
+    if not na or not nb:
+        return b if not na else a
+
+    n = na + nb
+    delta = mean_b - mean_a
+
+    return n, mean_a + delta * nb / n, m2_a + m2_b + delta * delta * na * nb / n
+
+
+# how to merge two partial states of each aggregation, earlier partition first;
+# None is the state of a group with only nulls in a partition
+MERGES = {
+    "count": operator.add,
+    "sum": operator.add,
+    "min": lambda a, b: b if a is None or (b is not None and b < a) else a,
+    "max": lambda a, b: b if a is None or (b is not None and b > a) else a,
+    "mean": lambda a, b: (a[0] + b[0], a[1] + b[1]),
+    "var": _merge_moments,
+    "first": lambda a, b: b if a is None else a,
+    "last": lambda a, b: a if b is None else b,
+}
+
+# how to turn a merged state into the aggregate value
+FINALIZERS = {
+    "mean": lambda state: state[0] / state[1] if state[1] else None,
+    "var": lambda state: state[2] / (state[0] - 1) if state[0] > 1 else None,
+}
+
+
+class ParallelGroupBy(aggregation.DeferredGroupBy):
+    """Grouped aggregation computed per partition, then merged. See Engine.groupby."""
+
+    def __init__(self, engine, df, keys):
+        super().__init__(keys)
+        self.engine = engine
+        self.df = df
+
+    def agg(self):
+        partials = self.engine._map(
+            functools.partial(_partial_aggregate, keys=self.keys, aggs=self.aggs),
+            self.engine.partitions(self.df),
+        )
+
+        # merge partitions in order, so groups stay in first-seen order
+        group_index = {}
+        groups = []
+        states = [[] for _ in self.aggs]
+        for part_groups, part_states in partials:
+            for part_id, key in enumerate(part_groups):
+                key = df_module._group_key(key)
+                group_id = group_index.get(key)
+                if group_id is None:
+                    group_index[key] = len(groups)
+                    groups.append(key)
+                    for merged, part in zip(states, part_states):
+                        merged.append(part[part_id])
+                    continue
+
+                for (fxn, _), merged, part in zip(self.aggs, states, part_states):
+                    merged[group_id] = MERGES[fxn](merged[group_id], part[part_id])
+
+        # GroupBy.agg orders and lays out the result
+        groupby = df_module.GroupBy(self.df, self.keys, groups, None)
+        for (fxn, column), merged in zip(self.aggs, states):
+            finalize = FINALIZERS.get(fxn)
+            if finalize is not None:
+                merged = list(map(finalize, merged))
+            groupby.agg_cols[f"{fxn}({column or '*'})"] = merged
+
+        return groupby.agg()
@@ -0,0 +1,259 @@
+"""Opt-in profiling of DF, Vec and GroupBy operations.
+
+    with mini_pandas.profile() as p:
+        df = read_csv("groceries.csv")
+        df[df["Price"] > 2].groupby("Category").sum("Price").agg()
+
+    print(p.report())
+
+Entering profile() replaces each public method of the profiled classes (plus the
+arithmetic, comparison, indexing and printing operators) and the module-level
+read/concat functions with a wrapper that records the call; leaving it puts the
+originals back. So profiling costs nothing while it's off.
+
+For each operation, the profile keeps the number of calls, the total (cumulative)
+and own (excluding profiled calls made from it) wall time, the rows of the DF or
+Vec it was called on and of its result, and, with memory=True, the peak bytes
+allocated during the call (traced with tracemalloc, which slows everything down;
+pass memory=False for more faithful timings).
+
+Module-level functions are only profiled when looked up through their module, e.g.
+df.read_csv, not through a name imported before the profile started. Calls made in
+other processes (e.g. by a process-mode parallel.Engine) aren't recorded.
+"""
+import collections
+import functools
+import inspect
+import threading
+import time
+import tracemalloc
+
+from . import binary, df, lazy, vec
+
+# classes whose public methods are profiled
+CLASSES = [df.DF, df.GroupBy, vec.Vec, vec.Mask, vec.Categorical, lazy.LazyDF]
+
+# operators profiled on top of the public methods
+OPERATORS = {
+    "__getitem__",
+    "__setitem__",
+    "__str__",
+    "__add__",
+    "__sub__",
+    "__mul__",
+    "__truediv__",
+    "__mod__",
+    "__neg__",
+    "__abs__",
+    "__eq__",
+    "__ne__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+    "__and__",
+    "__or__",
+    "__xor__",
+    "__invert__",
+}
+
+# module-level functions profiled, including the stages of read_csv
+FUNCTIONS = [
+    (df, "read_csv"),
+    (df, "_infer_column"),
+    (df, "_parse_rows"),
+    (df, "concat"),
+    (df, "vstack"),
+    (binary, "read_binary"),
+    (binary, "write_binary"),
+]
+
+# what a profiled call did, as passed to hooks; depth counts the profiled calls
+# it was made from
+Call = collections.namedtuple(
+    "Call", ["name", "seconds", "rows_in", "rows_out", "peak_bytes", "depth"]
+)
+
+_active = None
+
+
+def profile(memory=True, hooks=()):
+    """Profile that records operations while used as a context manager."""
+    return Profile(memory, hooks)
+
+
+def _rows(value):
+    """Rows of a DF, Vec or GroupBy, or 0 for anything else."""
+    if isinstance(value, df.GroupBy):
+        value = value.df
+    if isinstance(value, df.DF):
+        # read a column directly, as DF methods may be profiled
+        value = next(iter(dict.values(value)), ())
+    if isinstance(value, vec.Vec):
+        return len(value)
+
+    return 0
+
+
+class _Stats:
+    __slots__ = ("calls", "total", "own", "rows_in", "rows_out", "peak_bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.own = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.peak_bytes = 0
+
+
+class _Frame:
+    """A profiled call in progress."""
+
+    __slots__ = ("children", "start_bytes", "peak_bytes")
+
+    def __init__(self):
+        # time spent in profiled calls made from this one
+        self.children = 0.0
+        self.start_bytes = 0
+        self.peak_bytes = 0
+
+
+class Profile:
+    def __init__(self, memory=True, hooks=()):
+        self.memory = memory
+        self.hooks = list(hooks)
+        self.stats = collections.defaultdict(_Stats)
+        self._originals = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def add_hook(self, hook):
+        """Call hook with a Call for every profiled call, as it returns."""
+        self.hooks.append(hook)
+
+    def __enter__(self):
+        global _active
+
+        if _active is not None:
+            raise RuntimeError("Another profile is already active.")
+        _active = self
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        for cls in CLASSES:
+            for name, attr in list(vars(cls).items()):
+                public = not name.startswith("_") or name in OPERATORS
+                if public and inspect.isfunction(attr):
+                    self._patch(cls, name, f"{cls.__name__}.{name}")
+
+        for module, name in FUNCTIONS:
+            self._patch(module, name, f"{module.__name__.split('.')[-1]}.{name}")
+
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        _active = None
+
+    def _patch(self, owner, name, label):
+        original = vars(owner)[name]
+        self._originals.append((owner, name, original))
+
+        @functools.wraps(original)
+        def profiled(*args, **kwargs):
+            return self._call(label, original, args, kwargs)
+
+        setattr(owner, name, profiled)
+
+    def _call(self, name, fxn, args, kwargs):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        frame = _Frame()
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # remember the caller's peak so far, as we're about to reset it
+                stack[-1].peak_bytes = max(stack[-1].peak_bytes, peak)
+            tracemalloc.reset_peak()
+            frame.start_bytes = frame.peak_bytes = current
+
+        stack.append(frame)
+        result = None
+        start = time.perf_counter()
+        try:
+            result = fxn(*args, **kwargs)
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+
+            peak_bytes = 0
+            if self.memory:
+                peak = max(frame.peak_bytes, tracemalloc.get_traced_memory()[1])
+                peak_bytes = peak - frame.start_bytes
+                if stack:
+                    stack[-1].peak_bytes = max(stack[-1].peak_bytes, peak)
+            if stack:
+                stack[-1].children += seconds
+
+            rows_in = _rows(args[0]) if args else 0
+            call = Call(name, seconds, rows_in, _rows(result), peak_bytes, len(stack))
+            self._record(call, seconds - frame.children)
+
+    def _record(self, call, own):
+        with self._lock:
+            stats = self.stats[call.name]
+            stats.calls += 1
+            stats.total += call.seconds
+            stats.own += own
+            stats.rows_in += call.rows_in
+            stats.rows_out += call.rows_out
+            stats.peak_bytes = max(stats.peak_bytes, call.peak_bytes)
+
+        for hook in self.hooks:
+            hook(call)
+
+    def to_df(self, sort="total"):
+        """Stats of each operation as a DF, in decreasing order of the sort column.
+
+        peak_bytes is the largest of any one call. Use this after the with block,
+        or its own operations get profiled too.
+        """
+        rows = sorted(
+            self.stats.items(), key=lambda item: getattr(item[1], sort), reverse=True
+        )
+
+        return df.DF(
+            {
+                "operation": [name for name, _ in rows],
+                "calls": [s.calls for _, s in rows],
+                "total": [round(s.total, 6) for _, s in rows],
+                "own": [round(s.own, 6) for _, s in rows],
+                "rows_in": [s.rows_in for _, s in rows],
+                "rows_out": [s.rows_out for _, s in rows],
+                "peak_bytes": [s.peak_bytes for _, s in rows],
+            }
+        )
+
+    def report(self, sort="total", limit=None):
+        """Table of the stats, the most costly operations (by sort) first."""
+        table = self.to_df(sort)
+        if limit is not None:
+            table = table[:limit]
+
+        return str(table)
@@ -0,0 +1,116 @@
+"""Order statistics by selection rather than sorting.
+
+    v.median()                     # the middle value
+    v.quantile([0.25, 0.5, 0.75])  # several quantiles at once
+
+The k-th smallest of n values only needs the values partitioned around it, not
+sorted, which takes O(n) expected time. As in Floyd and Rivest's algorithm, the
+pivots come from a small sorted sample: two sample values that bracket rank k
+(with some margin) narrow the values down to the few between them, which are then
+sorted. Several ranks are selected together: ranks close together share the
+narrowing, and ranks far apart are first split by a partition around a sample value
+between them.
+
+As in introselect, values that keep partitioning badly (past 2 log2 n levels) are
+sorted instead, which bounds the worst case at O(n log n).
+
+Quantiles interpolate linearly between the values either side of their position,
+as pandas does by default.
+"""
+import math
+import random
+
+# parts this short are sorted rather than partitioned
+SMALL = 64
+
+
+def select(values, ranks):
+    """The k-th smallest value (counting from 0) for each k in ranks, as a dict.
+
+    values is left as it is.
+    """
+    values = list(values)
+    found = {}
+    depth_limit = 2 * len(values).bit_length()
+    # (values, rank of their smallest value, ranks wanted among them, depth)
+    parts = [(values, 0, sorted(set(ranks)), 0)]
+    while parts:
+        part, start, wanted, depth = parts.pop()
+        n = len(part)
+        if n <= SMALL or depth > depth_limit:
+            part = sorted(part)
+            for k in wanted:
+                found[k] = part[k - start]
+            continue
+
+        sample = sorted(random.sample(part, math.isqrt(n)))
+        # sample positions of the wanted ranks, and the margin to give them
+        positions = [(k - start) * len(sample) // n for k in wanted]
+        margin = math.isqrt(len(sample)) + 1
+
+        first = max(positions[0] - margin, 0)
+        last = min(positions[-1] + margin, len(sample) - 1)
+        if last - first < len(sample) // 2:
+            # narrow down to the values between two sample values
+            low, high = sample[first], sample[last]
+            below = start + len([v for v in part if v < low])
+            between = [v for v in part if low <= v <= high]
+            if below <= wanted[0] and wanted[-1] < below + len(between) < start + n:
+                parts.append((between, below, wanted, depth + 1))
+                continue
+
+        # the sample missed, or the ranks are far apart: partition around a
+        # sample value, splitting the ranks where they're furthest apart
+        pivot = sample[positions[0]]
+        if len(wanted) > 1:
+            split = max(
+                range(1, len(positions)),
+                key=lambda i: positions[i] - positions[i - 1],
+            )
+            pivot = sample[(positions[split - 1] + positions[split]) // 2]
+        less = [v for v in part if v < pivot]
+        greater = [v for v in part if v > pivot]
+        # ranks of the values equal to the pivot
+        low = start + len(less)
+        high = start + n - len(greater)
+
+        for k in wanted:
+            if low <= k < high:
+                found[k] = pivot
+
+        left = [k for k in wanted if k < low]
+        if left:
+            parts.append((less, start, left, depth + 1))
+        right = [k for k in wanted if k >= high]
+        if right:
+            parts.append((greater, high, right, depth + 1))
+
+    return found
+
+
+def quantiles(values, qs, select=select):
+    """Quantile of values for each q in qs, from 0 to 1; None if there are no values.
+
+    values is a sequence without nulls. select(values, ranks) finds the order
+    statistics to interpolate between, as the select function above does.
+    """
+    for q in qs:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantiles must be between 0 and 1, got {q}.")
+
+    if not len(values):
+        return [None] * len(qs)
+
+    positions = [q * (len(values) - 1) for q in qs]
+    found = select(
+        values,
+        [math.floor(p) for p in positions] + [math.ceil(p) for p in positions],
+    )
+
+    results = []
+    for position in positions:
+        below = found[math.floor(position)]
+        above = found[math.ceil(position)]
+        results.append(below + (above - below) * (position - math.floor(position)))
+
+    return results
@@ -1,29 +1,504 @@
+import array
+import functools
+import itertools
 import math
 import operator
+from collections.abc import MutableSequence
 
+from . import backend, cache, selection
+from . import window as window_module
+from .bitmap import Bitmap
 
-class Vec(list):
-    """One-dimensional array."""
+# dtypes that are stored unboxed, and their array.array typecodes
+TYPECODES = {"bool": "b", "int64": "q", "float64": "d"}
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+COMPARISONS = {
+    operator.eq,
+    operator.ne,
+    operator.lt,
+    operator.le,
+    operator.gt,
+    operator.ge,
+}
+LOGICAL = {operator.and_, operator.or_, operator.xor}
+
+# array.array typecode of the codes of a Categorical
+CODE_TYPECODE = "i"
+
+# what typed storage holds in place of a null
+PLACEHOLDERS = {"bool": False, "int64": 0, "float64": 0.0}
+
+
+def infer_dtype(values):
+    """Narrowest dtype that holds every value: bool, int64, float64 or object.
+
+    None fits any dtype, as a null, but a column of only None is "object".
+    """
+    types = set(map(type, values))
+    if type(None) in types:
+        types.discard(type(None))
+        values = [v for v in values if v is not None]
+
+    if types == {bool}:
+        return "bool"
+    elif types == {int}:
+        if INT64_MIN <= min(values) and max(values) <= INT64_MAX:
+            return "int64"
+    elif types == {float}:
+        return "float64"
+
+    return "object"
+
+
+def fits(dtype, value):
+    """Whether a single value can be stored in a column of the given dtype."""
+    if dtype == "object":
+        return True
+    elif dtype == "bool":
+        return type(value) == bool
+    elif dtype == "int64":
+        return type(value) == int and INT64_MIN <= value <= INT64_MAX
+    else:
+        return type(value) == float
+
+
+def make_storage(values, dtype):
+    """New, writable storage for a column of the given dtype."""
+    if dtype == "object":
+        return list(values)
+
+    typecode = TYPECODES[dtype]
+    if isinstance(values, memoryview) and values.format == typecode:
+        if values.contiguous:
+            storage = array.array(typecode)
+            storage.frombytes(values.cast("B"))
+            return storage
+
+    return array.array(typecode, values)
+
+
+def _memoized(method):
+    """Cache a method's result until the Vec is modified. See the cache module."""
+
+    @functools.wraps(method)
+    def memoized(self):
+        result = cache.lookup(self, method.__qualname__, lambda: method(self))
+
+        # hand out views, so that modifying one leaves the cached result intact
+        return result[:] if isinstance(result, Vec) else result
+
+    return memoized
+
+
+def _contiguous(data):
+    """Whether storage is an array, or a view of one without a step, for frombytes."""
+    return isinstance(data, array.array) or (
+        isinstance(data, memoryview) and data.c_contiguous
+    )
+
+
+def concat(vecs):
+    """Vec of the values of several Vecs one after the other, built in one pass."""
+    dtypes = {v.dtype for v in vecs}
+    dtype = dtypes.pop() if len(dtypes) == 1 else None
+
+    if dtype == "category":
+        return Categorical._concat(vecs)
+
+    if all(isinstance(v, Mask) and isinstance(v._data, Bitmap) for v in vecs):
+        return Mask._from_flags(b"".join(v._data.flags() for v in vecs))
+
+    if dtype in TYPECODES:
+        data = array.array(TYPECODES[dtype])
+        for v in vecs:
+            if _contiguous(v._data):
+                data.frombytes(memoryview(v._data).cast("B"))
+            else:
+                data.extend(v._data)
+
+        result = Vec._from_storage(data, dtype)
+        if any(v._valid is not None for v in vecs):
+            result._valid = Bitmap.from_flags(b"".join(map(_valid_flags, vecs)))
+
+        return result
+
+    # fill a list allocated once, then infer the dtype of mixed parts
+    values = [None] * sum(map(len, vecs))
+    start = 0
+    for v in vecs:
+        values[start : start + len(v)] = v
+        start += len(v)
+
+    if dtype == "object":
+        return Vec._from_storage(values, "object")
+
+    return Vec(values)
+
+
+class View:
+    """Read-only window onto another column's storage.
+
+    index is either a range, giving the offset, length and stride of a slice, or a
+    list of positions selected from base. Elements are only gathered when read.
+    """
+
+    __slots__ = ("base", "index")
+
+    def __init__(self, base, index):
+        if isinstance(base, View):
+            # view of a view: index straight into the underlying storage
+            if isinstance(index, (range, slice)):
+                index = base.index[index]
+            else:
+                index = list(map(base.index.__getitem__, index))
+            base = base.base
+
+        self.base = base
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return map(self.base.__getitem__, self.index)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return View(self.base, self.index[key])
+
+        return self.base[self.index[key]]
+
+
+def slice_storage(data, key):
+    """Zero-copy slice of column storage."""
+    if isinstance(data, (array.array, memoryview)):
+        return memoryview(data)[key]
+
+    if isinstance(data, View):
+        return View(data, key)
+
+    if isinstance(data, Bitmap):
+        # a bitmap is an eighth of the size of a selection, so just copy it
+        return data[key]
+
+    return View(data, range(len(data))[key])
+
+
+class Vec(MutableSequence):
+    """One-dimensional array.
+
+    Booleans, 64-bit ints and floats are stored unboxed in an array.array when every
+    value fits; anything else is kept in a plain list with the "object" dtype.
+    Storing a value that doesn't fit converts the column to "object".
+
+    Typed columns can also hold None: a validity bitmap marks which elements are
+    valid (not null), and the storage holds a placeholder for each null. Arithmetic
+    ANDs the operands' bitmaps rather than testing values, and isnull() is the
+    inverted bitmap. Object columns store None as is.
+
+    Slices, masks and take() return views that share storage with the original Vec,
+    as a memoryview (typed storage) or a View of selected positions (e.g. a list).
+    Storage may also be a memoryview over a memory-mapped file. Whichever Vec
+    modifies shared storage first gets its own copy to modify (copy-on-write).
+    """
+
+    # index.HashIndex or SortedIndex over our values, dropped when we're modified
+    _index = None
+    # bumped whenever we're modified, which invalidates cached results
+    _version = 0
+    # Bitmap of which elements aren't null, or None if they all are valid
+    _valid = None
+    # whether typed storage may hold nulls, rather than upcasting for them
+    _nullable = True
+
+    def __init__(self, values=(), dtype=None):
+        if isinstance(values, Vec) and values.dtype == "category":
+            # decode, rather than copying the codes
+            values = list(values)
+        elif isinstance(values, Vec):
+            if dtype is None:
+                dtype = values.dtype
+            values = values._data if values._valid is None else list(values)
+        elif not isinstance(values, (list, array.array)):
+            values = list(values)
+
+        if dtype is None:
+            dtype = infer_dtype(values)
+
+        self.dtype = dtype
+        if dtype in TYPECODES and isinstance(values, list) and None in values:
+            flags = bytes(map(operator.is_not, values, itertools.repeat(None)))
+            self._valid = Bitmap.from_flags(flags)
+            placeholder = PLACEHOLDERS[dtype]
+            values = [placeholder if v is None else v for v in values]
+
+        self._data = make_storage(values, dtype)
+        # whether other Vecs may be viewing our storage
+        self._shared = False
+
+    @classmethod
+    def _from_storage(cls, data, dtype):
+        """Wrap existing storage without copying or checking it."""
+        v = cls.__new__(cls)
+        v.dtype = dtype
+        v._data = data
+        v._shared = False
+        return v
+
+    def _view(self, data, valid=None):
+        """Vec over storage derived from ours without copying.
+
+        valid is the view's validity bitmap, if we have one.
+        """
+        self._shared = True
+        v = Vec._from_storage(data, self.dtype)
+        if valid is not None and valid.count() != len(valid):
+            v._valid = valid
+
+        return v
 
     def __repr__(self):
         return f"Vec({[v for v in self]})"
 
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        values = map(bool, self._data) if self.dtype == "bool" else iter(self._data)
+        if self._valid is None:
+            return values
+
+        values = list(values)
+        for i in (~self._valid).indices():
+            values[i] = None
+
+        return iter(values)
+
+    def __contains__(self, value):
+        if self._valid is not None:
+            # the placeholders of nulls mustn't match
+            return value in iter(self)
+
+        return value in self._data
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if isinstance(state["_data"], (memoryview, View)):
+            state["_data"] = make_storage(state["_data"], self.dtype)
+        state["_shared"] = False
+
+        return state
+
+    def _writable(self):
+        """Make sure the storage can be modified in place, copying it if needed."""
+        self._version += 1
+        self._index = None
+        if self._shared or isinstance(self._data, (memoryview, View)):
+            self._data = make_storage(self._data, self.dtype)
+            self._shared = False
+
+    def _upcast(self):
+        """Switch to boxed storage, so that any value can be stored."""
+        self._data = list(self)
+        self.dtype = "object"
+        self._valid = None
+
+    def _fit(self, values):
+        """Values ready to store, upcasting first if any of them doesn't fit.
+
+        Returns the values, with placeholders for nulls in typed storage, and their
+        validity flags, or None if they're all valid.
+        """
+        if self.dtype in TYPECODES and self._nullable and None in values:
+            if all(fits(self.dtype, v) for v in values if v is not None):
+                flags = bytes(map(operator.is_not, values, itertools.repeat(None)))
+                placeholder = PLACEHOLDERS[self.dtype]
+                return [placeholder if v is None else v for v in values], flags
+
+        if not all(fits(self.dtype, v) for v in values):
+            self._upcast()
+
+        return values, None
+
+    def _validity(self):
+        """Our validity bitmap, creating an all-valid one if we have none."""
+        if self._valid is None:
+            self._valid = ~Bitmap.from_flags(bytes(len(self)))
+
+        return self._valid
+
+    def __setitem__(self, key, value):
+        self._writable()
+        if isinstance(key, slice):
+            value, flags = self._fit(list(value))
+            if flags is not None or self._valid is not None:
+                self._validity()[key] = flags or b"\x01" * len(value)
+            self._data[key] = make_storage(value, self.dtype)
+        else:
+            (value,), flags = self._fit([value])
+            if flags is not None or self._valid is not None:
+                self._validity()[key] = flags != b"\x00"
+            self._data[key] = value
+
+    def __delitem__(self, key):
+        self._writable()
+        del self._data[key]
+        if self._valid is not None:
+            del self._valid[key]
+
+    def insert(self, index, value):
+        self._writable()
+        (value,), flags = self._fit([value])
+        if flags is not None or self._valid is not None:
+            self._validity().insert(index, flags != b"\x00")
+        self._data.insert(index, value)
+
+    def append(self, value):
+        self._writable()
+        (value,), flags = self._fit([value])
+        if flags is not None or self._valid is not None:
+            self._validity().append(flags != b"\x00")
+        self._data.append(value)
+
+    def extend(self, values):
+        self._writable()
+        values, flags = self._fit(list(values))
+        if flags is not None or self._valid is not None:
+            self._validity().extend(flags or b"\x01" * len(values))
+        self._data.extend(make_storage(values, self.dtype))
+
+    def reverse(self):
+        self._writable()
+        self._data.reverse()
+        if self._valid is not None:
+            self._valid.reverse()
+
+    def sort(self, key=None, reverse=False):
+        self[:] = sorted(self, key=key, reverse=reverse)
+
+    def copy(self):
+        return Vec(self)
+
+    def tolist(self):
+        """Values as a plain list, with None for nulls, e.g. for json.dumps."""
+        return list(self)
+
+    def astype(self, dtype):
+        """Convert every value to the given dtype."""
+        if dtype == "bool":
+            values = [bool(v) if v is not None else None for v in self]
+        elif dtype == "int64":
+            values = [int(v) if v is not None else None for v in self]
+        elif dtype == "float64":
+            values = [float(v) if v is not None else None for v in self]
+        elif dtype == "object":
+            values = self
+        elif dtype == "category":
+            return Categorical(self)
+        else:
+            raise ValueError(f"Unknown dtype {dtype}.")
+
+        return Vec(values, dtype)
+
     def _op(self, other, op):
-        if isinstance(other, list):
+        if op in LOGICAL:
+            bits, other_bits = _bitmap(self), _bitmap(other)
+            if bits is not None and other_bits is not None:
+                assert len(bits) == len(other_bits)
+                return Mask._from_storage(op(bits, other_bits), "bool")
+
+        if (
+            self._index is not None
+            and op in COMPARISONS
+            and not isinstance(other, (list, Vec))
+        ):
+            positions = self._index.select(op, other)
+            if positions is not None:
+                return Mask._from_storage(
+                    Bitmap.from_positions(positions, len(self)), "bool"
+                )
+
+        result = self._elementwise(other, op)
+        if (
+            op in COMPARISONS
+            and result.dtype == "bool"
+            and not isinstance(result, Mask)
+        ):
+            return Mask(result)
+
+        return result
+
+    def _elementwise(self, other, op):
+        if backend.enabled(self, *([other] if isinstance(other, Vec) else [])):
+            result = backend.binary_op(self, other, op)
+            if result is not None:
+                return Vec._from_storage(*result)
+
+        valid = _and_valid(self, other)
+        if isinstance(other, Vec):
             assert len(self) == len(other)
-            return Vec([op(val1, val2) for val1, val2 in zip(self, other)])
+            dtype = _result_dtype(op, self.dtype, other.dtype)
+        elif isinstance(other, list):
+            assert len(self) == len(other)
+            dtype = None
         else:
-            return Vec([op(val1, other) for val1 in self])
+            dtype = _result_dtype(op, self.dtype, infer_dtype((other,)))
+            other = itertools.repeat(other)
+
+        if valid is None:
+            return _from_results(list(map(op, self, other)), dtype)
+
+        # compute where both sides are valid; elsewhere the result is null, or for
+        # a comparison, what comparing None gives (False, except for == and !=)
+        flags = valid.flags()
+        if op in COMPARISONS:
+            return _from_results(
+                [
+                    op(val1, val2) if ok else _compare_null(op, val1, val2)
+                    for val1, val2, ok in zip(self, other, flags)
+                ],
+                dtype,
+            )
+
+        values = [
+            op(val1, val2) if ok else None for val1, val2, ok in zip(self, other, flags)
+        ]
+        if dtype is not None:
+            try:
+                return Vec(values, dtype)
+            except OverflowError:
+                pass
+
+        typed = self if self._valid is not None else other
+        return _with_nulls(values, valid, typed.dtype)
 
     def _iop(self, other, op):
         result = self._op(other, op)
-        for i, val in enumerate(result):
-            self[i] = val
+        self._version += 1
+        self._index = None
+        self._data = result._data
+        self._valid = result._valid
+        self._shared = False
+        self.dtype = result.dtype
 
         return self
 
     def _unary_op(self, op):
-        return Vec([op(val) for val in self])
+        if backend.enabled(self):
+            result = backend.unary_op(self, op)
+            if result is not None:
+                return Vec._from_storage(*result)
+
+        if self._valid is not None:
+            flags = self._valid.flags()
+            values = [op(val) if ok else None for val, ok in zip(self, flags)]
+            return _with_nulls(values, self._valid, self.dtype)
+
+        dtype = _result_dtype(op, self.dtype, self.dtype)
+        return _from_results(list(map(op, self)), dtype)
 
     def __add__(self, other):
         return self._op(other, operator.add)
@@ -104,12 +579,21 @@ class Vec(list):
         return self._iop(other, operator.xor)
 
     def __invert__(self):
+        if _bitmap(self) is not None:
+            return Mask._from_storage(~_bitmap(self), "bool")
+
         return self._unary_op(operator.not_)
 
     def all(self):
+        if backend.enabled(self):
+            return backend.all_(self)
+
         return all([bool(x) for x in self])
 
     def any(self):
+        if backend.enabled(self):
+            return backend.any_(self)
+
         return any([bool(x) for x in self])
 
     def __getitem__(self, key):
@@ -117,33 +601,663 @@ class Vec(list):
             return self
 
         # binary masks
-        if isinstance(key, list):
+        if isinstance(key, (list, Vec)):
             assert len(key) == len(self)
 
-            # cast to bool
-            mask = [bool(x) for x in key]
+            if isinstance(key, Mask):
+                return self.take(key.indices())
+
+            if (
+                isinstance(key, Vec)
+                and key.dtype == "bool"
+                and backend.enabled(self, key)
+            ):
+                return Vec._from_storage(*backend.compress(self, key))
+
+            return self.take(list(itertools.compress(range(len(self)), key)))
+
+        if isinstance(key, slice):
+            valid = self._valid[key] if self._valid is not None else None
+            return self._view(slice_storage(self._data, key), valid)
+
+        if self._valid is not None and not self._valid[key]:
+            return None
+
+        if self.dtype == "bool":
+            return bool(self._data[key])
+
+        return self._data[key]
+
+    def take(self, indices):
+        """Select elements by position, in the given order, as a view."""
+        valid = None
+        if self._valid is not None:
+            flags = self._valid.flags()
+            valid = Bitmap.from_flags(bytes(map(flags.__getitem__, indices)))
+
+        return self._view(View(self._data, indices), valid)
+
+    def argsort(self, ascending=True):
+        """Positions that would sort the Vec, as a Vec. Stable, with nulls last."""
+        return Vec(self._sorted_positions(range(len(self)), ascending), "int64")
+
+    def _sort_keys(self):
+        """Indexable values to sort positions by."""
+        if isinstance(self._data, (array.array, list)):
+            return self._data
+
+        return list(self)
 
-            return Vec([x for x, keepx in zip(self, mask) if keepx])
+    def _sorted_positions(self, positions, ascending=True):
+        """Stably sort positions by their values, nulls last."""
+        if ascending and positions == range(len(self)) and self.is_sorted():
+            return list(positions)
 
-        # default: defer to list implementation
-        return super().__getitem__(key)
+        keys = self._sort_keys()
+        nulls = bytes(self.isnull())
 
+        if not any(nulls):
+            return sorted(positions, key=keys.__getitem__, reverse=not ascending)
+
+        present = [i for i in positions if not nulls[i]]
+        present.sort(key=keys.__getitem__, reverse=not ascending)
+
+        return present + [i for i in positions if nulls[i]]
+
+    def _top(self, n, select):
+        """Positions of the n non-null values picked by heapq.nlargest/nsmallest."""
+        keys = self._sort_keys()
+
+        return select(n, (~self.isnull()).indices(), key=keys.__getitem__)
+
+    @_memoized
     def distinct(self):
+        if backend.enabled(self):
+            result = backend.distinct(self)
+            if result is not None:
+                return Vec._from_storage(*result)
+
         return Vec(sorted(set(self)))
 
+    @_memoized
+    def sum(self):
+        if backend.enabled(self):
+            result = backend.total(self)
+            if result is not None:
+                return result
+
+        if self._valid is not None:
+            # skip the nulls' placeholders
+            return sum(itertools.compress(self._data, self._valid.flags()))
+
+        return sum(self)
+
     def mean(self):
-        return sum(self) / len(self)
+        """Mean of the non-null values."""
+        return self.sum() / self.count()
+
+    @_memoized
+    def min(self):
+        """Smallest non-null value, or None if there are none."""
+        return min(self.dropna(), default=None)
+
+    @_memoized
+    def max(self):
+        """Largest non-null value, or None if there are none."""
+        return max(self.dropna(), default=None)
+
+    @_memoized
+    def _summary(self):
+        """Count, mean, sum of squared deviations, min and max of the non-null values.
+
+        Found in one pass, accumulating the mean and squared deviations with Welford's
+        online update. The mean, min and max are None if there are no values.
+        """
+        if self._valid is not None:
+            values = itertools.compress(self._data, self._valid.flags())
+        elif self.isnull().any():
+            values = self.dropna()
+        else:
+            values = self
+
+        count, mean, m2 = 0, 0.0, 0.0
+        low = high = None
+        for value in values:
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            if count == 1:
+                low = high = value
+            elif value < low:
+                low = value
+            elif value > high:
+                high = value
+
+        return count, mean if count else None, m2, low, high
 
+    def var(self):
+        """Sample variance of the non-null values, or None if there are fewer than 2."""
+        count, _, m2, _, _ = self._summary()
+        return m2 / (count - 1) if count >= 2 else None
+
+    def std(self):
+        """Sample standard deviation of the non-null values."""
+        var = self.var()
+        return math.sqrt(var) if var is not None else None
+
+    def quantile(self, q=0.5):
+        """Quantile q (from 0 to 1) of the non-null values, or None if there are none.
+
+        Given a list of quantiles, gives a Vec of them. The values either side of each
+        quantile are found by selection rather than by sorting, then interpolated
+        linearly; see the selection module.
+        """
+        several = isinstance(q, (list, tuple, Vec))
+        qs = list(q) if several else [q]
+
+        values = self.dropna() if self.isnull().any() else self
+        select = backend.select if backend.enabled(values) else selection.select
+        results = selection.quantiles(values, qs, select)
+
+        return Vec(results, "float64") if several else results[0]
+
+    @_memoized
+    def median(self):
+        return self.quantile(0.5)
+
+    def count(self, *value):
+        """Number of non-null values, or given a value, of elements equal to it."""
+        if value:
+            return super().count(*value)
+
+        return len(self) - self.isnull().sum()
+
+    @_memoized
+    def is_sorted(self):
+        """Whether the values are in ascending order, without nulls."""
+        if self.isnull().any():
+            return False
+
+        keys = self._sort_keys()
+        try:
+            return all(map(operator.le, keys, itertools.islice(keys, 1, None)))
+        except TypeError:
+            return False
+
+    @_memoized
     def isnull(self):
-        return Vec([i is None or (type(i) == float and math.isnan(i)) for i in self])
+        if backend.enabled(self):
+            return Mask._from_flags(backend.isnull(self)[0])
+
+        if self.dtype in TYPECODES:
+            if self._valid is not None:
+                nulls = ~self._valid
+            else:
+                nulls = Bitmap.from_flags(bytes(len(self)))
+
+            if self.dtype == "float64":
+                # NaN counts as null too
+                nulls |= Bitmap.from_flags(bytes(map(math.isnan, self._data)))
+
+            return Mask._from_storage(nulls, "bool")
+
+        return Mask([i is None or (type(i) == float and math.isnan(i)) for i in self])
 
     def dropna(self):
         return self[~self.isnull()]
 
+    def rolling(self, window, min_periods=None):
+        """Statistics over each value and the window - 1 values before it.
+
+        A result needs min_periods (by default, window) non-null values in the
+        window. See the window module.
+        """
+        return window_module.Rolling(self, window, min_periods)
+
+    def expanding(self, min_periods=1):
+        """Statistics over each value and all the values before it."""
+        return window_module.Expanding(self, min_periods)
+
     def apply(self, fxn):
         return Vec([fxn(x) for x in self])
 
     def fillna(self, default):
+        if backend.enabled(self):
+            result = backend.fillna(self, default)
+            if result is not None:
+                return Vec._from_storage(*result)
+
         nulls = self.isnull()
 
+        if self.dtype in TYPECODES and fits(self.dtype, default):
+            # overwrite the nulls in a copy of the storage
+            data = make_storage(self._data, self.dtype)
+            for i in nulls.indices():
+                data[i] = default
+
+            return Vec._from_storage(data, self.dtype)
+
         return Vec([val if not isnull else default for val, isnull in zip(self, nulls)])
+
+
+def _bitmap(v):
+    """Bitmap of the values of a bool Vec without nulls, or None for anything else."""
+    if not isinstance(v, Vec) or v.dtype != "bool" or v._valid is not None:
+        return None
+
+    if isinstance(v._data, Bitmap):
+        return v._data
+
+    return Bitmap.from_flags(v._data)
+
+
+def _valid_flags(v):
+    """One 0 or 1 byte per element of a Vec, flagging the valid (non-null) ones."""
+    if v._valid is None:
+        return b"\x01" * len(v)
+
+    return v._valid.flags()
+
+
+def _and_valid(v, other):
+    """Validity bitmap of the result of an operation, or None if it has no nulls."""
+    valid = v._valid
+    other_valid = other._valid if isinstance(other, Vec) else None
+    if valid is None or other_valid is None:
+        return valid if other_valid is None else other_valid
+
+    return valid & other_valid
+
+
+def _result_dtype(op, dtype, other_dtype):
+    """dtype of the results of op on values of two typed dtypes, or None if unknown.
+
+    Unary ops pass the operand's dtype twice.
+    """
+    if dtype not in TYPECODES or other_dtype not in TYPECODES:
+        return None
+    elif op in COMPARISONS or op is operator.not_:
+        return "bool"
+    elif op is operator.truediv or "float64" in (dtype, other_dtype):
+        return "float64"
+    elif op in LOGICAL and dtype == other_dtype == "bool":
+        return "bool"
+
+    # arithmetic on bools gives ints
+    return "int64"
+
+
+def _from_results(values, dtype):
+    """Vec of computed values without nulls, of a dtype known in advance if given.
+
+    Knowing the dtype skips inferring it. Comparisons give a Mask. Ints that
+    overflow int64 fall back to inferring, which gives an object column.
+    """
+    if dtype == "bool":
+        return Mask._from_flags(bytes(values))
+    elif dtype is not None:
+        try:
+            return Vec._from_storage(array.array(TYPECODES[dtype], values), dtype)
+        except OverflowError:
+            pass
+
+    return Vec(values)
+
+
+def _with_nulls(values, valid, dtype):
+    """Vec of values computed where valid is set, None elsewhere.
+
+    If nothing was valid, the result keeps the dtype of the operand with nulls,
+    rather than becoming an object column of None.
+    """
+    return Vec(values, None if valid.count() else dtype)
+
+
+def _compare_null(op, val1, val2):
+    """Comparison involving a null: == and != compare with None, the rest are False."""
+    if op is operator.eq or op is operator.ne:
+        return op(val1, val2)
+
+    return False
+
+
+class Mask(Vec):
+    """Boolean Vec packed one bit per element.
+
+    Comparisons return Masks. Combining masks with &, |, ^ and ~ works on whole
+    bitmaps rather than element by element, and indices() gives the positions of
+    the true elements, which is how masks select rows.
+
+    A Mask that has a non-bool value (including None) stored in it behaves like any
+    other Vec.
+    """
+
+    _nullable = False
+
+    def __init__(self, values=()):
+        bits = _bitmap(values)
+        if bits is None:
+            bits = Bitmap(values)
+        elif bits is values._data:
+            bits = bits.copy()
+
+        self.dtype = "bool"
+        self._data = bits
+        self._shared = False
+
+    @classmethod
+    def _from_flags(cls, flags):
+        """Mask from a bytes-like object holding one 0 or 1 byte per element."""
+        return cls._from_storage(Bitmap.from_flags(flags), "bool")
+
+    def _packed(self):
+        return isinstance(self._data, Bitmap)
+
+    def _view(self, data, valid=None):
+        if not self._packed():
+            return super()._view(data, valid)
+
+        return Mask._from_storage(data, "bool")
+
+    def __iter__(self):
+        if not self._packed():
+            return super().__iter__()
+
+        return iter(self._data)
+
+    def copy(self):
+        if not self._packed():
+            return super().copy()
+
+        return Mask(self)
+
+    def take(self, indices):
+        if not self._packed():
+            return super().take(indices)
+
+        flags = self._data.flags()
+        return Mask._from_flags(bytes(map(flags.__getitem__, indices)))
+
+    def indices(self):
+        """Positions of the true elements, in order."""
+        if not self._packed():
+            return list(itertools.compress(range(len(self)), self))
+
+        return self._data.indices()
+
+    def all(self):
+        if not self._packed():
+            return super().all()
+
+        return self._data.count() == len(self)
+
+    def any(self):
+        if not self._packed():
+            return super().any()
+
+        return any(self._data.bits)
+
+    def sum(self):
+        if not self._packed():
+            return super().sum()
+
+        return self._data.count()
+
+
+class Categorical(Vec):
+    """Dictionary-encoded Vec, with the "category" dtype.
+
+    Each distinct value is stored once, in categories, and each element as the int
+    code of its value (-1 for None). Columns that repeat a few values many times
+    take much less memory this way, and comparing an element for equality or
+    hashing it for a groupby only touches its code.
+
+    Storing a value that can't be a category (one that isn't hashable) converts the
+    column to "object".
+    """
+
+    # whether categories and _codes are ours alone to add to, rather than shared
+    # with other Vecs (e.g. views), which would see the additions
+    _own_categories = False
+
+    def __init__(self, values=()):
+        own_categories = True
+        if isinstance(values, Vec) and values.dtype == "category":
+            codes = array.array(CODE_TYPECODE, values._data)
+            categories = values.categories
+            codes_of = values._codes
+            values._own_categories = own_categories = False
+        else:
+            codes_of = {}
+            codes = array.array(
+                CODE_TYPECODE,
+                [
+                    codes_of.setdefault(v, len(codes_of)) if v is not None else -1
+                    for v in values
+                ],
+            )
+            categories = list(codes_of)
+
+        self.dtype = "category"
+        self._data = codes
+        self._shared = False
+        self.categories = categories
+        self._codes = codes_of
+        self._own_categories = own_categories
+
+    @classmethod
+    def _concat(cls, vecs):
+        codes_of = {}
+        codes = array.array(CODE_TYPECODE)
+        for v in vecs:
+            # code in the result of each of v's codes, with -1 staying -1
+            remap = [codes_of.setdefault(c, len(codes_of)) for c in v.categories]
+            if remap == list(range(len(remap))) and _contiguous(v._data):
+                codes.frombytes(memoryview(v._data).cast("B"))
+            else:
+                codes.extend(map((remap + [-1]).__getitem__, v._data))
+
+        result = cls._from_codes(codes, list(codes_of), codes_of)
+        result._own_categories = True
+        return result
+
+    @classmethod
+    def _from_codes(cls, codes, categories, codes_of):
+        v = cls._from_storage(codes, "category")
+        v.categories = categories
+        v._codes = codes_of
+        return v
+
+    @property
+    def codes(self):
+        """The int code of each element, -1 meaning None."""
+        return Vec(self._data, "int64")
+
+    def decode(self, code):
+        """Value of a code."""
+        return self.categories[code] if code >= 0 else None
+
+    def _encode(self, value):
+        if value is None:
+            return -1
+
+        code = self._codes.get(value)
+        if code is None:
+            if not self._own_categories:
+                # copy shared categories once, then add to the copies in place
+                self.categories = list(self.categories)
+                self._codes = dict(self._codes)
+                self._own_categories = True
+
+            code = len(self.categories)
+            self.categories.append(value)
+            self._codes[value] = code
+
+        return code
+
+    def _encoded(self, values):
+        """Codes for values, or None (after upcasting) if one can't be a category."""
+        try:
+            return array.array(CODE_TYPECODE, map(self._encode, values))
+        except TypeError:
+            self._upcast()
+            return None
+
+    def _view(self, data, valid=None):
+        if self.dtype != "category":
+            return super()._view(data, valid)
+
+        self._shared = True
+        self._own_categories = False
+        return Categorical._from_codes(data, self.categories, self._codes)
+
+    def __iter__(self):
+        if self.dtype != "category":
+            return super().__iter__()
+
+        # code -1 picks out the trailing None
+        return map((self.categories + [None]).__getitem__, self._data)
+
+    def __contains__(self, value):
+        if self.dtype != "category":
+            return super().__contains__(value)
+
+        try:
+            code = -1 if value is None else self._codes.get(value)
+        except TypeError:
+            return False
+
+        return code is not None and code in self._data
+
+    def __getitem__(self, key):
+        if self.dtype != "category" or isinstance(key, (tuple, list, Vec, slice)):
+            return super().__getitem__(key)
+
+        return self.decode(self._data[key])
+
+    def __getstate__(self):
+        if self.dtype != "category":
+            return super().__getstate__()
+
+        state = dict(self.__dict__)
+        state["_data"] = array.array(CODE_TYPECODE, self._data)
+        state["_shared"] = False
+
+        return state
+
+    def _writable(self):
+        if self.dtype != "category":
+            return super()._writable()
+
+        self._version += 1
+        self._index = None
+        if self._shared or isinstance(self._data, (memoryview, View)):
+            self._data = array.array(CODE_TYPECODE, self._data)
+            self._shared = False
+
+    def __setitem__(self, key, value):
+        if self.dtype == "category":
+            self._writable()
+            value = list(value) if isinstance(key, slice) else value
+            codes = self._encoded(value if isinstance(key, slice) else [value])
+            if codes is not None:
+                self._data[key] = codes if isinstance(key, slice) else codes[0]
+                return
+
+        super().__setitem__(key, value)
+
+    def insert(self, index, value):
+        if self.dtype == "category":
+            self._writable()
+            codes = self._encoded([value])
+            if codes is not None:
+                self._data.insert(index, codes[0])
+                return
+
+        super().insert(index, value)
+
+    def append(self, value):
+        if self.dtype == "category":
+            self._writable()
+            codes = self._encoded([value])
+            if codes is not None:
+                self._data.append(codes[0])
+                return
+
+        super().append(value)
+
+    def extend(self, values):
+        if self.dtype == "category":
+            self._writable()
+            values = list(values)
+            codes = self._encoded(values)
+            if codes is not None:
+                self._data.extend(codes)
+                return
+
+        super().extend(values)
+
+    def copy(self):
+        if self.dtype != "category":
+            return super().copy()
+
+        return Categorical(self)
+
+    def astype(self, dtype):
+        if self.dtype == "category" and dtype == "category":
+            return self.copy()
+
+        return super().astype(dtype)
+
+    def _op(self, other, op):
+        if (
+            self.dtype != "category"
+            or op not in (operator.eq, operator.ne)
+            or isinstance(other, (list, Vec))
+            # NaN isn't equal to itself, which codes can't express
+            or other != other
+        ):
+            return super()._op(other, op)
+
+        try:
+            code = -1 if other is None else self._codes.get(other)
+        except TypeError:
+            return super()._op(other, op)
+
+        if code is None:
+            # not a category, so equal to no element
+            mask = Mask._from_flags(bytes(len(self)))
+        else:
+            mask = Mask._from_flags(bytes(map(code.__eq__, self._data)))
+
+        return mask if op is operator.eq else ~mask
+
+    def _sort_keys(self):
+        if self.dtype != "category":
+            return super()._sort_keys()
+
+        # sort the categories once, then sort codes by the rank of their category;
+        # the null code, -1, gets the rank after them all, which puts nulls last
+        ranks = [0] * (len(self.categories) + 1)
+        by_value = sorted(range(len(self.categories)), key=self.categories.__getitem__)
+        for rank, code in enumerate(by_value):
+            ranks[code] = rank
+        ranks[-1] = len(self.categories)
+
+        return list(map(ranks.__getitem__, self._data))
+
+    @_memoized
+    def isnull(self):
+        if self.dtype != "category":
+            return super().isnull()
+
+        null_codes = {-1} | {i for i, v in enumerate(self.categories) if v != v}
+        return Mask._from_flags(bytes(map(null_codes.__contains__, self._data)))
+
+    @_memoized
+    def distinct(self):
+        if self.dtype != "category":
+            return super().distinct()
+
+        return Vec(sorted(map(self.decode, set(self._data))))
@@ -0,0 +1,270 @@
+"""Rolling and expanding window statistics.
+
+    v.rolling(3).mean()                          # mean of each row and the 2 before
+    v.expanding().max()                          # running maximum
+    df.groupby("key").rolling("value", 3).sum()  # windows within each group
+
+Every statistic takes a single pass over the rows, in O(n) whatever the window
+size: sums and means keep running totals, min and max keep monotonic deques of the
+candidates, and var and std use Welford's update, applied in reverse as values
+leave the window.
+
+Windows are counted in rows, nulls included, but statistics only use the non-null
+values; rows whose window holds fewer than min_periods of them give None.
+"""
+import collections
+import math
+
+from . import vec
+
+# dtypes that DF windows are computed for
+NUMERIC = ("bool", "int64", "float64")
+
+
+class _Sum:
+    __slots__ = ("total",)
+
+    def __init__(self):
+        self.total = 0
+
+    def add(self, value, position):
+        self.total += value
+
+    def remove(self, value, position):
+        self.total -= value
+
+    def result(self, count):
+        return self.total
+
+
+class _Mean(_Sum):
+    __slots__ = ()
+
+    def result(self, count):
+        return self.total / count
+
+
+class _Count:
+    __slots__ = ()
+
+    def add(self, value, position):
+        pass
+
+    def remove(self, value, position):
+        pass
+
+    def result(self, count):
+        return count
+
+
+class _Var:
+    """Welford's online variance, with removals undoing additions."""
+
+    __slots__ = ("n", "mean", "m2", "last", "run")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        # the latest value, and how many times in a row it was added
+        self.last = None
+        self.run = 0
+
+    def add(self, value, position):
+        if value == self.last:
+            self.run += 1
+        else:
+            self.last = value
+            self.run = 1
+
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value, position):
+        self.n -= 1
+        if not self.n:
+            self.mean = self.m2 = 0.0
+            return
+
+        delta = value - self.mean
+        self.mean -= delta / self.n
+        self.m2 -= delta * (value - self.mean)
+
+    def result(self, count):
+        if count < 2:
+            return None
+        if self.run >= count:
+            # all the values in the window are equal; skip the rounding error
+            # left over from values that have been removed
+            return 0.0
+
+        # rounding can also leave a tiny negative sum of squares
+        return max(self.m2, 0.0) / (count - 1)
+
+
+class _Std(_Var):
+    __slots__ = ()
+
+    def result(self, count):
+        var = super().result(count)
+        return math.sqrt(var) if var is not None else None
+
+
+class _Min:
+    """Monotonic deque of the window's minimum, then each later value that could
+    become the minimum once earlier ones leave, as (position, value)."""
+
+    __slots__ = ("candidates",)
+
+    def __init__(self):
+        self.candidates = collections.deque()
+
+    def _beats(self, value, other):
+        return value <= other
+
+    def add(self, value, position):
+        candidates = self.candidates
+        while candidates and self._beats(value, candidates[-1][1]):
+            candidates.pop()
+        candidates.append((position, value))
+
+    def remove(self, value, position):
+        # only still here if nothing after it beat it
+        if self.candidates[0][0] == position:
+            self.candidates.popleft()
+
+    def result(self, count):
+        return self.candidates[0][1]
+
+
+class _Max(_Min):
+    __slots__ = ()
+
+    def _beats(self, value, other):
+        return value >= other
+
+
+class _Window:
+    """The last size rows of one group (all of them if size is None)."""
+
+    __slots__ = ("stat", "values", "position", "count")
+
+    def __init__(self, stat):
+        self.stat = stat
+        # values in the window, None for nulls; not kept for expanding windows
+        self.values = collections.deque()
+        # rows seen so far, and how many of those in the window aren't null
+        self.position = 0
+        self.count = 0
+
+    def push(self, value, size):
+        if size is not None:
+            self.values.append(value)
+        if value is not None:
+            self.stat.add(value, self.position)
+            self.count += 1
+
+        if size is not None and len(self.values) > size:
+            old = self.values.popleft()
+            if old is not None:
+                self.stat.remove(old, self.position - size)
+                self.count -= 1
+
+        self.position += 1
+
+
+class Rolling:
+    """Window statistics over a Vec, the numeric columns of a DF, or groups.
+
+    Use Vec.rolling, DF.rolling or GroupBy.rolling to make one. Each statistic
+    gives one result per row: a Vec, or for a DF, a DF.
+    """
+
+    def __init__(self, data, window, min_periods=None, group_ids=None):
+        if window is not None and window < 1:
+            raise ValueError(f"Window size must be at least 1, got {window}.")
+
+        self.data = data
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        # group id of each row, for windows within groups
+        self.group_ids = group_ids
+
+    def _compute(self, stat):
+        if isinstance(self.data, vec.Vec):
+            return self._column(self.data, stat)
+
+        # a DF: a column of results for each numeric column
+        return type(self.data)(
+            {
+                name: self._column(column, stat)
+                for name, column in self.data.items()
+                if column.dtype in NUMERIC
+            }
+        )
+
+    def _column(self, column, stat):
+        values = column
+        nulls = column.isnull()
+        if nulls.any():
+            # NaN is null too
+            values = [None if null else v for v, null in zip(column, nulls)]
+
+        group_ids = self.group_ids
+        if group_ids is None:
+            group_ids = bytes(len(column))
+
+        size = self.window
+        min_periods = self.min_periods
+        windows = {}
+        results = []
+        for group_id, value in zip(group_ids, values):
+            window = windows.get(group_id)
+            if window is None:
+                window = windows[group_id] = _Window(stat())
+
+            window.push(value, size)
+            if window.count >= max(min_periods, 1):
+                results.append(window.stat.result(window.count))
+            elif stat is _Count:
+                results.append(window.count)
+            else:
+                results.append(None)
+
+        if all(r is None for r in results):
+            return vec.Vec(results, "float64")
+
+        return vec.Vec(results)
+
+    def count(self):
+        """Number of non-null values in each window."""
+        return self._compute(_Count)
+
+    def sum(self):
+        return self._compute(_Sum)
+
+    def mean(self):
+        return self._compute(_Mean)
+
+    def var(self):
+        """Sample variance."""
+        return self._compute(_Var)
+
+    def std(self):
+        """Sample standard deviation."""
+        return self._compute(_Std)
+
+    def min(self):
+        return self._compute(_Min)
+
+    def max(self):
+        return self._compute(_Max)
+
+
+class Expanding(Rolling):
+    """Statistics over every row so far, rather than a window of the last few."""
+
+    def __init__(self, data, min_periods=1, group_ids=None):
+        super().__init__(data, None, min_periods, group_ids)
@@ -0,0 +1,19 @@
+from mini_pandas.aggregation import DeferredGroupBy
+from mini_pandas.df import DF
+from mini_pandas.lazy import LazyGroupBy
+from mini_pandas.parallel import Engine, ParallelGroupBy
+
+
+def test_records_aggregations():
+    groupby = DeferredGroupBy(("Team",)).sum("Score").count().var("Score")
+    assert groupby.aggs == [("sum", "Score"), ("count", None), ("var", "Score")]
+
+
+def test_groupbys_share_recording():
+    df = DF({"Team": ["red", "blue", "red"], "Score": [3, 1, 4]})
+    lazy = df.lazy().groupby("Team").sum("Score").count()
+    parallel = Engine(mode="serial").groupby(df, "Team").sum("Score").count()
+
+    assert isinstance(lazy, LazyGroupBy) and not isinstance(parallel, LazyGroupBy)
+    assert isinstance(parallel, ParallelGroupBy) and lazy.aggs == parallel.aggs
+    assert list(lazy.agg().collect().itertuples()) == list(parallel.agg().itertuples())
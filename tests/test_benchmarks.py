@@ -0,0 +1,28 @@
+from benchmarks import data, suite
+
+
+def test_make_df():
+    df = data.make_df(100, "high", null_ratio=0.25)
+
+    assert df.shape == (100, 4)
+    assert df["value"].isnull().sum() == 25
+    assert len(df["key"].distinct()) <= 50
+
+    assert list(data.make_df(10)["value"]) == list(data.make_df(10)["value"])
+
+
+def test_run_and_compare():
+    results = suite.run([50], ["low"], [0.0, 0.5], ["filter", "groupby_agg"], 1)
+
+    assert [r["name"] for r in results["results"]] == ["filter", "groupby_agg"] * 2
+    assert all(r["seconds"] > 0 and r["peak_bytes"] > 0 for r in results["results"])
+
+    slower = {
+        "results": [
+            {**r, "seconds": r["seconds"] * (2 if r["name"] == "filter" else 1)}
+            for r in results["results"]
+        ]
+    }
+    changes = suite.compare(results, slower, threshold=0.5)
+    assert [c["regression"] for c in changes] == [True, False, True, False]
+    assert changes[0]["time_ratio"] == 2
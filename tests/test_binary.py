@@ -0,0 +1,91 @@
+import math
+
+import pytest
+
+from mini_pandas.df import DF, read_binary
+from mini_pandas.vec import Categorical
+
+
+def make_df():
+    return DF(
+        {
+            "Name": ["Xavier", None, "Claude", "Zoë"],
+            "Age": [1, 2, 3, 4],
+            "Height": [1.5, math.nan, 2.0, 0.25],
+            "Flag": [True, False, False, True],
+            "ID": [5, None, 100, 7],
+        }
+    )
+
+
+def test_roundtrip(tmp_path):
+    df = make_df()
+    filename = tmp_path / "test_roundtrip.mpd"
+    df.to_binary(filename)
+
+    for mmap in [True, False]:
+        df2 = read_binary(filename, mmap=mmap)
+
+        assert df2.columns == df.columns
+        for c in df.columns:
+            assert df2[c].dtype == df[c].dtype
+            assert [repr(v) for v in df2[c]] == [repr(v) for v in df[c]]
+
+
+def test_categorical_roundtrip(tmp_path):
+    category = Categorical(["b", "a", None, "b", "é", "a"])
+    df = DF(
+        {
+            "all": category,
+            "strided": Categorical(["x", "y"] * 6)[::2],
+            "taken": category.take([5, 0, 2, 1, 4, 3]),
+        }
+    )
+    filename = tmp_path / "test_categorical_roundtrip.mpd"
+    df.to_binary(filename)
+
+    for mmap in [True, False]:
+        df2 = read_binary(filename, mmap=mmap)
+        for c in df.columns:
+            assert df2[c].dtype == "category"
+            assert list(df2[c]) == list(df[c])
+        assert df2["all"].categories == ["b", "a", "é"]
+
+        # still encoded after modifying it
+        df2["all"][0] = "c"
+        assert list(df2["all"]) == ["c", "a", None, "b", "é", "a"]
+        assert (df2["all"] == "a").indices() == [1, 5]
+
+
+def test_select_columns(tmp_path):
+    df = make_df()
+    filename = tmp_path / "test_select_columns.mpd"
+    df.to_binary(filename)
+
+    df2 = read_binary(filename, columns=["Age", "Name"])
+
+    assert df2.columns == ["Age", "Name"]
+    assert (df2["Age"] == [1, 2, 3, 4]).all()
+
+    with pytest.raises(ValueError):
+        read_binary(filename, columns=["Missing"])
+
+
+def test_mmap_copy_on_write(tmp_path):
+    df = make_df()
+    filename = tmp_path / "test_mmap_copy_on_write.mpd"
+    df.to_binary(filename)
+
+    df2 = read_binary(filename)
+    df2["Age"][0] = 10
+    df2["Age"].append(5)
+
+    assert (df2["Age"] == [10, 2, 3, 4, 5]).all()
+    assert (read_binary(filename)["Age"] == [1, 2, 3, 4]).all()
+
+
+def test_mixed_types(tmp_path):
+    df = DF({"Mixed": [1, "a"]})
+
+    with pytest.raises(TypeError):
+        df.to_binary(tmp_path / "test_mixed_types.mpd")
@@ -0,0 +1,65 @@
+import pickle
+
+from mini_pandas.bitmap import Bitmap
+
+FLAGS = [True, False, False, True, True, False, True, False, True, True, False]
+
+
+def test_roundtrip():
+    bits = Bitmap(FLAGS)
+
+    assert len(bits) == len(FLAGS)
+    assert list(bits) == FLAGS
+    assert [bits[i] for i in range(-len(FLAGS), len(FLAGS))] == FLAGS * 2
+    assert list(bits[2:9:3]) == FLAGS[2:9:3]
+    assert list(Bitmap()) == []
+    assert list(pickle.loads(pickle.dumps(bits))) == FLAGS
+
+
+def test_bitwise():
+    a = Bitmap(FLAGS)
+    b = Bitmap(FLAGS[::-1])
+
+    assert list(a & b) == [x and y for x, y in zip(FLAGS, FLAGS[::-1])]
+    assert list(a | b) == [x or y for x, y in zip(FLAGS, FLAGS[::-1])]
+    assert list(a ^ b) == [x != y for x, y in zip(FLAGS, FLAGS[::-1])]
+    assert list(~a) == [not x for x in FLAGS]
+
+    assert a.count() == sum(FLAGS)
+    assert a.indices() == [i for i, x in enumerate(FLAGS) if x]
+
+
+def test_modify():
+    bits = Bitmap(FLAGS)
+    expected = list(FLAGS)
+
+    for i in range(20):
+        bits.append(i % 3 == 0)
+        expected.append(i % 3 == 0)
+
+    bits[0] = False
+    bits[-1] = True
+    bits.insert(5, True)
+    del bits[2]
+    bits[3:6] = [False, True]
+    expected[0] = False
+    expected[-1] = True
+    expected.insert(5, True)
+    del expected[2]
+    expected[3:6] = [False, True]
+
+    assert list(bits) == expected
+
+
+def test_extend():
+    # from every partial last byte, by amounts that do and don't fill it
+    for start in range(10):
+        for added in [0, 1, 3, 7, 8, 13]:
+            first = [i % 3 == 0 for i in range(start)]
+            rest = [i % 2 == 1 for i in range(added)]
+
+            bitmap = Bitmap(first)
+            bitmap.extend(rest)
+            assert list(bitmap) == first + rest
+            assert bitmap.count() == sum(first + rest)
+            assert list(~bitmap) == [not f for f in first + rest]
@@ -0,0 +1,101 @@
+import gc
+
+import pytest
+
+from mini_pandas import cache
+from mini_pandas.vec import Vec
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    cache.clear()
+    yield
+    cache.set_limit(64 * 2**20)
+    cache.clear()
+
+
+def test_invalidation():
+    v1 = Vec([3, 1, None, 2, 1])
+
+    nulls = v1.isnull()
+    assert list(nulls) == [False, False, True, False, False]
+    assert (v1.min(), v1.max(), v1.count()) == (1, 3, 4)
+    assert not v1.is_sorted()
+
+    # results handed out can be modified without affecting the cached ones
+    nulls[0] = True
+    assert list(v1.isnull()) == [False, False, True, False, False]
+
+    v1[2] = 5
+    assert list(v1.distinct()) == [1, 2, 3, 5]
+    assert (v1.min(), v1.max(), v1.count(), v1.sum()) == (1, 5, 5, 12)
+
+    v1.append(0)
+    assert list(v1.distinct()) == [0, 1, 2, 3, 5]
+    assert (v1.min(), v1.sum()) == (0, 12)
+
+    v1 += 1
+    assert list(v1.distinct()) == [1, 2, 3, 4, 6]
+    assert (v1.min(), v1.sum()) == (1, 18)
+
+    v1.sort()
+    assert v1.is_sorted()
+
+    v1.append(None)
+    assert not v1.is_sorted()
+    assert list(v1.isnull()) == [False] * 6 + [True]
+
+
+def test_views_keep_their_own_results():
+    v1 = Vec([1, 2, 3, 4])
+    view = v1[1:]
+
+    assert view.sum() == 9 and v1.sum() == 10
+    view[0] = 10
+    assert view.sum() == 17 and v1.sum() == 10
+    assert v1.is_sorted() and not view.is_sorted()
+
+
+def test_eviction():
+    vecs = [Vec(list(range(i, i + 1000))) for i in range(10)]
+    cache.set_limit(3 * 1000 * 8)
+
+    calls = []
+    for v in vecs:
+        cache.lookup(v, "test", lambda: calls.append(1) or v.copy())
+    for v in vecs[-3:]:
+        cache.lookup(v, "test", lambda: calls.append(1) or v.copy())
+    assert len(calls) == 10
+
+    cache.lookup(vecs[0], "test", lambda: calls.append(1) or vecs[0].copy())
+    assert len(calls) == 11
+
+    cache.set_limit(0)
+    cache.lookup(vecs[0], "test", lambda: calls.append(1) or vecs[0].copy())
+    cache.lookup(vecs[0], "test", lambda: calls.append(1) or vecs[0].copy())
+    assert len(calls) == 13
+
+
+def test_collected_vecs_are_dropped():
+    v1 = Vec(list(range(1000)))
+    v2 = Vec(list(range(1000)))
+    v1.distinct()
+    v1.isnull()
+    v2.distinct()
+    assert len(cache._entries) == 3
+
+    del v1
+    gc.collect()
+    assert len(cache._entries) == 1
+    assert cache._size == cache._nbytes(cache._entries[(id(v2), "Vec.distinct")][2])
+
+    # with the lock held, e.g. by the code a collection interrupts, the results are
+    # dropped once it's released
+    with cache._lock:
+        del v2
+        gc.collect()
+        assert len(cache._entries) == 1
+    v3 = Vec([1])
+    v3.sum()
+    assert list(cache._entries) == [(id(v3), "Vec.sum")]
+    assert list(cache._vecs) == [id(v3)]
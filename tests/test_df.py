@@ -1,8 +1,10 @@
 import csv
+import math
+
 import pytest
 
-from mini_pandas.df import DF, read_csv, vstack
-from mini_pandas.vec import Vec
+from mini_pandas.df import DF, concat, read_csv, vstack
+from mini_pandas.vec import Categorical, Vec
 
 
 def test_df():
@@ -129,6 +131,11 @@ def test_iterrows():
     for i in range(3):
         assert (all_rows[i] == df[i]).all()
         assert isinstance(all_rows[i], Vec)
+        assert all_rows[i].dtype == "object"
+
+    df = DF({"x": [1.5, None], "y": Categorical(["a", None])})
+    assert [list(row) for row in df.iterrows()] == [[1.5, "a"], [None, None]]
+    assert list(next(df.iterrows()).isnull()) == [False, False]
 
 
 def test_setter():
@@ -189,6 +196,22 @@ def test_vstack():
     assert (df["2"] == [1, 2, 1, 2, 1, 0]).all()
 
 
+def test_vstack_strided():
+    df = DF(
+        {
+            "i": [1, 2, 3, 4],
+            "f": [0.5, 1.5, None, 3.5],
+            "c": Categorical(["a", "b", "a", "c"]),
+        }
+    )
+
+    df2 = vstack(df[::2], df)
+    assert (df2["i"] == [1, 3, 1, 2, 3, 4]).all()
+    assert list(df2["f"]) == [0.5, None, 0.5, 1.5, None, 3.5]
+    assert df2["c"].dtype == "category"
+    assert (df2["c"] == ["a", "a", "a", "b", "a", "c"]).all()
+
+
 def test_dropna():
     df = DF({"a": [1, None, 3], "b": [None, None, 3], "c": [1, None, 3]})
 
@@ -316,6 +339,52 @@ def test_df_append():
     assert (df["Age"] == [1, 2, 3, 4, 5]).all()
 
 
+def test_df_extend():
+    df = DF({"Name": ["Xavier"], "Age": [1]})
+
+    df.extend([["Atticus", 2], ("Claude", 3)])
+    df.extend([{"Age": 4, "Name": "d"}])
+    df.extend({"Name": ["e", "f"], "Age": [5, 6.5]})
+    df.extend([])
+
+    assert list(df["Name"]) == ["Xavier", "Atticus", "Claude", "d", "e", "f"]
+    assert list(df["Age"]) == [1, 2, 3, 4, 5, 6.5]
+
+    # a bad row rejects the whole batch
+    for rows in [
+        [["g", 7], ["h"]],
+        [{"Name": "g", "Age": 7}, {"Name": "h", "age": 8}],
+        {"Name": ["g"]},
+        {"Name": ["g", "h"], "Age": [7]},
+    ]:
+        with pytest.raises(ValueError):
+            df.extend(rows)
+        assert len(df) == 6
+
+
+def test_concat():
+    parts = [
+        DF({"a": [i, i + 1], "b": [str(i % 3), "x"], "c": [0.5, i / 2]})
+        for i in range(100)
+    ]
+    for part in parts[::2]:
+        part["b"] = part["b"].astype("category")
+    expected = {c: [v for part in parts for v in part[c]] for c in "abc"}
+
+    df = concat(parts)
+    assert df.shape == (200, 3)
+    assert df["a"].dtype == "int64" and df["c"].dtype == "float64"
+    assert {c: list(df[c]) for c in "abc"} == expected
+
+    df = concat(parts[::2])
+    assert df["b"].dtype == "category"
+    assert list(df["b"]) == [v for part in parts[::2] for v in part["b"]]
+
+    assert concat([]).shape == (0, 0)
+    with pytest.raises(ValueError):
+        concat([parts[0], parts[1][["a", "b"]]])
+
+
 def test_to_csv(tmp_path):
     df = DF(
         {
@@ -341,6 +410,42 @@ def test_to_csv(tmp_path):
         assert rows[2] == {"Name": "Claude", "Age": "3"}
 
 
+def test_sort_values():
+    df = DF(
+        {
+            "Team": ["red", "blue", "red", "blue", "green", "red"],
+            "Score": [3, 1, None, 1, 2, 5],
+            "Name": ["a", "b", "c", "d", "e", "f"],
+        }
+    )
+
+    res = df.sort_values("Score")
+    assert list(res["Name"]) == ["b", "d", "e", "a", "f", "c"]
+
+    res = df.sort_values(["Team", "Score"], ascending=[True, False])
+    assert list(res["Name"]) == ["b", "d", "e", "f", "a", "c"]
+
+    for run_rows in [1, 2, 4, 100]:
+        external = df.sort_values(["Team", "Score"], [True, False], run_rows=run_rows)
+        assert list(external.itertuples()) == list(res.itertuples())
+
+    with pytest.raises(ValueError):
+        df.sort_values(["Team", "Score"], ascending=[True])
+
+    df = DF({"Team": Categorical([None, None]), "Name": ["a", "b"]})
+    assert list(df.sort_values("Team")["Name"]) == ["a", "b"]
+    df = DF({"Team": Categorical([None, "red", "blue"]), "Name": ["a", "b", "c"]})
+    assert list(df.sort_values(["Team", "Name"])["Name"]) == ["c", "b", "a"]
+
+
+def test_nlargest():
+    df = DF({"Score": [3, 1, None, 5, 3, 2], "Name": ["a", "b", "c", "d", "e", "f"]})
+
+    assert list(df.nlargest(3, "Score")["Name"]) == ["d", "a", "e"]
+    assert list(df.nsmallest(2, "Score")["Name"]) == ["b", "f"]
+    assert len(df.nlargest(10, "Score")) == 5
+
+
 def test_read_csv(tmp_path):
     df = DF(
         {
@@ -358,3 +463,422 @@ def test_read_csv(tmp_path):
 
     assert (df["Name"] == df2["Name"]).all()
     assert (df["Age"] == df2["Age"]).all()
+
+
+def test_take():
+    df = DF({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    res = df.take([2, 0, 2])
+    assert (res["a"] == [3, 1, 3]).all()
+    assert (res["b"] == ["z", "x", "z"]).all()
+
+
+def test_groupby_sparse_keys():
+    # only combinations that actually occur should become groups
+    df = DF(
+        {
+            "a": [3, 1, 2, 1],
+            "b": ["z", "x", "y", "x"],
+            "amount": [1, 2, 4, 8],
+        }
+    )
+
+    res = df.groupby("a", "b").count().sum("amount").agg()
+
+    assert res.shape == (3, 4)
+    assert (res["a"] == [1, 2, 3]).all()
+    assert (res["b"] == ["x", "y", "z"]).all()
+    assert (res["count(*)"] == [2, 1, 1]).all()
+    assert (res["sum(amount)"] == [10, 4, 1]).all()
+
+
+def test_groupby_stats():
+    df = DF(
+        {
+            "key": ["b", "a", "b", "a", "b"],
+            "value": [1, 2, 3, 4, 8],
+        }
+    )
+
+    res = df.groupby("key").mean("value").var("value").first("value").last("value")
+    res = res.agg()
+
+    assert res.columns == [
+        "key",
+        "mean(value)",
+        "var(value)",
+        "first(value)",
+        "last(value)",
+    ]
+    assert (res["key"] == ["a", "b"]).all()
+    assert (res["mean(value)"] == [3, 4]).all()
+    assert (res["var(value)"] == [2, 13]).all()
+    assert (res["first(value)"] == [2, 1]).all()
+    assert (res["last(value)"] == [4, 8]).all()
+
+
+def test_groupby_nulls():
+    df = DF(
+        {
+            "key": ["a", "b", "a", "b", "c"],
+            "value": [1.0, None, None, 4.0, None],
+        }
+    )
+
+    res = df.groupby("key").count("value").sum("value").mean("value")
+    res = res.min("value").var("value").first("value").last("value").agg()
+
+    assert list(res["count(value)"]) == [1, 1, 0]
+    assert list(res["sum(value)"]) == [1.0, 4.0, 0]
+    assert list(res["mean(value)"]) == [1.0, 4.0, None]
+    assert list(res["min(value)"]) == [1.0, 4.0, None]
+    assert list(res["var(value)"]) == [None, None, None]
+    assert list(res["first(value)"]) == [1.0, 4.0, None]
+    assert list(res["last(value)"]) == [1.0, 4.0, None]
+
+
+def test_groupby_nan_keys():
+    nan = float("nan")
+    df = DF({"key": [1.0, nan, 0.5, nan, 1.0], "value": [1, 2, 3, 4, 5]})
+
+    res = df.groupby("key").count().sum("value").agg()
+    assert list(res["key"])[:2] == [0.5, 1.0] and math.isnan(res["key"][2])
+    assert list(res["count(*)"]) == [1, 2, 2]
+    assert list(res["sum(value)"]) == [3, 6, 6]
+
+    res = DF({"k": [1.0, nan, nan], "v": [1, 2, 3]}).groupby("k").count().agg()
+    assert len(res) == 2
+
+
+def test_read_csv_dtypes(tmp_path):
+    df = DF(
+        {
+            "Name": ["Xavier", "Atticus", "Claude"],
+            "Age": [1, 2, 3],
+            "Height": [1.5, 1.25, 2.0],
+            "ID": [1, None, 3],
+        }
+    )
+
+    filename = tmp_path / "test_read_csv_dtypes"
+    df.to_csv(filename)
+
+    df2 = read_csv(filename)
+
+    assert df2["Name"].dtype == "object"
+    assert df2["Age"].dtype == "int64"
+    assert df2["Height"].dtype == "float64"
+    assert df2["ID"].dtype == "int64"
+    assert list(df2["ID"]) == [1, None, 3]
+
+
+def test_read_csv_categorical(tmp_path):
+    df = DF(
+        {
+            "Name": ["Xavier", "Atticus", "Claude", "Ada"],
+            "Team": ["red", "blue", "red", "red"],
+            "Score": [1, 2, 3, 4],
+        }
+    )
+
+    filename = tmp_path / "test_read_csv_categorical"
+    df.to_csv(filename)
+
+    df2 = read_csv(filename)
+    assert df2["Name"].dtype == "object"
+    assert df2["Team"].dtype == "category"
+    assert list(df2["Team"]) == list(df["Team"])
+
+    df3 = read_csv(filename, dtype={"Name": "category", "Team": str})
+    assert df3["Name"].dtype == "category"
+    assert df3["Team"].dtype == "object"
+
+    res = df2.groupby("Team").sum("Score").agg()
+    assert list(res["Team"]) == ["blue", "red"]
+    assert list(res["sum(Score)"]) == [2, 8]
+
+    red = df2[df2["Team"] == "red"]
+    assert list(red["Name"]) == ["Xavier", "Claude", "Ada"]
+    assert vstack(red, red)["Team"].dtype == "category"
+
+
+def test_read_csv_chunks(tmp_path):
+    df = DF(
+        {
+            "Name": ["Xavier", "Atticus", "Claude", "Dot", "Eve"],
+            "Age": [1, 2, 3, 4, 5],
+            "Score": [None, None, 1.5, 2.5, None],
+        }
+    )
+
+    filename = tmp_path / "test_read_csv_chunks"
+    df.to_csv(filename)
+
+    chunks = list(read_csv(filename, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert (vstack(*chunks)["Name"] == df["Name"]).all()
+    assert (vstack(*chunks)["Age"] == df["Age"]).all()
+    assert chunks[1]["Score"].dtype == "float64"
+
+
+def test_read_csv_chunks_locked_dtype(tmp_path):
+    df = DF({"ID": [1, 2, 3.5]})
+
+    filename = tmp_path / "test_read_csv_chunks_locked_dtype"
+    df.to_csv(filename)
+
+    with pytest.raises(ValueError):
+        list(read_csv(filename, chunksize=2))
+
+    chunks = list(read_csv(filename, chunksize=2, dtype={"ID": float}))
+    assert (vstack(*chunks)["ID"] == [1.0, 2.0, 3.5]).all()
+    assert chunks[0]["ID"].dtype == "float64"
+
+
+def test_read_csv_usecols(tmp_path):
+    df = DF(
+        {
+            "Name": ["Xavier", "Atticus", "Claude"],
+            "Age": [1, 2, 3],
+            "Score": [1, 2.5, None],
+        }
+    )
+
+    filename = tmp_path / "test_read_csv_usecols"
+    df.to_csv(filename)
+
+    df2 = read_csv(filename, usecols=["Score", "Name"])
+    assert df2.columns == ["Name", "Score"]
+    assert (df2["Score"] == [1.0, 2.5, None]).all()
+    assert type(df2["Score"][0]) == float
+
+    df3 = read_csv(filename, usecols=["Age"], dtype={"Age": "float64"})
+    assert df3.columns == ["Age"]
+    assert df3["Age"].dtype == "float64"
+
+    with pytest.raises(ValueError):
+        read_csv(filename, usecols=["Missing"])
+
+
+def test_read_csv_workers(tmp_path):
+    df = DF(
+        {
+            "Name": [f"name {i}" for i in range(500)],
+            "ID": list(range(500)),
+            # ints early on, floats later; ranges must agree on float
+            "Score": [i if i < 400 else i + 0.5 for i in range(500)],
+        }
+    )
+
+    filename = tmp_path / "test_read_csv_workers"
+    df.to_csv(filename)
+
+    df2 = read_csv(filename, workers=4)
+
+    assert df2.shape == df.shape
+    assert (df2["Name"] == df["Name"]).all()
+    assert (df2["ID"] == df["ID"]).all()
+    assert df2["Score"].dtype == "float64"
+    assert (df2["Score"] == df["Score"]).all()
+
+
+def test_read_csv_workers_quoted_newlines(tmp_path):
+    df = DF(
+        {
+            "Text": [f"line {i}\nstill line {i}" for i in range(200)],
+            "ID": list(range(200)),
+        }
+    )
+
+    filename = tmp_path / "test_read_csv_workers_quoted_newlines"
+    df.to_csv(filename)
+
+    df2 = read_csv(filename, workers=4)
+
+    assert (df2["Text"] == df["Text"]).all()
+    assert (df2["ID"] == df["ID"]).all()
+
+
+def test_read_csv_many_files(tmp_path):
+    DF({"ID": [1, 2], "Score": [1, 2]}).to_csv(tmp_path / "part0.csv")
+    DF({"ID": [3, 4], "Score": [3.5, 4]}).to_csv(tmp_path / "part1.csv")
+
+    for workers in [None, 2]:
+        df = read_csv(str(tmp_path / "part*.csv"), workers=workers)
+
+        assert (df["ID"] == [1, 2, 3, 4]).all()
+        assert df["Score"].dtype == "float64"
+        assert (df["Score"] == [1.0, 2.0, 3.5, 4.0]).all()
+
+
+def make_join_dfs():
+    left = DF(
+        {
+            "id": [1, 2, 3, 2],
+            "tag": ["a", "b", "c", "d"],
+            "value": [10, 20, 30, 40],
+        }
+    )
+    right = DF(
+        {
+            "id": [2, 4, 1],
+            "value": [200, 400, 100],
+        }
+    )
+
+    return left, right
+
+
+def test_merge():
+    left, right = make_join_dfs()
+
+    res = left.merge(right, on="id")
+    assert res.columns == ["id", "tag", "value_x", "value_y"]
+    assert (res["id"] == [1, 2, 2]).all()
+    assert (res["tag"] == ["a", "b", "d"]).all()
+    assert (res["value_y"] == [100, 200, 200]).all()
+
+    res = left.merge(right, on="id", how="left")
+    assert (res["id"] == [1, 2, 3, 2]).all()
+    assert (res["value_y"] == [100, 200, None, 200]).all()
+
+    res = left.merge(right, on="id", how="right")
+    assert (res["id"] == [2, 2, 4, 1]).all()
+    assert (res["tag"] == ["b", "d", None, "a"]).all()
+
+    res = left.merge(right, on="id", how="outer", suffixes=("_l", "_r"))
+    assert (res["id"] == [1, 2, 3, 2, 4]).all()
+    assert (res["value_l"] == [10, 20, 30, 40, None]).all()
+    assert (res["value_r"] == [100, 200, None, 200, 400]).all()
+
+
+def test_merge_build_side():
+    # the same result whichever side the hash table is built on
+    left, right = make_join_dfs()
+    big_right = vstack(right, right)
+
+    res = left.merge(big_right, on="id", how="left")
+    assert (res["id"] == [1, 1, 2, 2, 3, 2, 2]).all()
+    assert (res["value_y"] == [100, 100, 200, 200, None, 200, 200]).all()
+
+
+def test_merge_multiple_keys():
+    left = DF({"a": [1, 1, 2], "b": ["x", "y", "x"], "l": [1, 2, 3]})
+    right = DF({"a": [1, 2, 2], "b": ["y", "x", "y"], "r": [4, 5, 6]})
+
+    res = left.merge(right, on=["a", "b"])
+    assert (res["a"] == [1, 2]).all()
+    assert (res["b"] == ["y", "x"]).all()
+    assert (res["l"] == [2, 3]).all()
+    assert (res["r"] == [4, 5]).all()
+
+
+def test_merge_partitioned():
+    left, right = make_join_dfs()
+
+    for how in ["inner", "left", "right", "outer"]:
+        expected = left.merge(right, on="id", how=how)
+        res = left.merge(right, on="id", how=how, partitions=3)
+
+        assert res.columns == expected.columns
+        assert sorted(zip(*res.values()), key=repr) == sorted(
+            zip(*expected.values()), key=repr
+        )
+
+
+def test_itertuples():
+    df = DF(
+        {
+            "Name": ["Xavier", "Atticus"],
+            "Age": [1, 2],
+        }
+    )
+
+    assert list(df.itertuples()) == [("Xavier", 1), ("Atticus", 2)]
+
+
+def test_str():
+    df = DF(
+        {
+            "Item": ["Red onion", "Carrots"],
+            "Price": [1.08, 2.32],
+        }
+    )
+
+    assert str(df) == "\n".join(
+        [
+            "| Item      | Price |",
+            "| --------- | ----- |",
+            "| Red onion | 1.08  |",
+            "| Carrots   | 2.32  |",
+        ]
+    )
+
+
+def test_row_views():
+    df = DF({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    head = df[:2]
+    subset = df[df["a"] > 1]
+
+    df.append([4, "w"])
+    df["a"][0] = 0
+
+    assert (head["a"] == [1, 2]).all()
+    assert (subset["b"] == ["y", "z"]).all()
+
+    subset["a"][0] = 5
+    assert (df["a"] == [0, 2, 3, 4]).all()
+
+
+def test_describe():
+    df = DF(
+        {
+            "name": ["a", "b", "c", "d", "e"],
+            "x": [4, 1, None, 3, 2],
+            "y": [0.5, 2.5, 1.5, 4.5, 3.5],
+            "flag": [True, False, True, True, False],
+        }
+    )
+
+    described = df.describe()
+    assert described.columns == ["statistic", "x", "y"]
+    assert list(described["statistic"]) == [
+        "count",
+        "mean",
+        "std",
+        "min",
+        "25%",
+        "50%",
+        "75%",
+        "max",
+    ]
+    assert described["x"].dtype == "float64"
+    assert list(described["x"]) == [
+        4.0,
+        2.5,
+        pytest.approx(math.sqrt(5 / 3)),
+        1.0,
+        1.75,
+        2.5,
+        3.25,
+        4.0,
+    ]
+    assert list(described["y"])[4:7] == [1.5, 2.5, 3.5]
+
+    empty = DF({"x": Vec([None, None], "int64")}).describe()
+    assert list(empty["x"]) == [0.0, None, None, None, None, None, None, None]
+
+
+def test_groupby_median():
+    df = DF(
+        {
+            "key": ["a", "b", "a", "a", "b", "c", "a"],
+            "value": [4, 10, 1, None, 20, None, 2],
+        }
+    )
+
+    result = df.groupby("key").median("value").quantile("value", 0.75).agg()
+    assert list(result["median(value)"]) == [2.0, 15.0, None]
+    assert list(result["quantile(value, 0.75)"]) == [3.0, 17.5, None]
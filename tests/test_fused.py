@@ -0,0 +1,108 @@
+import operator
+
+import pytest
+
+from mini_pandas import fused
+from mini_pandas.df import DF
+from mini_pandas.expr import BinOp, Col, Lit, col, parse
+from mini_pandas.vec import Mask
+
+
+def make_df():
+    return DF(
+        {
+            "Price": [1.0, 2.5, None, 4.0, 6.0],
+            "Tax": [0.5, 0.5, 1.0, None, 1.0],
+            "Qty": [1, 2, 3, 4, 5],
+            "Name": ["a", "b", "c", "d", "e"],
+            "Team": ["red", "blue", "red", "red", "blue"],
+        }
+    )
+
+
+def test_parse():
+    tree = parse("Price * 1.1 + Tax > 5")
+    assert repr(tree) == "(((Price * 1.1) + Tax) > 5)"
+
+    tree = parse("1 < Qty <= 3 and not Name == 'b'")
+    assert repr(tree) == "(((1 < Qty) & (Qty <= 3)) & ~(Name == 'b'))"
+
+    tree = parse("abs(-col('My Column')) % 2")
+    assert repr(tree) == "(abs(-My Column) % 2)"
+
+    assert isinstance(parse("Qty"), Col) and isinstance(parse("None"), Lit)
+    assert isinstance(parse("Qty == 1"), BinOp) and parse("Qty == 1").op is operator.eq
+
+    for source in ["Qty ** 2", "Qty[0]", "f(Qty)", "Qty in [1, 2]"]:
+        with pytest.raises(ValueError):
+            parse(source)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "Price * 1.1 + Tax > 5",
+        "Price * 1.1 + Tax",
+        "-Qty % 3 + abs(Qty - 4)",
+        "(Qty > 1) & (Qty < 5) | (Qty == 5)",
+        "not Qty > 2",
+        "Name + Team",
+        "Team == 'red' or Price == None",
+        "2 / Qty",
+    ],
+)
+def test_matches_unfused(source):
+    df = make_df()
+
+    result = df.eval(source)
+    expected = parse(source).evaluate(df)
+
+    assert list(result) == list(expected)
+    assert result.dtype == expected.dtype
+
+
+def test_eval():
+    df = make_df()
+
+    assert isinstance(df.eval("Qty > 2"), Mask)
+    assert list(df.eval("Price + Tax")) == [1.5, 3.0, None, None, 7.0]
+    assert df.eval("1 + 2") == 3
+
+    df["Team"] = df["Team"].astype("category")
+    assert list(df.eval("Team != 'red'")) == [False, True, False, False, True]
+
+
+def test_literal_on_left_with_nulls():
+    df = make_df()
+
+    assert list(df.eval("5 - Price")) == [4.0, 2.5, None, 1.0, -1.0]
+    assert list(df.eval("10 / Tax")) == [20.0, 20.0, 10.0, None, 10.0]
+    assert list(df.eval("2 < Price")) == [False, True, False, True, True]
+    assert list(df.eval("2 < Price")) == list(df.eval("Price > 2"))
+    assert list(df.query("2 < Price")["Name"]) == ["b", "d", "e"]
+    assert list(df.query("1 >= Tax and 3 < 4 * Price")["Name"]) == ["a", "b", "e"]
+
+
+def test_query():
+    df = make_df()
+
+    res = df.query("Price * 2 > 4 and Team == 'red'")
+    assert list(res["Name"]) == ["d"]
+    assert list(df[(col("Qty") >= 4) | (col("Name") == "a")]["Name"]) == ["a", "d", "e"]
+
+    # indexed terms still narrow the rows first
+    df.create_index("Qty", "sorted")
+    assert list(df.query("Qty > 3 and Price < 5")["Name"]) == ["d"]
+
+
+def test_kernel_cache():
+    df = make_df()
+    fused._kernel.cache_clear()
+
+    df.eval("Qty * 2 > 3")
+    df.eval("Qty * 5 > 1")
+    df.query("Qty * 5 > 1")
+
+    # constants are parameters, so all three share one kernel
+    info = fused._kernel.cache_info()
+    assert info.misses == 1 and info.hits == 2
@@ -0,0 +1,88 @@
+import pytest
+
+from mini_pandas.df import DF
+from mini_pandas.expr import col
+from mini_pandas.index import HashIndex, SortedIndex
+
+
+def people():
+    return DF(
+        {
+            "ID": [5, 3, 8, None, 3, 1],
+            "Name": ["a", "b", "c", "d", "e", "f"],
+        }
+    )
+
+
+@pytest.mark.parametrize("kind", ["hash", "sorted"])
+def test_lookups(kind):
+    df = people()
+    df.create_index("ID", kind)
+    kinds = {"hash": HashIndex, "sorted": SortedIndex}
+    assert isinstance(df.indexes["ID"], kinds[kind])
+
+    assert list(df[df["ID"] == 3]["Name"]) == ["b", "e"]
+    assert list(df[col("ID") == 3]["Name"]) == ["b", "e"]
+    assert list(df[(col("ID") == 3) & (col("Name") != "b")]["Name"]) == ["e"]
+    assert list(df[col("ID") == 4]["Name"]) == []
+    assert list(df[col("ID") == None]["Name"]) == ["d"]  # noqa: E711
+
+    if kind == "sorted":
+        assert list(df[col("ID") > 3]["Name"]) == ["a", "c"]
+        assert list(df[3 >= col("ID")]["Name"]) == ["b", "e", "f"]
+
+
+def test_loc():
+    df = people()
+    df.set_index("ID", "sorted")
+
+    assert list(df.loc[3]["Name"]) == ["b", "e"]
+    assert list(df.loc[[8, 1]]["Name"]) == ["c", "f"]
+    assert list(df.loc[3:5]["Name"]) == ["a", "b", "e"]
+    assert list(df.loc[:2]["Name"]) == ["f"]
+
+    with pytest.raises(KeyError):
+        df.loc[4]
+
+    df.set_index("Name")
+    assert list(df.loc["c"]["ID"]) == [8]
+    assert list(df.loc["b":"d"]["ID"]) == [3, 8, None]
+
+    with pytest.raises(KeyError):
+        people().loc[3]
+
+
+def test_maintenance():
+    df = people()
+    df.create_index("ID", "sorted")
+    df.create_index("Name")
+
+    df.append([3, "g"])
+    df.append({"ID": 0, "Name": "a"})
+    assert set(df.indexes) == {"ID", "Name"}
+    assert list(df[col("ID") == 3]["Name"]) == ["b", "e", "g"]
+    assert list(df[col("ID") < 2]["Name"]) == ["f", "a"]
+    assert list(df[col("Name") == "a"]["ID"]) == [5, 0]
+
+    # modifying a column any other way drops its index
+    df["ID"][0] = 3
+    assert set(df.indexes) == {"Name"}
+    assert list(df[col("ID") == 3]["Name"]) == ["a", "b", "e", "g"]
+
+    df.set_index("ID")
+    df["ID"][1] = 7
+    assert list(df.loc[3]["Name"]) == ["a", "e", "g"]
+
+
+def test_append_incomparable():
+    df = people()
+    df.create_index("ID", "sorted")
+    df.create_index("Name")
+
+    # a str can't be placed among the int keys, so the ID index is dropped, but
+    # the row is still appended and the Name index kept
+    df.append(["x", "g"])
+    assert len(df) == 7
+    assert set(df.indexes) == {"Name"}
+    assert list(df[col("ID") == "x"]["Name"]) == ["g"]
+    assert list(df[col("Name") == "g"]["ID"]) == ["x"]
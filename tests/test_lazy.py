@@ -0,0 +1,145 @@
+import pytest
+
+from mini_pandas import lazy as lazy_module
+from mini_pandas.df import DF, read_csv
+from mini_pandas.lazy import col, scan_csv
+
+
+def make_df():
+    return DF(
+        {
+            "Item": ["Red onion", "Carrots", "Paprika", "Cheese", "Potatoes", "Milk"],
+            "Category": [
+                "Vegetables",
+                "Vegetables",
+                "Spices",
+                "Dairy",
+                "Vegetables",
+                "Dairy",
+            ],
+            "Price": [1.08, 2.32, 1.55, 4.89, 3.40, 2.99],
+        }
+    )
+
+
+def test_collect():
+    df = make_df()
+
+    res = (
+        df.lazy()
+        .filter(col("Price") > 1.5)
+        .filter(col("Category") != "Spices")
+        .select("Category", "Price")
+        .groupby("Category")
+        .count()
+        .sum("Price")
+        .agg()
+        .collect()
+    )
+
+    expected = (
+        df[(df["Price"] > 1.5) & (df["Category"] != "Spices")]
+        .groupby("Category")
+        .count()
+        .sum("Price")
+        .agg()
+    )
+
+    assert res.columns == ["Category", "count(*)", "sum(Price)"]
+    for c in res.columns:
+        assert (res[c] == expected[c]).all()
+
+
+def test_optimized_plan():
+    df = make_df()
+
+    plan = (
+        df.lazy()
+        .select("Item", "Price")
+        .filter(col("Price") > 2)
+        .filter(col("Price") < 4)
+        .select("Item")
+        .optimized_plan()
+    )
+
+    assert plan.explain() == "\n".join(
+        [
+            "Select ['Item']",
+            "  Select ['Item', 'Price']",
+            "    Filter ((Price > 2) & (Price < 4))",
+            "      Scan DF columns=['Item', 'Price']",
+        ]
+    )
+
+
+def test_groupby_key_filter_pushdown():
+    df = make_df()
+
+    lazy = df.lazy().groupby("Category").max("Price").agg()
+    lazy = lazy.filter(col("Category") == "Dairy")
+
+    plan = lazy.optimized_plan()
+    assert plan.explain().splitlines()[1].strip().startswith("Filter")
+
+    res = lazy.collect()
+    assert (res["max(Price)"] == [4.89]).all()
+
+
+def test_scan_csv_pushdown(tmp_path, capsys):
+    df = make_df()
+    filename = tmp_path / "groceries.csv"
+    df.to_csv(filename)
+
+    lazy = scan_csv(filename).filter(col("Price") > 2).select("Item")
+    lazy.explain()
+
+    out = capsys.readouterr().out
+    assert "Scan CSV" in out
+    assert "columns=['Item', 'Price']" in out
+    assert "predicate=(Price > 2)" in out
+
+    res = lazy.collect()
+    assert res.columns == ["Item"]
+    assert (res["Item"] == ["Carrots", "Cheese", "Potatoes", "Milk"]).all()
+
+
+def test_scan_csv_pushdown_widens_dtypes(tmp_path, monkeypatch):
+    monkeypatch.setattr(lazy_module, "SCAN_CHUNKSIZE", 4)
+
+    filename = tmp_path / "values.csv"
+    df = DF(
+        {
+            "k": ["a", "b"] * 5,
+            # only turns float after the first chunk
+            "v": [1, 2, 3, 4, 5, 6, 7, 8, 9.5, 10],
+        }
+    )
+    df.to_csv(filename)
+
+    res = scan_csv(filename).filter(col("k") == "b").collect()
+    assert res["v"].dtype == read_csv(filename)["v"].dtype == "float64"
+    assert (res["v"] == [2.0, 4.0, 6.0, 8.0, 10.0]).all()
+
+
+def test_scan_csv_usecols(tmp_path):
+    filename = tmp_path / "groceries.csv"
+    make_df().to_csv(filename)
+
+    lazy = scan_csv(filename, usecols=["Item", "Price"])
+    assert lazy.collect().columns == ["Item", "Price"]
+
+    res = lazy.filter(col("Price") > 2).select("Item").collect()
+    assert list(res["Item"]) == ["Carrots", "Cheese", "Potatoes", "Milk"]
+
+    res = scan_csv(filename, workers=2).filter(col("Price") > 2).collect()
+    assert len(res) == 4
+
+    with pytest.raises(ValueError):
+        scan_csv(filename, chunksize=10)
+
+
+def test_reflected_expression():
+    df = make_df()
+
+    res = df.lazy().filter(2 < col("Price")).collect()
+    assert len(res) == 4
@@ -0,0 +1,116 @@
+import math
+
+import pytest
+
+from mini_pandas.df import DF
+from mini_pandas.expr import col
+from mini_pandas.parallel import Engine
+
+DF_VALUES = {
+    "Team": ["red", "blue", "red", "green", "blue", "red", "red", "blue", "green"],
+    "Score": [3, 1, 4, 1, 5, 9, 2, 6, 5],
+    "Time": [1.5, None, 2.5, 0.5, 3.0, 1.0, None, 2.0, 4.5],
+}
+
+
+def run(engine):
+    df = DF(DF_VALUES)
+
+    return {
+        "filter": list(engine.filter(df, col("Score") > 2).itertuples()),
+        "apply": list(engine.apply(df["Score"], str)),
+        "isnull": list(engine.isnull(df["Time"])),
+        "fillna": list(engine.fillna(df["Time"], 0.0)),
+        "reductions": [
+            engine.sum(df["Score"]),
+            engine.min(df["Score"]),
+            engine.max(df["Score"]),
+            engine.mean(df["Score"]),
+            engine.sum(df["Time"]),
+            engine.min(df["Time"]),
+            engine.mean(df["Time"]),
+        ],
+        "groupby": list(
+            engine.groupby(df, "Team")
+            .count()
+            .count("Time")
+            .sum("Score")
+            .min("Score")
+            .max("Score")
+            .mean("Score")
+            .var("Score")
+            .first("Score")
+            .last("Score")
+            .mean("Time")
+            .var("Time")
+            .min("Time")
+            .first("Time")
+            .agg()
+            .itertuples()
+        ),
+    }
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_modes_match_serial(mode):
+    expected = run(Engine(mode="serial", partition_rows=2))
+
+    with Engine(workers=2, mode=mode, partition_rows=2) as engine:
+        assert run(engine) == expected
+
+
+@pytest.mark.parametrize("partition_rows", [1, 4, 100])
+def test_matches_df(partition_rows):
+    df = DF(DF_VALUES)
+    results = run(Engine(mode="serial", partition_rows=partition_rows))
+
+    assert results["filter"] == list(df[col("Score") > 2].itertuples())
+    assert results["apply"] == list(df["Score"].apply(str))
+    assert results["isnull"] == list(df["Time"].isnull())
+    assert results["fillna"] == list(df["Time"].fillna(0.0))
+    assert results["reductions"] == [36, 1, 9, 4.0, 15.0, 0.5, 15.0 / 7]
+
+    expected = (
+        df.groupby("Team")
+        .count()
+        .count("Time")
+        .sum("Score")
+        .min("Score")
+        .max("Score")
+        .mean("Score")
+        .var("Score")
+        .first("Score")
+        .last("Score")
+        .mean("Time")
+        .var("Time")
+        .min("Time")
+        .first("Time")
+        .agg()
+    )
+    for row, expected_row in zip(results["groupby"], expected.itertuples()):
+        for value, expected_value in zip(row, expected_row):
+            if isinstance(expected_value, float):
+                assert math.isclose(value, expected_value)
+            else:
+                assert value == expected_value
+
+
+def test_empty():
+    engine = Engine(mode="serial")
+    df = DF({"a": [], "b": []})
+
+    assert len(engine.filter(df, col("a") > 1)) == 0
+    assert len(engine.apply(df["a"], str)) == 0
+    assert engine.sum(df["a"]) == 0
+    assert len(engine.groupby(df, "a").sum("b").agg()) == 0
+
+
+def test_groupby_nan_keys():
+    nan = float("nan")
+    df = DF({"key": [nan, 1.0, nan, nan, 1.0], "value": [1, 2, 3, 4, 5]})
+
+    with Engine(workers=2, mode="process", partition_rows=2) as engine:
+        res = engine.groupby(df, "key").sum("value").agg()
+
+    assert res["key"][0] == 1.0 and math.isnan(res["key"][1])
+    assert list(res["sum(value)"]) == [7, 8]
@@ -0,0 +1,54 @@
+import pytest
+
+import mini_pandas
+from mini_pandas import df as df_module
+from mini_pandas.df import DF
+from mini_pandas.vec import Vec
+
+
+def test_profile():
+    df = DF({"key": ["a", "b", "a", "c"], "value": [1, 2, 3, 4]})
+    originals = dict(vars(Vec)), dict(vars(DF)), df_module.read_csv
+
+    calls = []
+    with mini_pandas.profile(hooks=[calls.append]) as p:
+        big = df[df["value"] > 1]
+        big.groupby("key").sum("value").agg()
+
+    # everything is put back
+    assert (dict(vars(Vec)), dict(vars(DF)), df_module.read_csv) == originals
+
+    assert p.stats["Vec.__gt__"].calls == 1
+    assert p.stats["Vec.__gt__"].rows_in == 4 and p.stats["Vec.__gt__"].rows_out == 4
+    assert p.stats["GroupBy.agg"].rows_out == 3
+    assert p.stats["DF.groupby"].peak_bytes > 0
+
+    stats = p.stats["DF.__getitem__"]
+    assert stats.own <= stats.total
+
+    # hooks see every call, nested ones at a greater depth
+    assert len(calls) == sum(s.calls for s in p.stats.values())
+    gt = next(call for call in calls if call.name == "Vec.__gt__")
+    assert gt.depth == 0 and any(call.depth > 0 for call in calls)
+
+    report = p.to_df()
+    assert report.columns[:3] == ["operation", "calls", "total"]
+    assert list(report["total"]) == sorted(report["total"], reverse=True)
+    assert "GroupBy.agg" in p.report()
+    assert len(p.to_df(sort="calls")) == len(p.stats)
+
+
+def test_profile_options():
+    df = DF({"a": [1, 2, 3]})
+
+    with mini_pandas.profile(memory=False) as p:
+        with pytest.raises(RuntimeError):
+            with mini_pandas.profile():
+                pass
+
+        with pytest.raises(KeyError):
+            df["missing"]
+
+    assert p.stats["DF.__getitem__"].calls == 1
+    assert p.stats["DF.__getitem__"].peak_bytes == 0
+    assert not hasattr(vars(DF)["__getitem__"], "__wrapped__")
@@ -0,0 +1,61 @@
+import math
+import random
+
+import pytest
+
+from mini_pandas import selection
+
+
+def test_select():
+    rng = random.Random(0)
+    for n in [1, 2, 10, 100, 1000, 20000]:
+        for spread in [2, 10, n * 10]:
+            values = [rng.randrange(spread) for _ in range(n)]
+            original = list(values)
+            ranks = [rng.randrange(n) for _ in range(rng.randrange(1, 6))]
+
+            found = selection.select(values, ranks)
+            expected = sorted(values)
+            assert found == {k: expected[k] for k in ranks}
+            assert values == original
+
+
+def test_select_ordered_input():
+    # no pivot sample can be unluckier than a sorted or reversed run
+    for values in [list(range(5000)), list(range(5000, 0, -1)), [7] * 5000]:
+        expected = sorted(values)
+        ranks = [0, 1, 2499, 2500, 4999]
+        assert selection.select(values, ranks) == {k: expected[k] for k in ranks}
+
+
+def test_quantiles():
+    values = [3, 1, 4, 1, 5, 9, 2, 6]
+    assert selection.quantiles(values, [0, 0.5, 1]) == [1.0, 3.5, 9.0]
+    # interpolated between 1 and 2, at position 0.25 * 7 = 1.75
+    assert selection.quantiles(values, [0.25]) == [1.75]
+    assert selection.quantiles([], [0.5, 0.9]) == [None, None]
+
+    rng = random.Random(1)
+    values = [rng.random() for _ in range(10001)]
+    expected = sorted(values)
+    assert selection.quantiles(values, [0.1, 0.5, 0.9]) == [
+        expected[1000],
+        expected[5000],
+        expected[9000],
+    ]
+
+    with pytest.raises(ValueError):
+        selection.quantiles(values, [1.5])
+
+
+def test_quantiles_interpolation():
+    rng = random.Random(2)
+    values = [rng.uniform(-10, 10) for _ in range(999)]
+    expected = sorted(values)
+    for q in [0.0, 0.001, 0.3, 0.777, 1.0]:
+        position = q * 998
+        below = expected[math.floor(position)]
+        above = expected[math.ceil(position)]
+        assert selection.quantiles(values, [q]) == [
+            below + (above - below) * (position - math.floor(position))
+        ]
@@ -1,6 +1,9 @@
+import json
 import math
 
-from mini_pandas.vec import Vec
+import pytest
+
+from mini_pandas.vec import Categorical, Mask, Vec, concat
 
 
 def test_add():
@@ -100,6 +103,98 @@ def test_boolean_ops():
     assert ((evens ^ middle) == [False, False, True, True]).all()
 
 
+def test_masks():
+    v1 = Vec([1, 2, 3, 4, 5])
+
+    evens = v1 % 2 == 0
+    big = v1 > 2
+    assert isinstance(evens, Mask) and isinstance(big, Mask)
+    assert isinstance(evens & big, Mask) and isinstance(~evens, Mask)
+    assert isinstance(evens & Vec([True] * 5), Mask)
+
+    assert ((evens & big) == [False, False, False, True, False]).all()
+    assert ((~evens | big) == [True, False, True, True, True]).all()
+    assert (evens & big).indices() == [3]
+    assert big.sum() == 3 and big.any() and not big.all()
+
+    assert (v1[big] == [3, 4, 5]).all()
+    assert (v1[Mask([True, False, False, False, True])] == [1, 5]).all()
+    assert (big[1:4] == [False, True, True]).all()
+    assert (big.take([4, 0]) == [True, False]).all()
+
+    big.append(False)
+    assert len(big) == 6 and big[-1] is False
+    big.append(None)
+    assert big.dtype == "object" and big[-1] is None
+
+
+def test_categorical():
+    values = ["a", "b", "a", None, "c", "a"]
+    v1 = Vec(values).astype("category")
+
+    assert isinstance(v1, Categorical) and v1.dtype == "category"
+    assert v1.categories == ["a", "b", "c"]
+    assert (v1.codes == [0, 1, 0, -1, 2, 0]).all()
+    assert list(v1) == values and v1[3] is None
+
+    assert ((v1 == "a") == [x == "a" for x in values]).all()
+    assert ((v1 != "b") == [x != "b" for x in values]).all()
+    assert not (v1 == "z").any()
+    assert (v1.isnull() == [x is None for x in values]).all()
+    assert list(v1[~v1.isnull()].distinct()) == ["a", "b", "c"]
+
+    # views share codes until either side is modified
+    view = v1[1:4]
+    view[0] = "d"
+    assert list(view) == ["d", "a", None]
+    assert list(v1) == values and v1.categories == ["a", "b", "c"]
+
+    v1.append([1])
+    assert v1.dtype == "object"
+    assert list(v1) == values + [[1]]
+
+
+def test_argsort():
+    v1 = Vec([3, None, 1, 3, math.nan, 2])
+
+    assert list(v1.argsort()) == [2, 5, 0, 3, 1, 4]
+    assert list(v1.argsort(ascending=False)) == [0, 3, 5, 2, 1, 4]
+
+    v2 = Vec(["b", "c", None, "a", "b"]).astype("category")
+    assert list(v2.argsort()) == [3, 0, 4, 1, 2]
+
+
+def test_nulls():
+    v1 = Vec([1, None, 3, None])
+    v2 = Vec([10, 20, None, 40])
+    assert v1.dtype == "int64" and list(v1) == [1, None, 3, None]
+    assert None in v1 and 0 not in v1
+
+    # nulls propagate through arithmetic, and compare as None does
+    assert list(v1 + v2) == [11, None, None, None]
+    assert list(-v1) == [-1, None, -3, None]
+    assert list(v1 / Vec([2, 0, 1, 0])) == [0.5, None, 3.0, None]
+    assert list(v1 > 2) == [False, False, True, False]
+    assert list(v1 != 3) == [True, True, False, True]
+    assert list(v1 == None) == [False, True, False, True]  # noqa: E711
+
+    assert list(v1.isnull()) == [False, True, False, True]
+    assert list(v1.dropna()) == [1, 3] and v1.dropna()._valid is None
+    assert v1.fillna(0).dtype == "int64" and list(v1.fillna(0)) == [1, 0, 3, 0]
+    assert v1.sum() == 4 and v1.mean() == 2.0 and v1.count() == 2
+    assert v1.min() == 1 and v1.max() == 3
+
+    # views and modifications keep the validity in step with the values
+    assert list(v1[1:3]) == [None, 3] and list(v1.take([3, 0])) == [None, 1]
+    v1[1] = 2
+    v1[2] = None
+    v1.insert(0, None)
+    del v1[-1]
+    assert list(v1) == [None, 1, 2, None]
+    v1[0] = "x"
+    assert v1.dtype == "object" and list(v1) == ["x", 1, 2, None]
+
+
 def test_distinct():
     v1 = Vec([5, 5, 4, 4, 3, 3, 2, 2, 1, 1])
 
@@ -123,3 +218,168 @@ def test_fillna():
     v2 = v1.fillna(-1)
 
     assert (v2 == [0, -1, -1, "", False]).all()
+
+
+def test_take():
+    v1 = Vec([10, 20, 30])
+
+    assert (v1.take([2, 0, 0]) == [30, 10, 10]).all()
+
+
+def test_dtype():
+    assert Vec([1, 2, 3]).dtype == "int64"
+    assert Vec([1.5, 2.0]).dtype == "float64"
+    assert Vec([True, False]).dtype == "bool"
+    assert Vec([1, None]).dtype == "int64"
+    assert Vec([None, None]).dtype == "object"
+    assert Vec(["a", "b"]).dtype == "object"
+    assert Vec([2**70]).dtype == "object"
+
+    assert Vec([True, False])[0] is True
+    assert (Vec([1, 2, 3]) > 1).dtype == "bool"
+
+
+def test_upcast():
+    v1 = Vec([1, 2, 3])
+
+    v1.append(4)
+    assert v1.dtype == "int64"
+
+    # None is stored as a null, without upcasting
+    v1.append(None)
+    assert v1.dtype == "int64"
+    assert v1[-1] is None
+    assert (v1[:4] == [1, 2, 3, 4]).all()
+
+    v2 = Vec([1, 2])
+    v2[0] = 0.5
+    assert v2.dtype == "object"
+    assert (v2 == [0.5, 2]).all()
+
+
+def test_astype():
+    v1 = Vec([1, 2, 3])
+
+    v2 = v1.astype("float64")
+    assert v2.dtype == "float64"
+    assert type(v2[0]) == float
+    assert (v2 == [1.0, 2.0, 3.0]).all()
+
+
+def test_views():
+    for values in [[1, 2, 3, 4], ["a", "b", "c", "d"]]:
+        v1 = Vec(values)
+
+        view = v1[1::2]
+        assert (view == values[1::2]).all()
+        assert (view[::-1] == values[1::2][::-1]).all()
+
+        selection = v1[Vec([True, False, True, True])]
+        assert (selection == [values[0], values[2], values[3]]).all()
+        assert (selection[1:] == values[2:]).all()
+
+        # copy-on-write, in either direction
+        view[0] = values[0]
+        assert (v1 == values).all()
+        assert (view == [values[0], values[3]]).all()
+
+        v1[2] = values[0]
+        v1.append(values[0])
+        assert (selection == [values[0], values[2], values[3]]).all()
+
+
+def test_quantile():
+    v1 = Vec([5, None, 1, 3, 2, 4])
+    assert v1.median() == 3.0
+    assert v1.quantile(0.25) == 2.0
+    q = v1.quantile([0, 0.1, 1])
+    assert q.dtype == "float64"
+    assert (q == [1.0, 1.4, 5.0]).all()
+
+    assert Vec([1.5, math.nan, 0.5]).median() == 1.0
+    assert Vec([], "float64").median() is None
+    assert Vec([None], "int64").quantile([0.5])[0] is None
+
+    with pytest.raises(ValueError):
+        v1.quantile(-0.1)
+
+
+def test_var():
+    v1 = Vec([2, None, 4, 4, 4, 5, 5, 7, 9])
+    assert v1.var() == pytest.approx(32 / 7)
+    assert v1.std() == pytest.approx(math.sqrt(32 / 7))
+    assert Vec([1.0]).var() is None and Vec([1.0]).std() is None
+
+    # one pass, which stays accurate for values far from 0
+    assert v1[::2]._summary() == (5, 4.8, pytest.approx(26.8), 2, 9)
+    assert Vec([1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16]).var() == 30
+    assert Vec([], "float64")._summary() == (0, None, 0.0, None, None)
+
+    v1.append(100)
+    assert v1.var() == pytest.approx(Vec([2, 4, 4, 4, 5, 5, 7, 9, 100]).var())
+
+
+def test_concat_strided():
+    v1 = Vec([1, 2, 3, 4, 5])
+    v2 = concat([v1[::2], v1, v1[::-1]])
+    assert (v2 == [1, 3, 5, 1, 2, 3, 4, 5, 5, 4, 3, 2, 1]).all()
+
+    c1 = Categorical(["x", "y", "x", "z"])
+    c2 = concat([c1[1::2], c1])
+    assert c2.dtype == "category"
+    assert (c2 == ["y", "z", "x", "y", "x", "z"]).all()
+
+
+def test_tolist():
+    for v1, expected in [
+        (Vec([1, None, 3]), [1, None, 3]),
+        (Vec([1.5, 2.5]), [1.5, 2.5]),
+        (Vec([1, 2]) > 1, [False, True]),
+        (Categorical(["a", None, "a"]), ["a", None, "a"]),
+    ]:
+        values = v1.tolist()
+        assert type(values) == list and values == expected
+        assert json.loads(json.dumps(values)) == expected
+
+
+def test_result_dtypes():
+    v1 = Vec([1, 2, 3])
+    assert (v1 + 1).dtype == "int64"
+    assert (v1 / 2).dtype == "float64"
+    assert (v1 * 0.5).dtype == "float64"
+    assert (-Vec([True, False])).dtype == "int64"
+    assert isinstance(v1 == 2, Mask)
+    assert (Vec([1, None]) + 1).dtype == "int64"
+
+    # ints that overflow int64 become Python ints in an object column
+    big = Vec([2**62, 1]) * 4
+    assert big.dtype == "object"
+    assert list(big) == [2**64, 4]
+
+
+def test_categorical_new_categories_not_shared():
+    c1 = Categorical(["a", "b"])
+    view = c1[:1]
+    copied = Categorical(c1)
+
+    c1.extend(["c", "d"])
+    c1.append("e")
+    view.append("x")
+    copied.append("y")
+
+    assert c1.categories == ["a", "b", "c", "d", "e"]
+    assert view.categories == ["a", "b", "x"]
+    assert copied.categories == ["a", "b", "y"]
+    assert list(c1) == ["a", "b", "c", "d", "e"]
+    assert list(view) == ["a", "x"]
+    assert list(copied) == ["a", "b", "y"]
+    assert (c1 == "e").indices() == [4] and (view == "x").indices() == [1]
+
+
+def test_categorical_argsort_nulls():
+    assert list(Categorical([None]).argsort()) == [0]
+    assert list(Categorical([None, None]).argsort(ascending=False)) == [0, 1]
+
+    c = Categorical(["b", None, "a", "b"])
+    assert list(c.argsort()) == [2, 0, 3, 1]
+    assert list(c.argsort(ascending=False)) == [0, 3, 2, 1]
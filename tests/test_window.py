@@ -0,0 +1,89 @@
+import math
+import random
+import statistics
+
+import pytest
+
+from mini_pandas.df import DF
+from mini_pandas.vec import Vec
+
+
+def naive(values, window, min_periods, stat):
+    """Each row's statistic, from a slice of its window."""
+    results = []
+    for i in range(len(values)):
+        start = 0 if window is None else max(i - window + 1, 0)
+        present = [v for v in values[start : i + 1] if v is not None]
+        if stat == "count":
+            results.append(len(present))
+        elif len(present) < max(min_periods, 1):
+            results.append(None)
+        elif stat in ("var", "std"):
+            if len(present) < 2:
+                results.append(None)
+            else:
+                var = statistics.variance(present)
+                results.append(var if stat == "var" else math.sqrt(var))
+        else:
+            fxn = {"sum": sum, "min": min, "max": max}.get(stat, statistics.mean)
+            results.append(fxn(present))
+
+    return results
+
+
+def assert_close(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if e is None:
+            assert a is None
+        else:
+            assert math.isclose(a, e, rel_tol=1e-9, abs_tol=1e-9)
+
+
+STATS = ["count", "sum", "mean", "var", "std", "min", "max"]
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+@pytest.mark.parametrize("min_periods", [None, 1])
+def test_rolling(window, min_periods):
+    rng = random.Random(window)
+    values = [rng.choice([None, rng.randint(-50, 50)]) for _ in range(60)]
+    v = Vec(values)
+
+    rolling = v.rolling(window, min_periods)
+    for stat in STATS:
+        expected = naive(values, window, min_periods or window, stat)
+        assert_close(list(getattr(rolling, stat)()), expected)
+
+
+def test_expanding():
+    values = [3.0, None, 1.5, math.nan, 4.0, 2.5]
+    v = Vec(values)
+    values[3] = None
+
+    for stat in STATS:
+        assert_close(list(getattr(v.expanding(), stat)()), naive(values, None, 1, stat))
+
+    assert list(v.expanding(min_periods=3).max()) == [None] * 4 + [4.0, 4.0]
+
+
+def test_df_and_groupby():
+    df = DF(
+        {
+            "key": ["a", "b", "a", "b", "a", "b"],
+            "x": [1, 10, 2, 20, 3, None],
+            "y": [1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+        }
+    )
+
+    res = df.rolling(2).sum()
+    assert res.columns == ["x", "y"]
+    assert list(res["x"]) == [None, 11, 12, 22, 23, None]
+
+    grouped = df.groupby("key")
+    assert list(grouped.rolling("x", 2).sum()) == [None, None, 3, 30, 5, None]
+    assert list(grouped.rolling("x", 2, min_periods=1).max()) == [1, 10, 2, 20, 3, 20]
+    assert list(grouped.expanding("x").mean()) == [1.0, 10.0, 1.5, 15.0, 2.0, 15.0]
+
+    with pytest.raises(ValueError):
+        df["x"].rolling(0)